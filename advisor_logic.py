@@ -1,277 +1,473 @@
-from crypto_data import get_crypto_data, get_crypto_by_symbol, get_sustainable_cryptos, get_low_risk_cryptos
-import random
+from collections import namedtuple
+from itertools import chain
+import threading
+import time
+
+import numpy as np
+
+from crypto_data import get_universe
+from scoring import DEFAULT_SCORING_THRESHOLDS, batch_investment_scores, risk_row
+from topk import top_k_indices, top_k_items
+from render_cache import RenderCache, cached_render, cached_stream
+from portfolio import PortfolioOptimizer, covariance_from_history, expected_returns, round_percentages, structural_covariance
+from universe import percentile_ranks
+import metrics
+import templates
+
+# Price history window and sampling interval (seconds), and the minimum number of
+# sampled returns, for a historical covariance
+COVARIANCE_LOOKBACK = 30 * 24 * 3600
+COVARIANCE_INTERVAL = 3600
+MIN_COVARIANCE_RETURNS = 24
+YEAR_SECONDS = 365 * 24 * 3600
+
+# Numeric rows of the comparison table: (label, field, value format, higher is better).
+# "score" is the investment score for the requested risk tolerance.
+COMPARISON_ROWS = (
+    ("Investment Score", "score", "{}/10", True),
+    ("Price", "price_usd", "${:,.2f}", None),
+    ("Market Cap Rank", "market_cap_rank", "#{}", False),
+    ("24h Change", "price_change_24h", "{:+.1f}%", True),
+    ("7d Change", "price_change_7d", "{:+.1f}%", True),
+    ("30d Change", "price_change_30d", "{:+.1f}%", True),
+    ("24h Volume", "volume_24h", "${:,.0f}", True),
+    ("Sustainability", "sustainability_score", "{}/10", True),
+    ("Adoption", "adoption_score", "{}/10", True),
+    ("Technology Maturity", "technology_maturity", "{}/10", True),
+    ("Regulatory Clarity", "regulatory_clarity", "{}/10", True),
+)
+
+# Categorical rows of the comparison table, shown as they are
+COMPARISON_LABELS = (
+    ("Volatility", "volatility"),
+    ("Risk Level", "risk_level"),
+    ("Energy Consumption", "energy_consumption"),
+    ("Consensus", "consensus_mechanism"),
+)
+
+# Highlights under the comparison table: (label, field) of the best asset per field
+COMPARISON_HIGHLIGHTS = (
+    ("Highest investment score", "score"),
+    ("Most sustainable", "sustainability_score"),
+    ("Strongest 30-day momentum", "price_change_30d"),
+    ("Clearest regulation", "regulatory_clarity"),
+)
+
+# Read-only state derived from one universe snapshot; swapped as a whole on refresh
+AdvisorState = namedtuple("AdvisorState", ["universe", "scores", "ranked_index"])
+
+def comparison_key(symbols):
+    """Uppercase symbols in the order given, without duplicates: how comparisons are cached."""
+    return tuple(dict.fromkeys(str(symbol).upper() for symbol in symbols))
 
 class CryptoAdvisor:
-    def __init__(self):
-        self.crypto_data = get_crypto_data()
+    # Number of ranked candidates kept per risk profile and shown as recommendations
+    recommendation_count = 5
+    
+    def __init__(self, simulation_workers=None):
         self.risk_profiles = {
             "low": {
                 "max_volatility": "Medium",
                 "min_market_cap_rank": 15,
                 "min_regulatory_clarity": 6,
-                "preferred_risk_levels": ["Low", "Medium"]
+                "preferred_risk_levels": ["Low", "Medium"],
+                "max_weight": 0.40,
+                "min_sustainability": 5,
+                "target_volatility": 0.55
             },
             "medium": {
                 "max_volatility": "High",
                 "min_market_cap_rank": 25,
                 "min_regulatory_clarity": 5,
-                "preferred_risk_levels": ["Medium", "Medium-High"]
+                "preferred_risk_levels": ["Medium", "Medium-High"],
+                "max_weight": 0.30,
+                "min_sustainability": 3,
+                "target_volatility": 0.70
             },
             "high": {
                 "max_volatility": "Very High",
                 "min_market_cap_rank": 50,
                 "min_regulatory_clarity": 4,
-                "preferred_risk_levels": ["Medium-High", "High"]
+                "preferred_risk_levels": ["Medium-High", "High"],
+                "max_weight": 0.25,
+                "min_sustainability": 3,
+                "target_volatility": 0.95
             }
         }
+        self.scoring_thresholds = DEFAULT_SCORING_THRESHOLDS
+        self.index_stats = {"hits": 0, "rebuilds": 0}
+        # Guards index_stats; the advisor is shared by every session's thread
+        self._stats_lock = threading.Lock()
+        self.render_cache = RenderCache()
+        self.optimizer = PortfolioOptimizer()
+        # Monte Carlo downside of each suggested allocation; workers default to the CPU count.
+        # Imported here so importing the advisor module stays light
+        from risk_simulation import RiskSimulator
+        self.risk_simulator = RiskSimulator(workers=simulation_workers)
+        # Optional PriceHistoryStore; without one the covariance comes from volatility labels
+        self.price_history = None
+        self._lock = threading.Lock()
+        # (score matrix, {row: sorted scores}) for score percentiles in comparisons
+        self._sorted_scores = (None, {})
+        self._state = None
+        self.load_snapshot(get_universe())
+    
+    @property
+    def universe(self):
+        return self._state.universe
+    
+    @property
+    def scores(self):
+        return self._state.scores
+    
+    @property
+    def crypto_data(self):
+        """Record view of the current snapshot, built on demand."""
+        return self._state.universe.records()
+    
+    @metrics.timed()
+    def load_snapshot(self, universe):
+        """
+        Load a universe snapshot and rebuild the score matrix and the ranked index
+        of every risk profile from it. The new state replaces the old one in a
+        single assignment, so concurrent readers see either one or the other.
+        """
+        scores = batch_investment_scores(universe, self.scoring_thresholds)
+        ranked_index = {}
+        for risk_tolerance, profile in self.risk_profiles.items():
+            positions = self._filter_positions(universe, profile)
+            ranked_index[risk_tolerance] = self._rank_positions(scores, positions, risk_tolerance, self.recommendation_count)
+        with self._stats_lock:
+            self.index_stats["rebuilds"] += len(ranked_index)
+        self._state = AdvisorState(universe, scores, ranked_index)
+        return self._state
     
+    @metrics.timed()
+    @cached_render
     def get_investment_recommendations(self, risk_tolerance="medium"):
         """
         Generate investment recommendations based on risk tolerance.
         """
-        profile = self.risk_profiles.get(risk_tolerance, self.risk_profiles["medium"])
-        recommendations = []
+        return "".join(self._recommendation_sections(risk_tolerance))
+    
+    @metrics.timed()
+    @cached_render
+    def analyze_specific_crypto(self, symbol):
+        """
+        Provide detailed analysis of a specific cryptocurrency.
+        """
+        return "".join(self._analysis_sections(symbol))
+    
+    @metrics.timed()
+    @cached_render
+    def get_market_analysis(self):
+        """
+        Provide general market analysis and trends.
+        """
+        return "".join(self._market_sections())
+    
+    @metrics.timed()
+    @cached_render
+    def get_sustainability_analysis(self):
+        """
+        Provide analysis focused on sustainable cryptocurrency options.
+        """
+        return "".join(self._sustainability_sections())
+    
+    @metrics.timed()
+    def compare_cryptos(self, symbols, risk_tolerance="medium"):
+        """
+        Compare several cryptocurrencies side by side, with their ranks among each
+        other and their percentiles within the whole universe.
+        """
+        return self._render_comparison(comparison_key(symbols), risk_tolerance)
+    
+    @cached_render
+    def _render_comparison(self, symbols, risk_tolerance):
+        return "".join(self._comparison_sections(symbols, risk_tolerance))
+    
+    @metrics.timed()
+    @cached_stream("get_investment_recommendations")
+    def stream_investment_recommendations(self, risk_tolerance="medium"):
+        """Yield the investment recommendations section by section."""
+        return self._recommendation_sections(risk_tolerance)
+    
+    @metrics.timed()
+    @cached_stream("analyze_specific_crypto")
+    def stream_crypto_analysis(self, symbol):
+        """Yield the analysis of a specific cryptocurrency section by section."""
+        return self._analysis_sections(symbol)
+    
+    @metrics.timed()
+    @cached_stream("get_market_analysis")
+    def stream_market_analysis(self):
+        """Yield the market analysis section by section."""
+        return self._market_sections()
+    
+    @metrics.timed()
+    @cached_stream("get_sustainability_analysis")
+    def stream_sustainability_analysis(self):
+        """Yield the sustainability analysis section by section."""
+        return self._sustainability_sections()
+    
+    @metrics.timed()
+    def stream_comparison(self, symbols, risk_tolerance="medium"):
+        """Yield the side-by-side comparison section by section."""
+        return self._stream_comparison(comparison_key(symbols), risk_tolerance)
+    
+    @cached_stream("_render_comparison")
+    def _stream_comparison(self, symbols, risk_tolerance):
+        return self._comparison_sections(symbols, risk_tolerance)
+    
+    def _recommendation_sections(self, risk_tolerance):
+        state = self._refresh_snapshot()
         
-        # Filter cryptocurrencies based on risk profile
-        suitable_cryptos = self._filter_cryptos_by_risk(profile)
+        # Filtered and ranked candidates come precomputed from the ranked index
+        ranked_positions = self._get_ranked_positions(state, risk_tolerance)
         
-        if not suitable_cryptos:
-            return "No suitable cryptocurrencies found for your risk profile. Please try a different risk level."
+        if not len(ranked_positions):
+            yield "No suitable cryptocurrencies found for your risk profile. Please try a different risk level."
+            return
         
-        # Sort by multiple criteria
-        ranked_cryptos = self._rank_cryptos(suitable_cryptos, risk_tolerance)
+        ranked_positions = ranked_positions[:self.recommendation_count]
+        ranked_cryptos = [(state.universe.symbols[p], state.universe.record(p)) for p in ranked_positions]
         
         # Generate recommendations
-        response = f"## Investment Recommendations for {risk_tolerance.title()} Risk Tolerance\n\n"
-        
-        for i, (symbol, crypto) in enumerate(ranked_cryptos[:5]):
-            score = self._calculate_investment_score(crypto, risk_tolerance)
-            
-            response += f"### {i+1}. {crypto['name']} ({symbol})\n"
-            response += f"**Investment Score: {score}/10**\n\n"
-            response += f"📊 **Market Cap Rank**: #{crypto['market_cap_rank']}\n"
-            response += f"💰 **Current Price**: ${crypto['price_usd']:,.2f}\n"
-            response += f"📈 **30-day Performance**: {crypto['price_change_30d']:+.1f}%\n"
-            response += f"⚡ **Energy Efficiency**: {crypto['energy_consumption']}\n"
-            response += f"🛡️ **Risk Level**: {crypto['risk_level']}\n\n"
-            
-            # Why this recommendation
-            response += f"**Why {crypto['name']}?**\n"
-            response += self._generate_recommendation_reasoning(crypto, risk_tolerance)
-            response += "\n\n"
+        out = []
+        templates.RECOMMENDATIONS_HEADER.render_into(out, {"risk_title": risk_tolerance.title()})
+        
+        for i, (symbol, crypto) in enumerate(ranked_cryptos):
+            templates.RECOMMENDATION.render_into(out, dict(
+                crypto,
+                position=i + 1,
+                score=self._batch_score(state, symbol, risk_tolerance),
+                reasoning=self._generate_recommendation_reasoning(crypto, risk_tolerance),
+            ))
+        yield "".join(out)
         
         # Add portfolio allocation suggestion
-        response += self._generate_portfolio_allocation(ranked_cryptos[:5], risk_tolerance)
+        weights, cov = self._optimize_allocation(state, ranked_positions, risk_tolerance)
+        allocations = round_percentages(weights)
+        yield self._generate_portfolio_allocation(state, ranked_positions, allocations, cov, risk_tolerance, weights)
         
-        # Add important disclaimer
-        response += "\n\n⚠️ **Important**: These recommendations are for educational purposes only. Always do your own research and never invest more than you can afford to lose."
+        # Add simulated downside of that allocation
+        yield self._generate_downside_risk(state, ranked_positions, allocations, cov)
         
-        return response
+        # Add important disclaimer
+        yield templates.RECOMMENDATIONS_DISCLAIMER.render()
     
-    def analyze_specific_crypto(self, symbol):
-        """
-        Provide detailed analysis of a specific cryptocurrency.
-        """
-        crypto = get_crypto_by_symbol(symbol)
+    def _analysis_sections(self, symbol):
+        state = self._refresh_snapshot()
+        crypto = state.universe.get(symbol.upper())
         
         if not crypto:
-            return f"Sorry, I don't have information about {symbol}. Please try another cryptocurrency."
-        
-        score = self._calculate_investment_score(crypto, "medium")
-        
-        response = f"# {crypto['name']} ({crypto['symbol']}) Analysis\n\n"
-        
-        # Current metrics
-        response += "## 📊 Current Metrics\n"
-        response += f"- **Price**: ${crypto['price_usd']:,.2f}\n"
-        response += f"- **Market Cap Rank**: #{crypto['market_cap_rank']}\n"
-        response += f"- **Market Cap**: ${crypto['market_cap']:,.0f}\n"
-        response += f"- **24h Volume**: ${crypto['volume_24h']:,.0f}\n\n"
-        
-        # Performance
-        response += "## 📈 Performance\n"
-        response += f"- **24h Change**: {crypto['price_change_24h']:+.1f}%\n"
-        response += f"- **7d Change**: {crypto['price_change_7d']:+.1f}%\n"
-        response += f"- **30d Change**: {crypto['price_change_30d']:+.1f}%\n\n"
-        
-        # Sustainability & Technology
-        response += "## 🌱 Sustainability & Technology\n"
-        response += f"- **Energy Consumption**: {crypto['energy_consumption']}\n"
-        response += f"- **Consensus Mechanism**: {crypto['consensus_mechanism']}\n"
-        response += f"- **Sustainability Score**: {crypto['sustainability_score']}/10\n"
-        response += f"- **Technology Maturity**: {crypto['technology_maturity']}/10\n\n"
-        
-        # Risk Assessment
-        response += "## ⚠️ Risk Assessment\n"
-        response += f"- **Overall Risk Level**: {crypto['risk_level']}\n"
-        response += f"- **Volatility**: {crypto['volatility']}\n"
-        response += f"- **Regulatory Clarity**: {crypto['regulatory_clarity']}/10\n"
-        response += f"- **Adoption Score**: {crypto['adoption_score']}/10\n\n"
-        
-        # Use Cases
-        response += "## 🎯 Primary Use Cases\n"
+            yield f"Sorry, I don't have information about {symbol}. Please try another cryptocurrency."
+            return
+        
+        out = []
+        templates.ANALYSIS_HEADER.render_into(out, crypto)
+        templates.ANALYSIS_METRICS.render_into(out, crypto)
+        yield "".join(out)
+        
+        yield templates.ANALYSIS_PERFORMANCE.render(crypto)
+        yield templates.ANALYSIS_SUSTAINABILITY.render(crypto)
+        yield templates.ANALYSIS_RISK.render(crypto)
+        
+        out = []
+        templates.ANALYSIS_USE_CASES_HEADER.render_into(out)
         for use_case in crypto['use_cases']:
-            response += f"- {use_case}\n"
-        response += "\n"
+            templates.BULLET.render_into(out, {"text": use_case})
+        yield "".join(out)
         
         # Investment verdict
-        response += f"## 🎯 Investment Verdict (Score: {score}/10)\n"
-        response += self._generate_investment_verdict(crypto, score)
-        
-        return response
+        score = self._batch_score(state, crypto['symbol'], "medium")
+        yield templates.ANALYSIS_VERDICT.render({
+            "score": score,
+            "verdict": self._generate_investment_verdict(crypto, score),
+        })
     
-    def get_market_analysis(self):
-        """
-        Provide general market analysis and trends.
-        """
-        response = "# 📊 Cryptocurrency Market Analysis\n\n"
+    def _comparison_sections(self, symbols, risk_tolerance):
+        state = self._refresh_snapshot()
+        universe = state.universe
+        missing = [symbol for symbol in symbols if symbol not in universe]
+        positions = universe.positions(symbols)
+        
+        if not len(positions):
+            yield f"Sorry, I don't have information about {', '.join(symbols)}. Please try other cryptocurrencies."
+            return
+        
+        # Every column is gathered for all compared assets at once; ranks among
+        # them come from one pairwise comparison per row
+        names = universe.column("name")[positions]
+        listed = [universe.symbols[position] for position in positions]
+        values = {field: universe.column(field)[positions] for _, field, _, _ in COMPARISON_ROWS if field != "score"}
+        values["score"] = state.scores[risk_row(risk_tolerance), positions]
+        
+        columns = len(positions)
+        out = []
+        templates.COMPARISON_HEADER.render_into(out, {"risk_title": risk_tolerance.title()})
+        out.append((templates.COMPARISON_COLUMN * columns).format(*chain.from_iterable(zip(names, listed))))
+        out.append("\n|---|" + "---|" * columns)
+        
+        # Rows are formatted whole, one str.format call each
+        for label, field, value_format, higher_is_better in COMPARISON_ROWS:
+            column = values[field]
+            if higher_is_better is None:
+                row = templates.comparison_row(templates.COMPARISON_CELL, value_format, columns)
+                out.append(row.format(label, *column.tolist()))
+                continue
+            oriented = column if higher_is_better else -column
+            ranks = 1 + (oriented[None, :] > oriented[:, None]).sum(axis=1)
+            if field == "score":
+                percentiles = self._score_percentiles(state, risk_tolerance, positions)
+            else:
+                percentiles = universe.index.percentiles(field, positions)
+            if not higher_is_better:
+                percentiles = 100 - percentiles
+            row = templates.comparison_row(templates.COMPARISON_RANKED_CELL, value_format, columns)
+            out.append(row.format(label, *chain.from_iterable(zip(column.tolist(), ranks.tolist(),
+                                                                   percentiles.tolist()))))
+        
+        for label, field in COMPARISON_LABELS:
+            column = universe.column(field)
+            row = templates.comparison_row(templates.COMPARISON_CELL, "{}", columns)
+            out.append(row.format(label, *(column.categories[code] for code in column.codes[positions].tolist())))
+        templates.COMPARISON_LEGEND.render_into(out, {"universe_size": len(universe)})
+        yield "".join(out)
+        
+        if len(positions) > 1:
+            out = []
+            templates.COMPARISON_HIGHLIGHTS_HEADER.render_into(out)
+            for label, field in COMPARISON_HIGHLIGHTS:
+                # argmax keeps the first mentioned asset on ties
+                best = int(np.argmax(values[field]))
+                templates.COMPARISON_HIGHLIGHT.render_into(out, {"label": label, "name": names[best],
+                                                                 "symbol": listed[best]})
+            yield "".join(out)
+        
+        if missing:
+            yield templates.COMPARISON_NOT_LISTED.render({"symbols": ", ".join(missing)})
+    
+    def _market_sections(self):
+        universe = self._refresh_snapshot().universe
         
         # Market leaders
-        top_performers = self._get_top_performers()
-        response += "## 🚀 Top Performers (30-day)\n"
-        for symbol, crypto in top_performers:
-            response += f"- **{crypto['name']}**: {crypto['price_change_30d']:+.1f}%\n"
-        response += "\n"
+        out = []
+        templates.MARKET_HEADER.render_into(out)
+        for symbol, crypto in self._get_top_performers(universe):
+            templates.TOP_PERFORMER.render_into(out, crypto)
+        yield "".join(out)
         
         # Market cap analysis
-        response += "## 💰 Market Cap Analysis\n"
-        large_cap = [c for c in self.crypto_data.values() if c['market_cap'] > 50000000000]
-        mid_cap = [c for c in self.crypto_data.values() if 10000000000 <= c['market_cap'] <= 50000000000]
-        small_cap = [c for c in self.crypto_data.values() if c['market_cap'] < 10000000000]
-        
-        response += f"- **Large Cap (>$50B)**: {len(large_cap)} cryptocurrencies\n"
-        response += f"- **Mid Cap ($10B-$50B)**: {len(mid_cap)} cryptocurrencies\n"
-        response += f"- **Small Cap (<$10B)**: {len(small_cap)} cryptocurrencies\n\n"
+        market_cap = universe.column("market_cap")
+        yield templates.MARKET_CAPS.render({
+            "large_cap": int((market_cap > 50000000000).sum()),
+            "mid_cap": int(((market_cap >= 10000000000) & (market_cap <= 50000000000)).sum()),
+            "small_cap": int((market_cap < 10000000000).sum()),
+        })
         
         # Sustainability trends
-        sustainable_cryptos = get_sustainable_cryptos()
-        response += "## 🌱 Sustainability Trends\n"
-        response += f"**{len(sustainable_cryptos)} cryptocurrencies** have high sustainability scores (7+/10)\n\n"
-        response += "**Most Sustainable Options:**\n"
-        for symbol, crypto in list(sustainable_cryptos.items())[:3]:
-            response += f"- {crypto['name']}: {crypto['sustainability_score']}/10 ({crypto['consensus_mechanism']})\n"
-        
-        response += "\n## 📈 Market Insights\n"
-        response += "- Proof of Stake networks are gaining adoption due to energy efficiency\n"
-        response += "- DeFi and smart contract platforms showing strong growth\n"
-        response += "- Regulatory clarity is improving for established cryptocurrencies\n"
-        response += "- Institutional adoption continues to drive large-cap crypto stability\n"
-        
-        return response
+        out = []
+        sustainable_positions = universe.index.query(sustainability_score=(7, None))
+        templates.SUSTAINABILITY_TRENDS.render_into(out, {"count": len(sustainable_positions)})
+        for position in sustainable_positions[:3]:
+            templates.SUSTAINABLE_OPTION.render_into(out, universe.record(position))
+        yield "".join(out)
+        
+        yield templates.MARKET_INSIGHTS.render()
     
-    def get_sustainability_analysis(self):
-        """
-        Provide analysis focused on sustainable cryptocurrency options.
-        """
-        sustainable_cryptos = get_sustainable_cryptos()
+    def _sustainability_sections(self):
+        universe = self._refresh_snapshot().universe
+        sustainable_cryptos = universe.records(universe.index.query(sustainability_score=(7, None)))
         
-        response = "# 🌱 Sustainable Cryptocurrency Analysis\n\n"
-        response += "Environmental impact is increasingly important in crypto investments. Here are the most sustainable options:\n\n"
+        yield templates.SUSTAINABILITY_HEADER.render()
         
         # Sort by sustainability score
-        sorted_sustainable = sorted(sustainable_cryptos.items(), 
-                                  key=lambda x: x[1]['sustainability_score'], reverse=True)
-        
-        for symbol, crypto in sorted_sustainable:
-            response += f"## {crypto['name']} ({symbol})\n"
-            response += f"**Sustainability Score: {crypto['sustainability_score']}/10**\n\n"
-            response += f"- **Consensus**: {crypto['consensus_mechanism']}\n"
-            response += f"- **Energy Use**: {crypto['energy_consumption']}\n"
-            response += f"- **Market Cap Rank**: #{crypto['market_cap_rank']}\n"
-            response += f"- **Why It's Sustainable**: "
-            
+        sorted_sustainable = top_k_items(sustainable_cryptos.values(),
+                                         key=lambda crypto: crypto['sustainability_score'])
+        
+        out = []
+        for crypto in sorted_sustainable:
             if crypto['consensus_mechanism'] == "Proof of Stake":
-                response += "Uses Proof of Stake which requires 99%+ less energy than Bitcoin's Proof of Work\n"
+                reason = "Uses Proof of Stake which requires 99%+ less energy than Bitcoin's Proof of Work"
             elif "Proof of History" in crypto['consensus_mechanism']:
-                response += "Innovative consensus mechanism designed for efficiency and speed\n"
+                reason = "Innovative consensus mechanism designed for efficiency and speed"
             elif crypto['consensus_mechanism'] == "Stellar Consensus Protocol":
-                response += "Custom consensus protocol optimized for energy efficiency and fast settlements\n"
+                reason = "Custom consensus protocol optimized for energy efficiency and fast settlements"
             else:
-                response += "Designed with energy efficiency and sustainability in mind\n"
+                reason = "Designed with energy efficiency and sustainability in mind"
             
-            response += "\n"
-        
-        response += "## 🌍 Why Sustainability Matters\n"
-        response += "- **Environmental Impact**: Sustainable cryptos use 99% less energy\n"
-        response += "- **Future Regulations**: Governments favor eco-friendly technologies\n"
-        response += "- **Corporate Adoption**: Companies prefer sustainable blockchain solutions\n"
-        response += "- **Long-term Viability**: Lower operating costs and regulatory risks\n"
+            templates.SUSTAINABLE_ASSET.render_into(out, dict(crypto, reason=reason))
+        yield "".join(out)
         
-        return response
+        yield templates.SUSTAINABILITY_FOOTER.render()
     
-    def _filter_cryptos_by_risk(self, profile):
-        """Filter cryptocurrencies based on risk profile criteria."""
-        suitable = {}
-        
-        for symbol, crypto in self.crypto_data.items():
-            # Check market cap rank
-            if crypto['market_cap_rank'] > profile['min_market_cap_rank']:
-                continue
-            
-            # Check regulatory clarity
-            if crypto['regulatory_clarity'] < profile['min_regulatory_clarity']:
-                continue
-            
-            # Check risk level
-            if crypto['risk_level'] not in profile['preferred_risk_levels']:
-                continue
-            
-            suitable[symbol] = crypto
-        
-        return suitable
+    def collect_metrics(self):
+        """Cache hit rates and snapshot freshness, reported to the metrics registry on each scrape."""
+        published, loaded = get_universe(), self._state.universe
+        return metrics.cache_metrics({"render": self.render_cache, "risk_simulation": self.risk_simulator.cache}) + [
+            metrics.Metric("crypto_advisor_snapshot_age_seconds", "gauge",
+                           "Seconds since the latest universe snapshot was published.",
+                           [((), time.time() - published.created_at)]),
+            metrics.Metric("crypto_advisor_snapshot_version", "gauge",
+                           "Version of the latest published snapshot and of the one the advisor serves.",
+                           [((("snapshot", "published"),), published.version), ((("snapshot", "loaded"),), loaded.version)]),
+            metrics.Metric("crypto_advisor_universe_assets", "gauge", "Assets in the served snapshot.",
+                           [((), len(loaded))]),
+            metrics.Metric("crypto_advisor_ranked_index_total", "counter",
+                           "Ranked index lookups (hits) and per-profile rebuilds.",
+                           [((("event", event),), count) for event, count in sorted(self.index_stats.items())]),
+        ]
     
-    def _rank_cryptos(self, cryptos, risk_tolerance):
-        """Rank cryptocurrencies based on multiple criteria."""
-        ranked = []
-        
-        for symbol, crypto in cryptos.items():
-            score = self._calculate_investment_score(crypto, risk_tolerance)
-            ranked.append((symbol, crypto, score))
-        
-        # Sort by score descending
-        ranked.sort(key=lambda x: x[2], reverse=True)
-        
-        return [(symbol, crypto) for symbol, crypto, score in ranked]
+    def _refresh_snapshot(self):
+        """Current advisor state, reloaded first if crypto_data published a newer snapshot."""
+        state = self._state
+        universe = get_universe()
+        if universe.version == state.universe.version:
+            return state
+        
+        with self._lock:
+            state = self._state
+            if universe.version != state.universe.version:
+                state = self.load_snapshot(universe)
+        return state
     
-    def _calculate_investment_score(self, crypto, risk_tolerance):
-        """Calculate investment score based on multiple factors."""
-        score = 0
-        
-        # Market cap rank (higher rank = lower score)
-        if crypto['market_cap_rank'] <= 5:
-            score += 3
-        elif crypto['market_cap_rank'] <= 15:
-            score += 2
-        else:
-            score += 1
-        
-        # Performance (30-day change)
-        if crypto['price_change_30d'] > 20:
-            score += 2
-        elif crypto['price_change_30d'] > 0:
-            score += 1
-        
-        # Sustainability
-        if crypto['sustainability_score'] >= 8:
-            score += 2
-        elif crypto['sustainability_score'] >= 6:
-            score += 1
-        
-        # Technology maturity
-        if crypto['technology_maturity'] >= 8:
-            score += 1
-        
-        # Adoption and regulatory clarity
-        score += min(crypto['adoption_score'] // 3, 2)
-        score += min(crypto['regulatory_clarity'] // 3, 2)
-        
-        # Risk adjustment based on tolerance
-        if risk_tolerance == "low" and crypto['volatility'] in ["Low", "Medium"]:
-            score += 1
-        elif risk_tolerance == "high" and crypto['volatility'] == "Very High":
-            score += 1
-        
-        return min(score, 10)  # Cap at 10
+    def _get_ranked_positions(self, state, risk_tolerance):
+        """Ranked universe positions for a risk tolerance from the ranked index."""
+        with self._stats_lock:
+            self.index_stats["hits"] += 1
+        
+        if risk_tolerance not in state.ranked_index:
+            risk_tolerance = "medium"
+        return state.ranked_index[risk_tolerance]
+    
+    def _filter_positions(self, universe, profile):
+        """Universe positions matching risk profile criteria, in universe order."""
+        return universe.index.query(
+            market_cap_rank=(None, profile['min_market_cap_rank']),
+            regulatory_clarity=(profile['min_regulatory_clarity'], None),
+            risk_level=profile['preferred_risk_levels'],
+        )
+    
+    def _rank_positions(self, scores, positions, risk_tolerance, limit=None):
+        """Top universe positions by investment score, keeping universe order on ties."""
+        scores = scores[risk_row(risk_tolerance), positions]
+        return positions[top_k_indices(scores, limit)]
+    
+    def _score_percentiles(self, state, risk_tolerance, positions):
+        """Percentiles of the assets' investment scores among every listed asset."""
+        scores, sorted_rows = self._sorted_scores
+        if scores is not state.scores:
+            sorted_rows = {}
+            self._sorted_scores = (state.scores, sorted_rows)
+        row = risk_row(risk_tolerance)
+        if row not in sorted_rows:
+            sorted_rows[row] = np.sort(state.scores[row])
+        return percentile_ranks(sorted_rows[row], state.scores[row, positions])
+    
+    def _batch_score(self, state, symbol, risk_tolerance):
+        """Look up a precomputed investment score from the batch score matrix."""
+        return int(state.scores[risk_row(risk_tolerance), state.universe.position(symbol)])
     
     def _generate_recommendation_reasoning(self, crypto, risk_tolerance):
         """Generate reasoning for why a crypto is recommended."""
@@ -311,40 +507,98 @@ class CryptoAdvisor:
         else:
             return f"**Avoid** - {crypto['name']} shows concerning metrics for conservative investors. High risk with uncertain returns."
     
-    def _get_top_performers(self):
+    def _get_top_performers(self, universe):
         """Get top performing cryptocurrencies by 30-day change."""
-        performers = [(symbol, crypto) for symbol, crypto in self.crypto_data.items()]
-        performers.sort(key=lambda x: x[1]['price_change_30d'], reverse=True)
-        return performers[:5]
-    
-    def _generate_portfolio_allocation(self, top_cryptos, risk_tolerance):
-        """Generate portfolio allocation suggestions."""
-        response = "## 💼 Suggested Portfolio Allocation\n\n"
-        
-        if risk_tolerance == "low":
-            response += "**Conservative Portfolio (Low Risk):**\n"
-            allocations = [40, 30, 15, 10, 5]
-            response += "- Focus on large-cap, established cryptocurrencies\n"
-            response += "- Emphasize stability and regulatory clarity\n\n"
-        elif risk_tolerance == "medium":
-            response += "**Balanced Portfolio (Medium Risk):**\n"
-            allocations = [30, 25, 20, 15, 10]
-            response += "- Mix of large-cap stability and mid-cap growth potential\n"
-            response += "- Balance between safety and opportunity\n\n"
-        else:
-            response += "**Aggressive Portfolio (High Risk):**\n"
-            allocations = [25, 25, 20, 15, 15]
-            response += "- Higher allocation to growth-oriented cryptocurrencies\n"
-            response += "- Accept higher volatility for potential higher returns\n\n"
-        
-        for i, (symbol, crypto) in enumerate(top_cryptos):
-            if i < len(allocations):
-                response += f"- **{crypto['name']} ({symbol})**: {allocations[i]}%\n"
-        
-        response += "\n**Portfolio Guidelines:**\n"
-        response += "- Never invest more than you can afford to lose\n"
-        response += "- Rebalance quarterly or when allocations drift >5%\n"
-        response += "- Keep some cash reserves for opportunities\n"
-        response += "- Consider dollar-cost averaging for entry\n"
-        
-        return response
+        positions = top_k_indices(universe.column("price_change_30d"), 5)
+        return [(universe.symbols[p], universe.record(p)) for p in positions]
+    
+    def _generate_portfolio_allocation(self, state, positions, allocations, cov, risk_tolerance, weights):
+        """
+        Generate portfolio allocation suggestions from optimized percentages, noting
+        when no pick met the sustainability floor and when the optimized ``weights``
+        could not get down to the target volatility.
+        """
+        out = []
+        templates.PORTFOLIO_HEADER.render_into(out)
+        templates.PORTFOLIO_STYLES.get(risk_tolerance, templates.PORTFOLIO_STYLES["high"]).render_into(out)
+        
+        for position, allocation in zip(positions, allocations):
+            if allocation > 0:
+                templates.ALLOCATION.render_into(out, dict(state.universe.record(position), allocation=allocation))
+        if allocations.sum():
+            rounded = allocations / 100.0
+            templates.PORTFOLIO_VOLATILITY.render_into(out, {"volatility": float(np.sqrt(rounded @ cov @ rounded))})
+            profile = self.risk_profiles.get(risk_tolerance, self.risk_profiles["medium"])
+            sustainability = state.universe.column("sustainability_score")[np.asarray(positions, dtype=np.intp)]
+            if not (sustainability >= profile["min_sustainability"]).any():
+                templates.PORTFOLIO_BELOW_SUSTAINABILITY.render_into(
+                    out, {"min_sustainability": profile["min_sustainability"]})
+            if np.sqrt(weights @ cov @ weights) > profile["target_volatility"] * (1 + 1e-6):
+                templates.PORTFOLIO_OVER_TARGET.render_into(out, {"target": profile["target_volatility"],
+                                                                  "max_weight": profile["max_weight"]})
+        
+        templates.PORTFOLIO_GUIDELINES.render_into(out)
+        
+        return "".join(out)
+    
+    def _generate_downside_risk(self, state, positions, allocations, cov):
+        """Generate the Monte Carlo downside table of an allocation."""
+        if not allocations.sum():
+            return ""
+        simulator = self.risk_simulator
+        portfolio = tuple((state.universe.symbols[p], int(a)) for p, a in zip(positions, allocations) if a)
+        risks = simulator.simulate(allocations / 100.0, cov, key=(portfolio, state.universe.version))
+        
+        out = []
+        templates.DOWNSIDE_HEADER.render_into(out, {"paths": simulator.n_paths, "confidence": simulator.confidence})
+        for risk in risks:
+            templates.DOWNSIDE_ROW.render_into(out, dict(
+                risk._asdict(),
+                days="1 day" if risk.horizon == 1 else f"{risk.horizon} days",
+            ))
+        templates.DOWNSIDE_FOOTER.render_into(out, {"confidence": simulator.confidence})
+        return "".join(out)
+    
+    def _optimize_allocation(self, state, positions, risk_tolerance, as_of=None):
+        """
+        Returns mean-variance weights for the given positions under the risk profile's
+        max weight, min sustainability and target volatility, with the annualized
+        covariance they were optimized against. ``as_of`` limits the price history
+        used to what was known at that time.
+        """
+        profile = self.risk_profiles.get(risk_tolerance, self.risk_profiles["medium"])
+        positions = np.asarray(positions, dtype=np.intp)
+        if not len(positions):
+            return np.zeros(0), np.zeros((0, 0))
+        
+        universe = state.universe
+        symbols = [universe.symbols[p] for p in positions]
+        eligible = universe.column("sustainability_score")[positions] >= profile["min_sustainability"]
+        if not eligible.any():
+            # Nothing meets the sustainability floor; allocate across all picks instead,
+            # which the rendered allocation points out
+            eligible[:] = True
+        
+        mu = expected_returns(universe, positions)
+        cov = self._covariance(universe, positions, symbols, as_of)
+        weights = self.optimizer.optimize(
+            mu, cov,
+            max_weight=profile["max_weight"],
+            target_volatility=profile["target_volatility"],
+            eligible=eligible,
+        )
+        return weights, cov
+    
+    def _covariance(self, universe, positions, symbols, as_of=None):
+        """Return covariance from price history when enough is stored, else from volatility labels."""
+        store = self.price_history
+        if store is not None:
+            end = store.frame_count if as_of is None else min(store.frame_of(as_of) + 1, store.frame_count)
+            step = max(COVARIANCE_INTERVAL // store.interval, 1)
+            lookback = min(COVARIANCE_LOOKBACK // store.interval, end - 1) // step * step
+            if lookback // step >= MIN_COVARIANCE_RETURNS:
+                cov = covariance_from_history(store, symbols, lookback, YEAR_SECONDS / (store.interval * step),
+                                              end=end, step=step)
+                if cov is not None:
+                    return cov
+        return structural_covariance(universe, positions)
@@ -1,8 +1,12 @@
+import json
+import os
+
 import streamlit as st
-import pandas as pd
-from crypto_data import get_crypto_data, get_market_trends
+from crypto_data import get_market_trends, get_universe
 from advisor_logic import CryptoAdvisor
-from education import get_educational_content, get_risk_explanation
+from chat import stream_user_input
+from chat_history import PAGE_SIZE, ChatHistory
+import metrics
 
 # Page configuration
 st.set_page_config(
@@ -11,19 +15,63 @@ st.set_page_config(
     layout="wide"
 )
 
-# Initialize session state
-if "messages" not in st.session_state:
-    st.session_state.messages = []
+@st.cache_resource
+def get_advisor():
+    """Process-wide advisor shared by every session; it serves read-only snapshots."""
+    workers = os.environ.get("CRYPTO_ADVISOR_SIM_WORKERS")
+    advisor = CryptoAdvisor(simulation_workers=int(workers) if workers else None)
+    metrics.register_collector(advisor.collect_metrics)
+    return advisor
+
+@st.cache_resource
+def start_market_feed():
+    """Start the process-wide market data feed when a replay file is configured."""
+    replay_path = os.environ.get("CRYPTO_ADVISOR_REPLAY")
+    if not replay_path:
+        return None
+    
+    # Feed modules (asyncio and friends) are only loaded when a feed is configured
+    from market_data import MarketDataFeed, ReplayProvider
+    from price_history import PriceHistoryStore
+    from volatility import RollingStats
+    
+    speed = float(os.environ.get("CRYPTO_ADVISOR_REPLAY_SPEED", "1"))
+    
+    # Optional price history store the change fields are derived from
+    history = None
+    history_path = os.environ.get("CRYPTO_ADVISOR_HISTORY")
+    if history_path and os.path.exists(os.path.join(history_path, "meta.json")):
+        history = PriceHistoryStore(history_path)
+    elif history_path:
+        universe = get_universe()
+        with open(replay_path, encoding="utf-8") as feed:
+            first_ts = json.loads(feed.readline())["ts"]
+        history = PriceHistoryStore.create(history_path, universe.symbols, start_ts=first_ts,
+                                           capacity=max(1024, len(universe)))
+    
+    # Volatility labels follow realized volatility once each window has warmed up
+    volatility = RollingStats(get_universe().symbols)
+    
+    return MarketDataFeed(ReplayProvider(replay_path, speed=speed), history=history, volatility=volatility).start()
+
+market_feed = start_market_feed()
+if market_feed is not None and market_feed.history is not None:
+    # Portfolio covariance comes from the recorded price history
+    get_advisor().price_history = market_feed.history
+
+# Initialize session state (user-specific data only)
+if "chat_history" not in st.session_state:
+    st.session_state.chat_history = ChatHistory()
+if "visible_messages" not in st.session_state:
+    st.session_state.visible_messages = PAGE_SIZE
 if "conversation_stage" not in st.session_state:
     st.session_state.conversation_stage = "greeting"
 if "user_profile" not in st.session_state:
     st.session_state.user_profile = {}
-if "advisor" not in st.session_state:
-    st.session_state.advisor = CryptoAdvisor()
 
 def initialize_chat():
     """Initialize chat with welcome message"""
-    if not st.session_state.messages:
+    if not len(st.session_state.chat_history):
         welcome_msg = """
         👋 Welcome to your Cryptocurrency Investment Advisor!
         
@@ -39,88 +87,7 @@ def initialize_chat():
         - Basic cryptocurrency education
         - Market trends and analysis
         """
-        st.session_state.messages.append({"role": "assistant", "content": welcome_msg})
-
-def process_user_input(user_input):
-    """Process user input and generate appropriate response"""
-    advisor = st.session_state.advisor
-    user_input_lower = user_input.lower()
-    
-    # Educational queries
-    if any(word in user_input_lower for word in ["what is", "explain", "help", "learn", "beginner"]):
-        if "bitcoin" in user_input_lower or "btc" in user_input_lower:
-            return get_educational_content("bitcoin")
-        elif "ethereum" in user_input_lower or "eth" in user_input_lower:
-            return get_educational_content("ethereum")
-        elif "risk" in user_input_lower:
-            return get_risk_explanation()
-        else:
-            return get_educational_content("general")
-    
-    # Investment recommendations
-    elif any(word in user_input_lower for word in ["recommend", "invest", "buy", "portfolio", "suggestion"]):
-        return handle_investment_query(user_input_lower, advisor)
-    
-    # Specific cryptocurrency queries
-    elif any(crypto in user_input_lower for crypto in ["bitcoin", "btc", "ethereum", "eth", "cardano", "ada", "solana", "sol", "polygon", "matic", "chainlink", "link", "polkadot", "dot", "litecoin", "ltc", "avalanche", "avax", "stellar", "xlm"]):
-        return handle_crypto_specific_query(user_input_lower, advisor)
-    
-    # Market analysis
-    elif any(word in user_input_lower for word in ["market", "trend", "analysis", "performance"]):
-        return advisor.get_market_analysis()
-    
-    # Sustainability queries
-    elif any(word in user_input_lower for word in ["green", "sustainable", "energy", "environment", "eco"]):
-        return advisor.get_sustainability_analysis()
-    
-    # Default response
-    else:
-        return """
-        I can help you with:
-        
-        🎓 **Education**: Ask me to explain cryptocurrencies, risks, or specific coins
-        📊 **Recommendations**: Ask for investment suggestions based on your risk tolerance
-        🔍 **Analysis**: Ask about specific cryptocurrencies or market trends
-        🌱 **Sustainability**: Ask about eco-friendly crypto options
-        
-        Try asking something like:
-        - "What is Bitcoin?"
-        - "Recommend some cryptocurrencies for a beginner"
-        - "Which cryptos are most sustainable?"
-        - "What are the risks of crypto investing?"
-        """
-
-def handle_investment_query(user_input, advisor):
-    """Handle investment recommendation queries"""
-    risk_tolerance = "medium"  # default
-    
-    if any(word in user_input for word in ["conservative", "safe", "low risk", "careful"]):
-        risk_tolerance = "low"
-    elif any(word in user_input for word in ["aggressive", "high risk", "risky"]):
-        risk_tolerance = "high"
-    
-    return advisor.get_investment_recommendations(risk_tolerance)
-
-def handle_crypto_specific_query(user_input, advisor):
-    """Handle queries about specific cryptocurrencies"""
-    crypto_map = {
-        "bitcoin": "BTC", "btc": "BTC",
-        "ethereum": "ETH", "eth": "ETH",
-        "cardano": "ADA", "ada": "ADA",
-        "solana": "SOL", "sol": "SOL",
-        "polygon": "MATIC", "matic": "MATIC",
-        "chainlink": "LINK", "link": "LINK",
-        "polkadot": "DOT", "dot": "DOT",
-        "litecoin": "LTC", "ltc": "LTC",
-        "avalanche": "AVAX", "avax": "AVAX",
-        "stellar": "XLM", "xlm": "XLM"
-    }
-    
-    for name, symbol in crypto_map.items():
-        if name in user_input:
-            return advisor.analyze_specific_crypto(symbol)
-    
-    return "I couldn't identify which cryptocurrency you're asking about. Please try again with a specific name like 'Bitcoin' or 'Ethereum'."
+        st.session_state.chat_history.append("assistant", welcome_msg)
 
 # Main app layout
 st.title("₿ Cryptocurrency Investment Advisor")
@@ -172,28 +139,43 @@ with st.sidebar:
             st.success(f"{trend['category']}: +{trend['change']:.1f}%")
         else:
             st.error(f"{trend['category']}: {trend['change']:.1f}%")
+    
+    # Profiling panel, shown when metrics are enabled with CRYPTO_ADVISOR_METRICS=1
+    if metrics.REGISTRY.enabled:
+        with st.expander("⏱️ Profiling"):
+            gauges = {metric.name: metric.samples for metric in get_advisor().collect_metrics()}
+            hit_ratio = dict(gauges["crypto_advisor_cache_hit_ratio"])
+            st.metric("Render cache hit rate", f"{hit_ratio[(('cache', 'render'),)]:.0%}")
+            st.metric("Snapshot age", f"{gauges['crypto_advisor_snapshot_age_seconds'][0][1]:.0f} s")
+            st.dataframe(metrics.REGISTRY.summary(), hide_index=True)
 
 # Initialize chat
 initialize_chat()
 
-# Display chat messages
-for message in st.session_state.messages:
+def load_earlier_messages():
+    """Show one more page of older messages"""
+    st.session_state.visible_messages += PAGE_SIZE
+
+# Display the latest window of chat messages; older ones load a page at a time
+chat_history = st.session_state.chat_history
+hidden_messages = len(chat_history) - st.session_state.visible_messages
+if hidden_messages > 0:
+    st.button(f"⬆️ Load earlier messages ({hidden_messages} more)", on_click=load_earlier_messages)
+for message in chat_history.window(st.session_state.visible_messages):
     with st.chat_message(message["role"]):
         st.markdown(message["content"])
 
 # Chat input
 if prompt := st.chat_input("Ask me about cryptocurrency investments..."):
     # Add user message to chat history
-    st.session_state.messages.append({"role": "user", "content": prompt})
+    chat_history.append("user", prompt)
     with st.chat_message("user"):
         st.markdown(prompt)
     
-    # Generate response
+    # Stream the response section by section as it is computed
     with st.chat_message("assistant"):
-        with st.spinner("Analyzing..."):
-            response = process_user_input(prompt)
-        st.markdown(response)
-        st.session_state.messages.append({"role": "assistant", "content": response})
+        response = st.write_stream(stream_user_input(prompt, get_advisor()))
+        chat_history.append("assistant", response)
 
 # Footer with disclaimer
 st.markdown("---")
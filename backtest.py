@@ -0,0 +1,252 @@
+import argparse
+import itertools
+import json
+import multiprocessing
+import os
+from collections import namedtuple
+from concurrent.futures import ProcessPoolExecutor
+
+import numpy as np
+
+from advisor_logic import AdvisorState, CryptoAdvisor
+from crypto_data import get_universe
+from portfolio import PortfolioOptimizer, round_percentages
+from price_history import CHANGE_WINDOWS, PriceHistoryStore, apply_price_history
+from scoring import DEFAULT_SCORING_THRESHOLDS, ScoringThresholds, batch_investment_scores
+
+DAY_SECONDS = 24 * 3600
+YEAR_SECONDS = 365 * DAY_SECONDS
+
+# One parameter set: the risk tolerance traded, the scoring thresholds and
+# overrides of that tolerance's risk profile
+Variant = namedtuple("Variant", ["name", "risk_tolerance", "thresholds", "profile"])
+
+
+def rebalance_dates(store, start=None, end=None, every=DAY_SECONDS):
+    """
+    Rebalance timestamps from ``start`` to ``end`` every ``every`` seconds. By default
+    the range starts once the longest change window has history and runs to the
+    end of the store.
+    """
+    warmup = store.start_ts + max(CHANGE_WINDOWS.values())
+    start = warmup if start is None else max(start, store.start_ts)
+    end = store.end_ts if end is None else min(end, store.end_ts)
+    return list(range(int(start), int(end) + 1, int(every)))
+
+
+class Backtester:
+    """
+    Replays historical universe snapshots from a price history store through the
+    advisor's own pipeline: score, filter by risk profile, rank and allocate with
+    the portfolio optimizer, using only history known at each rebalance date.
+    Holdings drift with prices between rebalances.
+
+    Snapshots keep the static fields (ranks, scores, labels) of ``universe`` and
+    take prices and 24h/7d/30d changes from the store. They are cached per date,
+    so a sweep builds each one once per process.
+    """
+
+    def __init__(self, history, universe=None, cost_bps=0.0):
+        self.history = history
+        self.universe = universe or get_universe()
+        self.cost_bps = cost_bps
+        self.advisor = CryptoAdvisor(simulation_workers=1)
+        self.advisor.price_history = history
+        self._default_profiles = self.advisor.risk_profiles
+        self._snapshots = {}
+
+    def snapshot(self, ts):
+        """Universe snapshot as of ``ts``."""
+        universe = self._snapshots.get(ts)
+        if universe is None:
+            universe = apply_price_history(self.universe, self.history, as_of=ts)
+            self._snapshots[ts] = universe
+        return universe
+
+    def run(self, variant, dates):
+        """
+        Returns a summary dict of the variant rebalanced on ``dates``: total and
+        annualized return, annualized volatility, Sharpe ratio (zero risk-free
+        rate), max drawdown, average turnover and the equity curve.
+        """
+        advisor = self.advisor
+        profile = dict(self._default_profiles.get(variant.risk_tolerance, self._default_profiles["medium"]),
+                       **variant.profile)
+        advisor.risk_profiles = dict(self._default_profiles, **{variant.risk_tolerance: profile})
+        advisor.optimizer = PortfolioOptimizer()
+
+        symbols = self.universe.symbols
+        closes = self.history.closes([self.history.frame_of(ts) for ts in dates], symbols)
+        held = np.zeros(len(symbols))
+        equity, period_returns, turnovers, holdings = [1.0], [], [], []
+        for i, ts in enumerate(dates[:-1]):
+            target = self._target_weights(variant, profile, ts)
+
+            # Cash is the remainder, so moving all of it into assets is a turnover of 1
+            turnover = (np.abs(target - held).sum() + abs(target.sum() - held.sum())) / 2
+            with np.errstate(divide="ignore", invalid="ignore"):
+                asset_returns = np.nan_to_num(closes[i + 1] / closes[i] - 1.0)
+            gross = float(target @ asset_returns)
+            period_return = gross - turnover * self.cost_bps / 1e4
+
+            equity.append(equity[-1] * (1.0 + period_return))
+            period_returns.append(period_return)
+            turnovers.append(turnover)
+            holdings.append(int((target > 0).sum()))
+            held = target * (1.0 + asset_returns) / (1.0 + gross)
+
+        return self._summary(variant, dates, np.array(equity), np.array(period_returns), turnovers, holdings)
+
+    def _target_weights(self, variant, profile, ts):
+        advisor = self.advisor
+        universe = self.snapshot(ts)
+        scores = batch_investment_scores(universe, variant.thresholds)
+        positions = advisor._filter_positions(universe, profile)
+        ranked = advisor._rank_positions(scores, positions, variant.risk_tolerance, advisor.recommendation_count)
+
+        target = np.zeros(len(universe))
+        if len(ranked):
+            state = AdvisorState(universe, scores, None)
+            weights, _ = advisor._optimize_allocation(state, ranked, variant.risk_tolerance, as_of=ts)
+            target[ranked] = round_percentages(weights) / 100.0
+        return target
+
+    def _summary(self, variant, dates, equity, period_returns, turnovers, holdings):
+        periods = len(period_returns)
+        periods_per_year = YEAR_SECONDS / np.median(np.diff(dates)) if periods else 0.0
+        volatility = float(period_returns.std(ddof=1) * np.sqrt(periods_per_year)) if periods > 1 else 0.0
+        annualized = float(equity[-1] ** (periods_per_year / periods) - 1.0) if periods and equity[-1] > 0 else -1.0
+        return {
+            "name": variant.name,
+            "risk_tolerance": variant.risk_tolerance,
+            "thresholds": variant.thresholds._asdict(),
+            "profile": variant.profile,
+            "start": dates[0] if dates else None,
+            "end": dates[-1] if dates else None,
+            "rebalances": periods,
+            "total_return": float(equity[-1] - 1.0),
+            "annualized_return": annualized,
+            "annualized_volatility": volatility,
+            "sharpe": annualized / volatility if volatility else 0.0,
+            "max_drawdown": float((equity / np.maximum.accumulate(equity) - 1.0).min()),
+            "average_turnover": float(np.mean(turnovers)) if turnovers else 0.0,
+            "average_holdings": float(np.mean(holdings)) if holdings else 0.0,
+            "equity": equity.tolist(),
+        }
+
+
+def expand_grid(grid, risk_tolerances=("low", "medium", "high")):
+    """
+    Returns one Variant per combination of ``grid`` values (``{parameter: [values]}``)
+    and risk tolerance. Parameters named like ScoringThresholds fields set scoring
+    thresholds; any other parameter overrides the risk profile key of that name.
+    """
+    names = sorted(grid)
+    variants = []
+    for risk_tolerance in risk_tolerances:
+        for values in itertools.product(*(grid[name] for name in names)):
+            settings = dict(zip(names, values))
+            thresholds = DEFAULT_SCORING_THRESHOLDS._replace(
+                **{k: v for k, v in settings.items() if k in ScoringThresholds._fields})
+            profile = {k: v for k, v in settings.items() if k not in ScoringThresholds._fields}
+            name = " ".join([risk_tolerance] + [f"{k}={v}" for k, v in settings.items()])
+            variants.append(Variant(name, risk_tolerance, thresholds, profile))
+    return variants
+
+
+_worker_backtester = None
+
+
+def _init_worker(history_path, cost_bps):
+    global _worker_backtester
+    _worker_backtester = Backtester(PriceHistoryStore(history_path), cost_bps=cost_bps)
+
+
+def _run_variant(variant, dates):
+    return _worker_backtester.run(variant, dates)
+
+
+def sweep(history_path, variants, dates, workers=None, cost_bps=0.0):
+    """
+    Backtests every variant over the same rebalance dates, one variant per task on
+    a process pool (``workers`` defaults to the CPU count; 1 runs in-process).
+    Variants are split rather than date ranges because holdings and turnover carry
+    over from one rebalance to the next. Results come back in variant order.
+    """
+    workers = (os.cpu_count() or 1) if workers is None else workers
+    if workers <= 1 or len(variants) <= 1:
+        backtester = Backtester(PriceHistoryStore(history_path), cost_bps=cost_bps)
+        return [backtester.run(variant, dates) for variant in variants]
+
+    chunksize = max(1, len(variants) // (workers * 4))
+    with ProcessPoolExecutor(workers, mp_context=multiprocessing.get_context("spawn"),
+                             initializer=_init_worker, initargs=(history_path, cost_bps)) as pool:
+        return list(pool.map(_run_variant, variants, itertools.repeat(dates), chunksize=chunksize))
+
+
+def _parse_value(text):
+    """Grid values: ints, floats, or ``|``-separated lists (e.g. ``Low|Medium``)."""
+    if "|" in text:
+        return [_parse_value(part) for part in text.split("|")]
+    for cast in (int, float):
+        try:
+            return cast(text)
+        except ValueError:
+            pass
+    return text
+
+
+def _parse_grid(specs):
+    grid = {}
+    for spec in specs:
+        name, _, values = spec.partition("=")
+        if not values:
+            raise SystemExit(f"Grid parameter needs values: {spec!r} (expected name=v1,v2,...)")
+        grid[name] = [_parse_value(value) for value in values.split(",")]
+    return grid
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Backtest the advisor's scoring rules and risk profiles")
+    parser.add_argument("--history", required=True, help="price history store directory")
+    parser.add_argument("--start", type=int, help="first rebalance timestamp (default: start of history)")
+    parser.add_argument("--end", type=int, help="last rebalance timestamp (default: end of history)")
+    parser.add_argument("--every", type=int, default=DAY_SECONDS, help="seconds between rebalances")
+    parser.add_argument("--risk", nargs="+", default=["low", "medium", "high"], choices=["low", "medium", "high"])
+    parser.add_argument("--grid", nargs="*", default=[], metavar="NAME=V1,V2",
+                        help="threshold or risk profile values to sweep, e.g. good_sustainability=5,6,7")
+    parser.add_argument("--workers", type=int, help="worker processes (default: CPU count)")
+    parser.add_argument("--cost-bps", type=float, default=0.0, help="trading cost per unit of turnover")
+    parser.add_argument("--sort", default="sharpe",
+                        choices=["sharpe", "total_return", "annualized_return", "max_drawdown", "average_turnover"])
+    parser.add_argument("--top", type=int, default=20, help="rows to print")
+    parser.add_argument("--output", help="write every result as NDJSON to this file")
+    args = parser.parse_args()
+
+    store = PriceHistoryStore(args.history)
+    dates = rebalance_dates(store, args.start, args.end, args.every)
+    if len(dates) < 2:
+        raise SystemExit("Need at least two rebalance dates in the selected range")
+    grid = _parse_grid(args.grid)
+    unknown = set(grid) - set(ScoringThresholds._fields) - set(CryptoAdvisor().risk_profiles["medium"])
+    if unknown:
+        raise SystemExit(f"Unknown grid parameters: {', '.join(sorted(unknown))}")
+    variants = expand_grid(grid, args.risk)
+    results = sweep(args.history, variants, dates, args.workers, args.cost_bps)
+
+    if args.output:
+        with open(args.output, "w", encoding="utf-8") as output:
+            for result in results:
+                output.write(json.dumps(result) + "\n")
+
+    ranked = sorted(results, key=lambda result: result[args.sort], reverse=args.sort != "average_turnover")
+    print(f"{len(variants)} variants x {len(dates) - 1} rebalances")
+    print(f"{'return':>8} {'annual':>8} {'vol':>7} {'sharpe':>7} {'max dd':>8} {'turnover':>9}  variant")
+    for result in ranked[:args.top]:
+        print(f"{result['total_return']:>8.1%} {result['annualized_return']:>8.1%} "
+              f"{result['annualized_volatility']:>7.1%} {result['sharpe']:>7.2f} "
+              f"{result['max_drawdown']:>8.1%} {result['average_turnover']:>9.2f}  {result['name']}")
+
+
+if __name__ == "__main__":
+    main()
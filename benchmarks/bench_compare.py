@@ -0,0 +1,49 @@
+import argparse
+import random
+import time
+
+from advisor_logic import CryptoAdvisor
+from benchmarks.synthetic import synthetic_universe
+from crypto_data import get_universe, publish_universe
+
+
+def best_ms(call, advisor, repeat):
+    """Fastest of ``repeat`` uncached calls, in milliseconds."""
+    best = float("inf")
+    for _ in range(repeat):
+        advisor.render_cache.clear()
+        start = time.perf_counter()
+        call()
+        best = min(best, time.perf_counter() - start)
+    return best * 1000
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Side-by-side comparison against per-asset analyses")
+    parser.add_argument("--sizes", type=int, nargs="+", default=[10, 1000, 10000, 100000])
+    parser.add_argument("--compared", type=int, default=50, help="assets per comparison")
+    parser.add_argument("--repeat", type=int, default=20)
+    args = parser.parse_args()
+
+    previous = get_universe()
+    print(f"{'assets':>8} {'compared':>9} {'compare ms':>11} {'1 analysis ms':>14} {'N analyses ms':>14}")
+    try:
+        for size in args.sizes:
+            universe = synthetic_universe(size)
+            publish_universe(universe)
+            advisor = CryptoAdvisor(simulation_workers=1)
+            symbols = random.Random(size).sample(universe.symbols, min(args.compared, size))
+
+            # The first comparison of a snapshot also sorts the score rows it takes percentiles from
+            advisor.compare_cryptos(symbols)
+            compare_ms = best_ms(lambda: advisor.compare_cryptos(symbols), advisor, args.repeat)
+            single_ms = best_ms(lambda: advisor.analyze_specific_crypto(symbols[0]), advisor, args.repeat)
+            each_ms = best_ms(lambda: [advisor.analyze_specific_crypto(symbol) for symbol in symbols], advisor,
+                              args.repeat)
+            print(f"{size:>8} {len(symbols):>9} {compare_ms:>11.3f} {single_ms:>14.3f} {each_ms:>14.3f}")
+    finally:
+        publish_universe(previous)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,69 @@
+import argparse
+import os
+import random
+import tempfile
+import time
+
+from education import ContentStore, get_content_store, tokenize
+
+QUERIES = ["explain staking", "what is a seed phrase", "risks of stablecoins", "impermanent loss", "proof of work"]
+
+
+def write_synthetic_library(directory, n_articles, seed=0):
+    """
+    Writes ``n_articles`` articles made by shuffling the sections of the bundled
+    ones, each with a few made-up words so terms spread like a real library.
+    """
+    rng = random.Random(seed)
+    bundled = get_content_store()
+    sections = [section for topic in bundled.topics() for section in bundled.article(topic).sections]
+    for i in range(n_articles):
+        body = [f"# Article {i}"]
+        for section in rng.sample(sections, 6):
+            body.append(f"{section.text}\n- **Glossary**: term{rng.randrange(n_articles * 4)} term{rng.randrange(50)}")
+        with open(os.path.join(directory, f"article{i}.md"), "w", encoding="utf-8") as file:
+            file.write("\n\n".join(body))
+
+
+def scan(store, query):
+    """Baseline: score every section by how many query terms it contains."""
+    terms = set(tokenize(query))
+    best, best_hits = None, 0
+    for topic in store.topics():
+        for section in store.article(topic).sections:
+            hits = len(terms.intersection(tokenize(section.text)))
+            if hits > best_hits:
+                best, best_hits = section, hits
+    return best
+
+
+def best_us(fn, repeat):
+    best = float("inf")
+    for _ in range(repeat):
+        start = time.perf_counter()
+        fn()
+        best = min(best, time.perf_counter() - start)
+    return best * 1e6
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Education search: inverted index vs scanning every section")
+    parser.add_argument("--sizes", type=int, nargs="+", default=[10, 100, 1000])
+    parser.add_argument("--repeat", type=int, default=20)
+    args = parser.parse_args()
+
+    print(f"{'articles':>8} {'sections':>9} {'build ms':>9} {'search us':>10} {'scan us':>10}")
+    for size in args.sizes:
+        with tempfile.TemporaryDirectory() as directory:
+            write_synthetic_library(directory, size)
+            store = ContentStore(directory)
+            start = time.perf_counter()
+            index = store.index
+            build_ms = (time.perf_counter() - start) * 1000
+            search_us = max(best_us(lambda: store.search(query), args.repeat) for query in QUERIES)
+            scan_us = max(best_us(lambda: scan(store, query), max(1, args.repeat // 10)) for query in QUERIES)
+            print(f"{size:>8} {len(index):>9} {build_ms:>9.1f} {search_us:>10.1f} {scan_us:>10.0f}")
+
+
+if __name__ == "__main__":
+    main()
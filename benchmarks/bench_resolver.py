@@ -0,0 +1,73 @@
+import argparse
+import random
+import time
+
+from resolver import SymbolResolver
+
+SYLLABLES = ["ba", "co", "di", "fe", "ga", "hu", "ki", "lo", "ma", "ne", "po", "ra", "si", "to", "vu", "xe", "zo",
+             "chain", "coin", "dex", "fi", "net", "swap", "verse", "bit", "eth", "sol"]
+
+
+def pseudo_names(n_assets, seed=0):
+    """
+    ``n_assets`` distinct made-up one or two word names with symbols, shaped like
+    real listings (shared word parts such as "coin" and "chain").
+    """
+    rng = random.Random(seed)
+    names, symbols = [], []
+    seen = set()
+    while len(names) < n_assets:
+        words = ["".join(rng.choice(SYLLABLES) for _ in range(rng.randint(2, 4))) for _ in range(rng.randint(1, 2))]
+        name = " ".join(word.title() for word in words)
+        if name.lower() in seen:
+            continue
+        seen.add(name.lower())
+        names.append(name)
+        symbols.append(f"{words[0][:3].upper()}{len(names)}")
+    return symbols, names
+
+
+def typo(word, rng):
+    i = rng.randrange(1, len(word))
+    return word[:i] + rng.choice("aeiou") + word[i + 1:]
+
+
+def best_us(fn, messages, repeat):
+    best = float("inf")
+    for _ in range(repeat):
+        start = time.perf_counter()
+        for message in messages:
+            fn(message)
+        best = min(best, time.perf_counter() - start)
+    return best / len(messages) * 1e6
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Symbol resolver latency by universe size")
+    parser.add_argument("--sizes", type=int, nargs="+", default=[10, 1000, 20000, 100000])
+    parser.add_argument("--repeat", type=int, default=5)
+    args = parser.parse_args()
+
+    print(f"{'assets':>8} {'build ms':>9} {'exact us':>9} {'typo us':>9} {'two assets us':>14} {'no asset us':>12}")
+    for size in args.sizes:
+        rng = random.Random(size)
+        symbols, names = pseudo_names(size)
+        start = time.perf_counter()
+        resolver = SymbolResolver(symbols, names)
+        build_ms = (time.perf_counter() - start) * 1000
+
+        picks = [rng.randrange(size) for _ in range(200)]
+        exact = [f"Tell me about {names[p]}" for p in picks]
+        typos = [f"how is {' '.join(typo(word, rng) if len(word) > 4 else word for word in names[p].lower().split())}"
+                 for p in picks]
+        pairs = [f"compare {names[p]} and {symbols[q]} please" for p, q in zip(picks, reversed(picks))]
+        none = ["what should a beginner know about wallets and staking rewards?"] * len(picks)
+
+        found = sum(bool(resolver.resolve(message)) for message in typos)
+        print(f"{size:>8} {build_ms:>9.1f} {best_us(resolver.resolve, exact, args.repeat):>9.1f} "
+              f"{best_us(resolver.resolve, typos, args.repeat):>9.1f} {best_us(resolver.resolve, pairs, args.repeat):>14.1f} "
+              f"{best_us(resolver.resolve, none, args.repeat):>12.1f}   ({found}/{len(typos)} typos resolved)")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,47 @@
+import argparse
+import time
+
+from benchmarks.synthetic import synthetic_universe
+from scoring import RISK_TOLERANCES, batch_investment_scores, investment_score
+
+
+def check_parity(universe):
+    """
+    Asserts the batch scorer agrees with the per-asset scorer on every asset and
+    risk tolerance.
+    """
+    scores = batch_investment_scores(universe)
+    for row, risk_tolerance in enumerate(RISK_TOLERANCES):
+        for position in range(len(universe)):
+            expected = investment_score(universe.record(position), risk_tolerance)
+            assert scores[row, position] == expected, (universe.symbols[position], risk_tolerance)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Batch vs per-asset investment scoring")
+    parser.add_argument("--assets", type=int, default=50000)
+    parser.add_argument("--repeat", type=int, default=20)
+    args = parser.parse_args()
+
+    universe = synthetic_universe(args.assets)
+    check_parity(universe)
+    print(f"parity: batch and per-asset scores identical for {len(universe)} assets")
+
+    start = time.perf_counter()
+    for _ in range(args.repeat):
+        batch_investment_scores(universe)
+    batch_ms = (time.perf_counter() - start) / args.repeat * 1000
+
+    records = [universe.record(i) for i in range(len(universe))]
+    start = time.perf_counter()
+    for risk_tolerance in RISK_TOLERANCES:
+        for crypto in records:
+            investment_score(crypto, risk_tolerance)
+    loop_ms = (time.perf_counter() - start) * 1000
+
+    print(f"batch (3 tolerances): {batch_ms:8.2f} ms")
+    print(f"per-asset loop:       {loop_ms:8.2f} ms")
+
+
+if __name__ == "__main__":
+    main()
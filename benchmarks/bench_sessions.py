@@ -0,0 +1,59 @@
+import argparse
+import gc
+import tracemalloc
+
+from advisor_logic import CryptoAdvisor
+from benchmarks.synthetic import synthetic_universe
+from crypto_data import get_universe, publish_universe
+
+
+class PerSessionAdvisor(CryptoAdvisor):
+    """An advisor as each session used to own it, with its own copy of the records."""
+
+    def __init__(self):
+        super().__init__()
+        self.own_crypto_data = self.universe.records()
+
+
+def use_session(advisor):
+    advisor.get_investment_recommendations("medium")
+    advisor.analyze_specific_crypto(advisor.universe.symbols[0])
+    advisor.get_market_analysis()
+
+
+def measure(n_sessions, shared):
+    gc.collect()
+    tracemalloc.start()
+    sessions = []
+    advisor = CryptoAdvisor() if shared else None
+    for _ in range(n_sessions):
+        session = {"messages": [], "conversation_stage": "greeting", "user_profile": {}}
+        if not shared:
+            session["advisor"] = PerSessionAdvisor()
+        use_session(advisor if shared else session["advisor"])
+        sessions.append(session)
+    current, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return current, peak
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Memory of N sessions: per-session vs shared advisor")
+    parser.add_argument("--sessions", type=int, nargs="+", default=[1, 10, 100])
+    parser.add_argument("--assets", type=int, default=1000)
+    args = parser.parse_args()
+
+    previous = get_universe()
+    publish_universe(synthetic_universe(args.assets))
+    try:
+        print(f"{'sessions':>8} {'per-session MiB':>16} {'shared MiB':>11}")
+        for n in args.sessions:
+            before, _ = measure(n, shared=False)
+            after, _ = measure(n, shared=True)
+            print(f"{n:>8} {before / 2**20:>16.2f} {after / 2**20:>11.2f}")
+    finally:
+        publish_universe(previous)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,237 @@
+import argparse
+import inspect
+import time
+
+from advisor_logic import CryptoAdvisor
+from portfolio import round_percentages
+from topk import top_k_items
+
+
+class ConcatenatingAdvisor(CryptoAdvisor):
+    """
+    The response builders as they were before templates, built with ``+=``. They
+    read the snapshot exactly as the templated builders do, so the timings
+    compare string building alone.
+    """
+
+    def get_investment_recommendations(self, risk_tolerance="medium"):
+        """
+        Generate investment recommendations based on risk tolerance.
+        """
+        state = self._refresh_snapshot()
+        ranked_positions = self._get_ranked_positions(state, risk_tolerance)
+        
+        if not len(ranked_positions):
+            return "No suitable cryptocurrencies found for your risk profile. Please try a different risk level."
+        
+        ranked_positions = ranked_positions[:self.recommendation_count]
+        ranked_cryptos = [(state.universe.symbols[p], state.universe.record(p)) for p in ranked_positions]
+        
+        # Generate recommendations
+        response = f"## Investment Recommendations for {risk_tolerance.title()} Risk Tolerance\n\n"
+        
+        for i, (symbol, crypto) in enumerate(ranked_cryptos):
+            score = self._batch_score(state, symbol, risk_tolerance)
+            
+            response += f"### {i+1}. {crypto['name']} ({symbol})\n"
+            response += f"**Investment Score: {score}/10**\n\n"
+            response += f"📊 **Market Cap Rank**: #{crypto['market_cap_rank']}\n"
+            response += f"💰 **Current Price**: ${crypto['price_usd']:,.2f}\n"
+            response += f"📈 **30-day Performance**: {crypto['price_change_30d']:+.1f}%\n"
+            response += f"⚡ **Energy Efficiency**: {crypto['energy_consumption']}\n"
+            response += f"🛡️ **Risk Level**: {crypto['risk_level']}\n\n"
+            
+            # Why this recommendation
+            response += f"**Why {crypto['name']}?**\n"
+            response += self._generate_recommendation_reasoning(crypto, risk_tolerance)
+            response += "\n\n"
+        
+        # Add portfolio allocation suggestion
+        weights, cov = self._optimize_allocation(state, ranked_positions, risk_tolerance)
+        allocations = round_percentages(weights)
+        response += self._generate_portfolio_allocation(state, ranked_positions, allocations, cov, risk_tolerance,
+                                                        weights)
+        response += self._generate_downside_risk(state, ranked_positions, allocations, cov)
+        
+        # Add important disclaimer
+        response += "\n\n⚠️ **Important**: These recommendations are for educational purposes only. Always do your own research and never invest more than you can afford to lose."
+        
+        return response
+    
+    def analyze_specific_crypto(self, symbol):
+        """
+        Provide detailed analysis of a specific cryptocurrency.
+        """
+        state = self._refresh_snapshot()
+        crypto = state.universe.get(symbol.upper())
+        
+        if not crypto:
+            return f"Sorry, I don't have information about {symbol}. Please try another cryptocurrency."
+        
+        score = self._batch_score(state, crypto['symbol'], "medium")
+        
+        response = f"# {crypto['name']} ({crypto['symbol']}) Analysis\n\n"
+        
+        # Current metrics
+        response += "## 📊 Current Metrics\n"
+        response += f"- **Price**: ${crypto['price_usd']:,.2f}\n"
+        response += f"- **Market Cap Rank**: #{crypto['market_cap_rank']}\n"
+        response += f"- **Market Cap**: ${crypto['market_cap']:,.0f}\n"
+        response += f"- **24h Volume**: ${crypto['volume_24h']:,.0f}\n\n"
+        
+        # Performance
+        response += "## 📈 Performance\n"
+        response += f"- **24h Change**: {crypto['price_change_24h']:+.1f}%\n"
+        response += f"- **7d Change**: {crypto['price_change_7d']:+.1f}%\n"
+        response += f"- **30d Change**: {crypto['price_change_30d']:+.1f}%\n\n"
+        
+        # Sustainability & Technology
+        response += "## 🌱 Sustainability & Technology\n"
+        response += f"- **Energy Consumption**: {crypto['energy_consumption']}\n"
+        response += f"- **Consensus Mechanism**: {crypto['consensus_mechanism']}\n"
+        response += f"- **Sustainability Score**: {crypto['sustainability_score']}/10\n"
+        response += f"- **Technology Maturity**: {crypto['technology_maturity']}/10\n\n"
+        
+        # Risk Assessment
+        response += "## ⚠️ Risk Assessment\n"
+        response += f"- **Overall Risk Level**: {crypto['risk_level']}\n"
+        response += f"- **Volatility**: {crypto['volatility']}\n"
+        response += f"- **Regulatory Clarity**: {crypto['regulatory_clarity']}/10\n"
+        response += f"- **Adoption Score**: {crypto['adoption_score']}/10\n\n"
+        
+        # Use Cases
+        response += "## 🎯 Primary Use Cases\n"
+        for use_case in crypto['use_cases']:
+            response += f"- {use_case}\n"
+        response += "\n"
+        
+        # Investment verdict
+        response += f"## 🎯 Investment Verdict (Score: {score}/10)\n"
+        response += self._generate_investment_verdict(crypto, score)
+        
+        return response
+    
+    def get_market_analysis(self):
+        """
+        Provide general market analysis and trends.
+        """
+        universe = self._refresh_snapshot().universe
+        response = "# 📊 Cryptocurrency Market Analysis\n\n"
+        
+        # Market leaders
+        top_performers = self._get_top_performers(universe)
+        response += "## 🚀 Top Performers (30-day)\n"
+        for symbol, crypto in top_performers:
+            response += f"- **{crypto['name']}**: {crypto['price_change_30d']:+.1f}%\n"
+        response += "\n"
+        
+        # Market cap analysis
+        response += "## 💰 Market Cap Analysis\n"
+        market_cap = universe.column("market_cap")
+        large_cap = int((market_cap > 50000000000).sum())
+        mid_cap = int(((market_cap >= 10000000000) & (market_cap <= 50000000000)).sum())
+        small_cap = int((market_cap < 10000000000).sum())
+        
+        response += f"- **Large Cap (>$50B)**: {large_cap} cryptocurrencies\n"
+        response += f"- **Mid Cap ($10B-$50B)**: {mid_cap} cryptocurrencies\n"
+        response += f"- **Small Cap (<$10B)**: {small_cap} cryptocurrencies\n\n"
+        
+        # Sustainability trends
+        sustainable_positions = universe.index.query(sustainability_score=(7, None))
+        response += "## 🌱 Sustainability Trends\n"
+        response += f"**{len(sustainable_positions)} cryptocurrencies** have high sustainability scores (7+/10)\n\n"
+        response += "**Most Sustainable Options:**\n"
+        for position in sustainable_positions[:3]:
+            crypto = universe.record(position)
+            response += f"- {crypto['name']}: {crypto['sustainability_score']}/10 ({crypto['consensus_mechanism']})\n"
+        
+        response += "\n## 📈 Market Insights\n"
+        response += "- Proof of Stake networks are gaining adoption due to energy efficiency\n"
+        response += "- DeFi and smart contract platforms showing strong growth\n"
+        response += "- Regulatory clarity is improving for established cryptocurrencies\n"
+        response += "- Institutional adoption continues to drive large-cap crypto stability\n"
+        
+        return response
+    
+    def get_sustainability_analysis(self):
+        """
+        Provide analysis focused on sustainable cryptocurrency options.
+        """
+        universe = self._refresh_snapshot().universe
+        sustainable_cryptos = universe.records(universe.index.query(sustainability_score=(7, None)))
+        
+        response = "# 🌱 Sustainable Cryptocurrency Analysis\n\n"
+        response += "Environmental impact is increasingly important in crypto investments. Here are the most sustainable options:\n\n"
+        
+        # Sort by sustainability score
+        sorted_sustainable = top_k_items(sustainable_cryptos.values(),
+                                         key=lambda crypto: crypto['sustainability_score'])
+        
+        for crypto in sorted_sustainable:
+            response += f"## {crypto['name']} ({crypto['symbol']})\n"
+            response += f"**Sustainability Score: {crypto['sustainability_score']}/10**\n\n"
+            response += f"- **Consensus**: {crypto['consensus_mechanism']}\n"
+            response += f"- **Energy Use**: {crypto['energy_consumption']}\n"
+            response += f"- **Market Cap Rank**: #{crypto['market_cap_rank']}\n"
+            response += f"- **Why It's Sustainable**: "
+            
+            if crypto['consensus_mechanism'] == "Proof of Stake":
+                response += "Uses Proof of Stake which requires 99%+ less energy than Bitcoin's Proof of Work\n"
+            elif "Proof of History" in crypto['consensus_mechanism']:
+                response += "Innovative consensus mechanism designed for efficiency and speed\n"
+            elif crypto['consensus_mechanism'] == "Stellar Consensus Protocol":
+                response += "Custom consensus protocol optimized for energy efficiency and fast settlements\n"
+            else:
+                response += "Designed with energy efficiency and sustainability in mind\n"
+            
+            response += "\n"
+        
+        response += "## 🌍 Why Sustainability Matters\n"
+        response += "- **Environmental Impact**: Sustainable cryptos use 99% less energy\n"
+        response += "- **Future Regulations**: Governments favor eco-friendly technologies\n"
+        response += "- **Corporate Adoption**: Companies prefer sustainable blockchain solutions\n"
+        response += "- **Long-term Viability**: Lower operating costs and regulatory risks\n"
+        
+        return response
+
+
+def best_us(fn, repeat):
+    best = float("inf")
+    for _ in range(repeat):
+        start = time.perf_counter()
+        fn()
+        best = min(best, time.perf_counter() - start)
+    return best * 1e6
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Template rendering vs string concatenation")
+    parser.add_argument("--repeat", type=int, default=2000)
+    args = parser.parse_args()
+
+    advisor = CryptoAdvisor()
+    legacy = ConcatenatingAdvisor()
+    cases = [("get_investment_recommendations", (risk,)) for risk in ("low", "medium", "high")]
+    cases += [("analyze_specific_crypto", (symbol,)) for symbol in advisor.universe.symbols]
+    cases += [("get_market_analysis", ()), ("get_sustainability_analysis", ())]
+
+    timings = {}
+    for name, call_args in cases:
+        # Unwrap the metrics and render cache layers so both sides do the full render
+        templated = inspect.unwrap(getattr(CryptoAdvisor, name))
+        concatenated = getattr(ConcatenatingAdvisor, name)
+        assert templated(advisor, *call_args) == concatenated(legacy, *call_args), (name, call_args)
+
+        total = timings.setdefault(name, [0.0, 0.0, 0])
+        total[0] += best_us(lambda: concatenated(legacy, *call_args), args.repeat)
+        total[1] += best_us(lambda: templated(advisor, *call_args), args.repeat)
+        total[2] += 1
+
+    print(f"output byte-identical for {len(cases)} calls")
+    print(f"{'method':>32} {'concat us':>10} {'template us':>12}")
+    for name, (concat_us, template_us, calls) in timings.items():
+        print(f"{name:>32} {concat_us / calls:>10.1f} {template_us / calls:>12.1f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,51 @@
+import argparse
+import time
+
+import numpy as np
+
+from benchmarks.synthetic import synthetic_universe
+from scoring import batch_investment_scores
+from topk import top_k_indices, top_k_items
+
+
+def best_ms(fn, repeat):
+    best = float("inf")
+    for _ in range(repeat):
+        start = time.perf_counter()
+        fn()
+        best = min(best, time.perf_counter() - start)
+    return best * 1000
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Top-k selection vs full sorts")
+    parser.add_argument("--sizes", type=int, nargs="+", default=[1000, 10000, 100000])
+    parser.add_argument("--k", type=int, default=5)
+    parser.add_argument("--repeat", type=int, default=10)
+    args = parser.parse_args()
+
+    print(f"{'assets':>8} {'column':>16} {'argsort ms':>11} {'top-k ms':>9} {'sorted ms':>10} {'heap ms':>8}")
+    for size in args.sizes:
+        universe = synthetic_universe(size)
+        columns = {
+            "score": batch_investment_scores(universe)[1],  # heavy ties
+            "price_change_30d": universe.column("price_change_30d"),
+            "market_cap": universe.column("market_cap"),
+        }
+        for name, values in columns.items():
+            full = np.argsort(-values, kind="stable")[:args.k]
+            assert np.array_equal(top_k_indices(values, args.k), full), name
+
+            items = list(enumerate(values.tolist()))
+            key = lambda x: x[1]
+            assert top_k_items(items, args.k, key) == sorted(items, key=key, reverse=True)[:args.k], name
+
+            print(f"{size:>8} {name:>16} "
+                  f"{best_ms(lambda: np.argsort(-values, kind='stable')[:args.k], args.repeat):>11.3f} "
+                  f"{best_ms(lambda: top_k_indices(values, args.k), args.repeat):>9.3f} "
+                  f"{best_ms(lambda: sorted(items, key=key, reverse=True)[:args.k], args.repeat):>10.3f} "
+                  f"{best_ms(lambda: top_k_items(items, args.k, key), args.repeat):>8.3f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,227 @@
+import argparse
+import asyncio
+import json
+import random
+import tempfile
+import time
+from collections import Counter
+from concurrent.futures import ThreadPoolExecutor
+
+import numpy as np
+
+from advisor_logic import CryptoAdvisor
+from benchmarks.synthetic import synthetic_universe
+from chat import handle_crypto_specific_query, handle_investment_query, process_user_input
+from chat_history import ChatHistory
+from crypto_data import get_universe, publish_universe
+
+# Share of messages per intent; "crypto" and "investment" go through their chat
+# handlers directly, everything else through process_user_input
+DEFAULT_MIX = {
+    "education": 0.25,
+    "investment": 0.25,
+    "crypto": 0.25,
+    "market": 0.1,
+    "sustainability": 0.1,
+    "default": 0.05,
+}
+
+MESSAGES = {
+    "education": ["What is Bitcoin?", "explain staking", "What is a seed phrase?", "explain the risk of crypto",
+                  "help me learn about stablecoins"],
+    "investment": ["Recommend some {risk} cryptocurrencies", "What should I invest in as a {risk} investor?",
+                   "Build me a {risk} portfolio"],
+    "crypto": ["Tell me about {name}", "How does {symbol} look?", "Is {name} a good buy?"],
+    "market": ["How is the market doing?", "Show me market trends", "market performance this month"],
+    "sustainability": ["Which cryptos are most sustainable?", "green crypto options", "eco friendly coins"],
+    "default": ["hello", "thanks!", "ok"],
+}
+
+RISK_WORDS = {"low": "safe", "medium": "balanced", "high": "aggressive"}
+
+
+class Session:
+    """
+    One simulated chat session: its own history, risk appetite, favourite assets
+    and random stream, the way a browser session keeps its own Streamlit state.
+    """
+
+    def __init__(self, session_id, universe, mix, spill_dir, seed=0):
+        self.session_id = session_id
+        self.rng = random.Random(seed * 1_000_003 + session_id)
+        self.history = ChatHistory(spill_dir=spill_dir)
+        self.risk_tolerance = self.rng.choice(("low", "medium", "high"))
+        self.favourites = self.rng.sample(range(len(universe)), min(3, len(universe)))
+        self.intents, self.weights = zip(*mix.items())
+
+    def next_message(self, universe):
+        """Returns ``(intent, message)`` for this session's next turn."""
+        intent = self.rng.choices(self.intents, self.weights)[0]
+        position = self.rng.choice(self.favourites)
+        message = self.rng.choice(MESSAGES[intent]).format(
+            risk=RISK_WORDS[self.risk_tolerance],
+            name=universe.column("name")[position],
+            symbol=universe.symbols[position],
+        )
+        return intent, message
+
+    def respond(self, intent, message, advisor):
+        """Runs one turn through the chat pipeline and records it in the history."""
+        self.history.append("user", message)
+        if intent == "investment":
+            response = handle_investment_query(message, advisor)
+        elif intent == "crypto":
+            response = handle_crypto_specific_query(message, advisor)
+        else:
+            response = process_user_input(message, advisor)
+        self.history.append("assistant", response)
+        return response
+
+
+class LoadGenerator:
+    """
+    Drives ``sessions`` concurrent chat sessions against one shared advisor for
+    ``duration`` seconds. Sessions are asyncio tasks that think for an
+    exponentially distributed time between messages; each turn runs on a
+    thread pool, like Streamlit's script threads. Latency is measured from the
+    moment a message is sent, so it includes time queued for a thread.
+    """
+
+    def __init__(self, advisor, mix=None, think_ms=500.0, threads=8, seed=0):
+        self.advisor = advisor
+        self.mix = mix or DEFAULT_MIX
+        self.think_ms = think_ms
+        self.threads = threads
+        self.seed = seed
+
+    async def run(self, sessions, duration):
+        """Returns the summary dict of one load level."""
+        loop = asyncio.get_running_loop()
+        universe = get_universe()
+        latencies, intents, errors = [], [], Counter()
+        with tempfile.TemporaryDirectory() as spill_dir, \
+                ThreadPoolExecutor(self.threads, thread_name_prefix="session") as executor:
+            deadline = loop.time() + duration
+
+            async def drive(session):
+                # Sessions start spread over one think time instead of all at once
+                await asyncio.sleep(session.rng.random() * self.think_ms / 1000)
+                while loop.time() < deadline:
+                    intent, message = session.next_message(universe)
+                    start = time.perf_counter()
+                    try:
+                        await loop.run_in_executor(executor, session.respond, intent, message, self.advisor)
+                    except Exception as error:  # a failed turn is counted, the session carries on
+                        errors[type(error).__name__] += 1
+                    else:
+                        latencies.append(time.perf_counter() - start)
+                        intents.append(intent)
+                    await asyncio.sleep(session.rng.expovariate(1000 / self.think_ms) if self.think_ms else 0)
+
+            started = time.perf_counter()
+            await asyncio.gather(*(drive(Session(i, universe, self.mix, spill_dir, self.seed))
+                                   for i in range(sessions)))
+            elapsed = time.perf_counter() - started
+        return summarize(sessions, elapsed, latencies, intents, errors)
+
+
+def summarize(sessions, elapsed, latencies, intents, errors):
+    latencies_ms = np.array(latencies) * 1000
+    summary = {"sessions": sessions, "seconds": elapsed, "messages": len(latencies),
+               "throughput": len(latencies) / elapsed if elapsed else 0.0, "errors": dict(errors)}
+    for name, q in (("p50_ms", 50), ("p95_ms", 95), ("p99_ms", 99)):
+        summary[name] = float(np.percentile(latencies_ms, q)) if len(latencies_ms) else 0.0
+    summary["max_ms"] = float(latencies_ms.max()) if len(latencies_ms) else 0.0
+    by_intent = {}
+    intents = np.array(intents)
+    for intent in sorted(set(intents.tolist())):
+        values = latencies_ms[intents == intent]
+        by_intent[intent] = {"messages": len(values), "p95_ms": float(np.percentile(values, 95))}
+    summary["by_intent"] = by_intent
+    return summary
+
+
+async def publish_ticks(every, stop, seed=0):
+    """Publishes a snapshot with jittered prices every ``every`` seconds, like the market feed."""
+    rng = np.random.default_rng(seed)
+    while not stop.is_set():
+        try:
+            await asyncio.wait_for(stop.wait(), every)
+        except asyncio.TimeoutError:
+            universe = get_universe()
+            positions = np.arange(len(universe))
+            prices = universe.column("price_usd") * (1 + rng.normal(0, 0.002, len(universe)))
+            publish_universe(universe.with_values({"price_usd": (positions, prices)}))
+
+
+async def ramp(generator, levels, duration, publish_every=None):
+    results = []
+    stop = asyncio.Event()
+    ticker = asyncio.ensure_future(publish_ticks(publish_every, stop)) if publish_every else None
+    try:
+        for sessions in levels:
+            result = await generator.run(sessions, duration)
+            _print_level(result)
+            results.append(result)
+    finally:
+        stop.set()
+        if ticker is not None:
+            await ticker
+    return results
+
+
+def _parse_mix(spec):
+    mix = {}
+    for part in spec.split(","):
+        intent, _, share = part.partition("=")
+        if intent not in MESSAGES:
+            raise SystemExit(f"Unknown intent {intent!r} (expected one of {', '.join(MESSAGES)})")
+        mix[intent] = float(share)
+    if not any(mix.values()):
+        raise SystemExit("The intent mix needs at least one positive share")
+    return mix
+
+
+def _print_level(result):
+    slowest = max(result["by_intent"].items(), key=lambda item: item[1]["p95_ms"], default=("-", {}))[0]
+    print(f"{result['sessions']:>8} {result['messages']:>9} {result['throughput']:>8.1f} "
+          f"{result['p50_ms']:>9.1f} {result['p95_ms']:>9.1f} {result['p99_ms']:>9.1f} "
+          f"{sum(result['errors'].values()):>6}  {slowest}", flush=True)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Concurrent chat sessions against the advisor core, headless")
+    parser.add_argument("--sessions", type=int, nargs="+", default=[10, 100, 1000],
+                        help="concurrency levels to ramp through")
+    parser.add_argument("--duration", type=float, default=10.0, help="seconds per level")
+    parser.add_argument("--think-ms", type=float, default=500.0, help="mean think time between messages")
+    parser.add_argument("--mix", help="intent shares, e.g. education=0.5,crypto=0.5 (default: a realistic mix)")
+    parser.add_argument("--threads", type=int, default=8, help="threads running chat turns")
+    parser.add_argument("--assets", type=int, help="use a synthetic universe of this many assets")
+    parser.add_argument("--publish-every", type=float, help="publish a new price snapshot every N seconds")
+    parser.add_argument("--sim-workers", type=int, default=1, help="Monte Carlo worker processes")
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("-o", "--output", help="write the level summaries as JSON to this file")
+    args = parser.parse_args()
+
+    previous = get_universe()
+    if args.assets:
+        publish_universe(synthetic_universe(args.assets, args.seed))
+    advisor = CryptoAdvisor(simulation_workers=args.sim_workers)
+    generator = LoadGenerator(advisor, _parse_mix(args.mix) if args.mix else None, args.think_ms, args.threads,
+                              args.seed)
+    try:
+        print(f"{'sessions':>8} {'messages':>9} {'msg/s':>8} {'p50 ms':>9} {'p95 ms':>9} {'p99 ms':>9} "
+              f"{'errors':>6}  slowest intent (p95)")
+        results = asyncio.run(ramp(generator, args.sessions, args.duration, args.publish_every))
+    finally:
+        advisor.risk_simulator.close()
+        publish_universe(previous)
+
+    if args.output:
+        with open(args.output, "w", encoding="utf-8") as output:
+            json.dump({"settings": vars(args), "levels": results}, output, indent=1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,228 @@
+import argparse
+import datetime
+import json
+import platform
+import subprocess
+import sys
+import time
+import tracemalloc
+
+import numpy as np
+
+from advisor_logic import CryptoAdvisor
+from benchmarks.synthetic import synthetic_universe
+from chat import process_user_input
+from crypto_data import get_universe, publish_universe
+
+DEFAULT_SIZES = (10, 1000, 10000, 100000)
+
+# Chat messages covering every intent the router knows
+CHAT_QUERIES = (
+    "What is Bitcoin?",
+    "explain staking",
+    "Recommend some safe cryptocurrencies for a beginner",
+    "Tell me about {symbol}",
+    "How is the market trend this week?",
+    "Which cryptos are most sustainable?",
+    "hello",
+)
+
+# Fields compared between runs and the percentiles they come from
+PERCENTILES = {"p50_ms": 50, "p95_ms": 95, "p99_ms": 99}
+
+
+def entry_points(advisor, universe, seed=0):
+    """
+    Returns ``{name: call}`` for every advisor entry point. Each call takes the
+    iteration number so arguments rotate (risk tolerances, symbols, queries).
+    """
+    rng = np.random.default_rng(seed)
+    symbols = [universe.symbols[p] for p in rng.integers(0, len(universe), 64)]
+    risk_tolerances = ("low", "medium", "high")
+    return {
+        "load_snapshot": lambda i: advisor.load_snapshot(universe),
+        "get_investment_recommendations": lambda i: advisor.get_investment_recommendations(risk_tolerances[i % 3]),
+        "analyze_specific_crypto": lambda i: advisor.analyze_specific_crypto(symbols[i % len(symbols)]),
+        "get_market_analysis": lambda i: advisor.get_market_analysis(),
+        "get_sustainability_analysis": lambda i: advisor.get_sustainability_analysis(),
+        "process_user_input": lambda i: process_user_input(
+            CHAT_QUERIES[i % len(CHAT_QUERIES)].format(symbol=symbols[i % len(symbols)]), advisor),
+    }
+
+
+def clear_caches(advisor):
+    advisor.render_cache.clear()
+    advisor.risk_simulator.cache.clear()
+
+
+def measure(call, advisor, mode, iterations, max_seconds):
+    """
+    Latencies in ms of up to ``iterations`` calls, stopping early (after at least
+    five) once ``max_seconds`` is spent. ``cold`` clears the response caches before
+    every call; ``warm`` measures cache hits.
+    """
+    # Warm-up: imports and router compilation, and in warm mode every response the
+    # loop below asks for
+    for i in range(iterations if mode == "warm" else 1):
+        call(i)
+    latencies = []
+    deadline = time.perf_counter() + max_seconds
+    for i in range(iterations):
+        if mode == "cold":
+            clear_caches(advisor)
+        start = time.perf_counter()
+        call(i)
+        latencies.append((time.perf_counter() - start) * 1000)
+        if len(latencies) >= 5 and time.perf_counter() > deadline:
+            break
+    return latencies
+
+
+def peak_memory(call, advisor):
+    """Peak traced allocation in KiB of one cold call."""
+    clear_caches(advisor)
+    tracemalloc.start()
+    try:
+        call(1)
+        return tracemalloc.get_traced_memory()[1] / 1024
+    finally:
+        tracemalloc.stop()
+
+
+def run_suite(sizes=DEFAULT_SIZES, modes=("cold", "warm"), iterations=50, max_seconds=5.0, entries=None,
+              seed=0, log=None):
+    """Runs every entry point at every universe size; returns a list of result dicts."""
+    results = []
+    previous = get_universe()
+    try:
+        for size in sizes:
+            universe = synthetic_universe(size, seed)
+            publish_universe(universe)
+            advisor = CryptoAdvisor(simulation_workers=1)
+            for name, call in entry_points(advisor, universe, seed).items():
+                if entries and name not in entries:
+                    continue
+                peak_kib = peak_memory(call, advisor)
+                # Loading a snapshot has no cache, so it only has a cold mode
+                for mode in modes if name != "load_snapshot" else ("cold",):
+                    latencies = np.array(measure(call, advisor, mode, iterations, max_seconds))
+                    result = {"size": size, "entry": name, "mode": mode, "n": len(latencies),
+                              "mean_ms": float(latencies.mean())}
+                    result.update({field: float(np.percentile(latencies, q)) for field, q in PERCENTILES.items()})
+                    result["peak_kib"] = peak_kib
+                    results.append(result)
+                    if log:
+                        log(result)
+    finally:
+        publish_universe(previous)
+    return results
+
+
+def _git_commit():
+    try:
+        return subprocess.run(["git", "rev-parse", "--short", "HEAD"], capture_output=True, text=True,
+                              check=True).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+def compare(baseline, current, metric="p50_ms", threshold=0.2, min_delta=0.05):
+    """
+    Pairs results of two runs by (size, entry, mode) and returns ``(rows, regressions)``.
+    A regression is a ``metric`` more than ``threshold`` (relative) and
+    ``min_delta`` (absolute, in the metric's unit) slower than the baseline.
+    """
+    key = lambda result: (result["size"], result["entry"], result["mode"])
+    base = {key(result): result for result in baseline["results"]}
+    rows, regressions = [], []
+    for result in current["results"]:
+        before = base.get(key(result))
+        if before is None:
+            continue
+        old, new = before[metric], result[metric]
+        change = (new - old) / old if old else 0.0
+        row = key(result) + (old, new, change)
+        rows.append(row)
+        if change > threshold and new - old > min_delta:
+            regressions.append(row)
+    return rows, regressions
+
+
+def _print_result(result):
+    print(f"{result['size']:>7} {result['entry']:<31} {result['mode']:<5} {result['n']:>4} "
+          f"{result['p50_ms']:>9.3f} {result['p95_ms']:>9.3f} {result['p99_ms']:>9.3f} {result['peak_kib']:>10.0f}",
+          flush=True)
+
+
+def _print_comparison(rows, regressions, metric, threshold):
+    flagged = set(regressions)
+    print(f"{'assets':>7} {'entry point':<31} {'mode':<5} {'before':>9} {'after':>9} {'change':>8}")
+    for row in rows:
+        size, entry, mode, old, new, change = row
+        print(f"{size:>7} {entry:<31} {mode:<5} {old:>9.3f} {new:>9.3f} {change:>+8.1%}"
+              f"{'  REGRESSION' if row in flagged else ''}")
+    print(f"{len(regressions)} regression(s) in {metric} over {threshold:.0%}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Latency and memory benchmarks of the advisor entry points")
+    commands = parser.add_subparsers(dest="command", required=True)
+
+    run = commands.add_parser("run", help="benchmark over synthetic universes")
+    run.add_argument("--sizes", type=int, nargs="+", default=list(DEFAULT_SIZES))
+    run.add_argument("--entries", nargs="+", help="only these entry points")
+    run.add_argument("--modes", nargs="+", default=["cold", "warm"], choices=["cold", "warm"])
+    run.add_argument("--iterations", type=int, default=50, help="calls per entry point and mode")
+    run.add_argument("--max-seconds", type=float, default=5.0, help="time budget per entry point and mode")
+    run.add_argument("--seed", type=int, default=0)
+    run.add_argument("-o", "--output", help="write results as JSON to this file")
+    run.add_argument("--baseline", help="compare against this results file and fail on regressions")
+
+    diff = commands.add_parser("compare", help="compare two results files")
+    diff.add_argument("baseline")
+    diff.add_argument("current")
+
+    for command in (run, diff):
+        command.add_argument("--metric", default="p50_ms", choices=list(PERCENTILES) + ["mean_ms", "peak_kib"])
+        command.add_argument("--threshold", type=float, default=0.2, help="relative slowdown that fails (0.2 = 20%%)")
+        command.add_argument("--min-delta", type=float, default=0.05,
+                             help="ignore smaller absolute changes (ms, or KiB for peak_kib)")
+    args = parser.parse_args()
+
+    if args.command == "run":
+        print(f"{'assets':>7} {'entry point':<31} {'mode':<5} {'n':>4} "
+              f"{'p50 ms':>9} {'p95 ms':>9} {'p99 ms':>9} {'peak KiB':>10}")
+        results = run_suite(args.sizes, args.modes, args.iterations, args.max_seconds, args.entries, args.seed,
+                            log=_print_result)
+        current = {
+            "meta": {
+                "created": datetime.datetime.now(datetime.timezone.utc).isoformat(timespec="seconds"),
+                "commit": _git_commit(),
+                "python": platform.python_version(),
+                "numpy": np.__version__,
+                "platform": platform.platform(),
+                "seed": args.seed,
+                "iterations": args.iterations,
+            },
+            "results": results,
+        }
+        if args.output:
+            with open(args.output, "w", encoding="utf-8") as output:
+                json.dump(current, output, indent=1)
+        if not args.baseline:
+            return
+        with open(args.baseline, encoding="utf-8") as source:
+            baseline = json.load(source)
+    else:
+        with open(args.baseline, encoding="utf-8") as source:
+            baseline = json.load(source)
+        with open(args.current, encoding="utf-8") as source:
+            current = json.load(source)
+
+    rows, regressions = compare(baseline, current, args.metric, args.threshold, args.min_delta)
+    _print_comparison(rows, regressions, args.metric, args.threshold)
+    sys.exit(1 if regressions else 0)
+
+
+if __name__ == "__main__":
+    main()
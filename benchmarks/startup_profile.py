@@ -0,0 +1,94 @@
+import argparse
+import re
+import statistics
+import subprocess
+import sys
+
+# Modules every chat request needs; their cold import is what a new worker pays
+CORE_MODULES = ("advisor_logic", "chat")
+
+# Cold import budget of the core (median); it takes 120-170 ms today, and
+# pandas alone would add more than the headroom
+DEFAULT_BUDGET_MS = 300
+
+# Heavy modules the core must not pull in at import time
+FORBIDDEN_MODULES = ("pandas", "streamlit", "asyncio", "multiprocessing")
+
+# Core modules imported on first use rather than with the core
+DEFERRED_MODULES = ("resolver", "risk_simulation")
+
+_LINE = re.compile(r"import time:\s+(\d+) \|\s+(\d+) \|( *)(\S+)")
+
+
+def import_times(modules):
+    """
+    Returns ``{module: (self_us, cumulative_us, depth)}`` from one fresh interpreter
+    importing ``modules`` under ``-X importtime``.
+    """
+    code = "; ".join(f"import {module}" for module in modules)
+    result = subprocess.run([sys.executable, "-X", "importtime", "-c", code],
+                            capture_output=True, text=True, check=True)
+    times = {}
+    for line in result.stderr.splitlines():
+        match = _LINE.match(line)
+        if match:
+            self_us, cumulative_us, indent, module = match.groups()
+            times[module] = (int(self_us), int(cumulative_us), len(indent) // 2)
+    return times
+
+
+def profile(modules=CORE_MODULES, runs=5):
+    """
+    Returns ``(total_ms, median)``: the median cold import time of ``modules`` and
+    ``{module: (self_us, cumulative_us)}`` medians over ``runs`` fresh interpreters.
+    """
+    runs = [import_times(modules) for _ in range(runs)]
+    names = set().union(*runs)
+    median = {
+        module: (statistics.median(run[module][0] for run in runs if module in run),
+                 statistics.median(run[module][1] for run in runs if module in run))
+        for module in names
+    }
+    # Top-level entries of the report are what each requested import cost in total
+    total_ms = sum(median[module][1] for module in names if runs[0].get(module, (0, 0, 1))[2] == 0) / 1000
+    return total_ms, median
+
+
+def check(modules, total_ms, median, budget_ms=DEFAULT_BUDGET_MS):
+    """
+    Failure messages for a profile: heavy or deferred modules in the core, or time
+    over ``budget_ms`` (0 disables).
+    """
+    failures = []
+    forbidden = sorted({module.split(".")[0] for module in median} & set(FORBIDDEN_MODULES + DEFERRED_MODULES))
+    if set(modules) <= set(CORE_MODULES) and forbidden:
+        failures.append(f"core imports heavy modules: {', '.join(forbidden)}")
+    if budget_ms and total_ms > budget_ms:
+        failures.append(f"cold import took {total_ms:.1f} ms, over the {budget_ms:.0f} ms budget")
+    return failures
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Cold import time per module, checked against a budget")
+    parser.add_argument("modules", nargs="*", default=list(CORE_MODULES))
+    parser.add_argument("--runs", type=int, default=5, help="fresh interpreters to take the median over")
+    parser.add_argument("--top", type=int, default=25, help="modules to list")
+    parser.add_argument("--budget-ms", type=float, default=DEFAULT_BUDGET_MS,
+                        help="exit non-zero if importing the modules takes longer (median) than this; 0 disables")
+    args = parser.parse_args()
+
+    total_ms, median = profile(args.modules, args.runs)
+
+    print(f"cold import of {', '.join(args.modules)}: {total_ms:.1f} ms (median of {args.runs})")
+    print(f"{'self ms':>8} {'cumulative ms':>14}  module")
+    for module, (self_us, cumulative_us) in sorted(median.items(), key=lambda item: -item[1][1])[:args.top]:
+        print(f"{self_us / 1000:>8.1f} {cumulative_us / 1000:>14.1f}  {module}")
+
+    failures = check(args.modules, total_ms, median, args.budget_ms)
+    for failure in failures:
+        print(f"FAIL: {failure}")
+    sys.exit(1 if failures else 0)
+
+
+if __name__ == "__main__":
+    main()
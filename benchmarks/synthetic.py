@@ -0,0 +1,63 @@
+import numpy as np
+
+from crypto_data import get_crypto_data
+from universe import Universe
+
+
+def synthetic_crypto_data(n_assets, seed=0):
+    """
+    Returns a seeded synthetic ``{symbol: record}`` mapping with the same schema as
+    get_crypto_data(). Categorical values are drawn from the predefined data.
+    """
+    rng = np.random.default_rng(seed)
+    template = list(get_crypto_data().values())
+
+    def choices(field):
+        values = sorted({crypto[field] for crypto in template})
+        return [values[i] for i in rng.integers(0, len(values), n_assets)]
+
+    use_case_pool = sorted({use_case for crypto in template for use_case in crypto["use_cases"]})
+    ranks = rng.permutation(n_assets) + 1
+    market_caps = (1e12 / ranks ** 1.1).astype(np.int64)
+    prices = np.round(rng.lognormal(1.0, 2.5, n_assets), 4)
+    changes_30d = np.round(rng.normal(5, 20, n_assets), 1)
+    changes_7d = np.round(changes_30d / 3 + rng.normal(0, 4, n_assets), 1)
+    changes_24h = np.round(changes_7d / 5 + rng.normal(0, 2, n_assets), 1)
+    volumes = (market_caps * rng.uniform(0.01, 0.1, n_assets)).astype(np.int64)
+    scores = rng.integers(1, 11, (5, n_assets))
+    energy = choices("energy_consumption")
+    consensus = choices("consensus_mechanism")
+    volatility = choices("volatility")
+    risk = choices("risk_level")
+
+    data = {}
+    for i in range(n_assets):
+        symbol = f"SYN{i}"
+        data[symbol] = {
+            "name": f"Synthetic {i}",
+            "symbol": symbol,
+            "market_cap_rank": int(ranks[i]),
+            "market_cap": int(market_caps[i]),
+            "price_usd": float(prices[i]),
+            "price_change_24h": float(changes_24h[i]),
+            "price_change_7d": float(changes_7d[i]),
+            "price_change_30d": float(changes_30d[i]),
+            "volume_24h": int(volumes[i]),
+            "energy_consumption": energy[i],
+            "consensus_mechanism": consensus[i],
+            "sustainability_score": int(scores[0, i]),
+            "volatility": volatility[i],
+            "adoption_score": int(scores[1, i]),
+            "technology_maturity": int(scores[2, i]),
+            "regulatory_clarity": int(scores[3, i]),
+            "use_cases": [use_case_pool[j] for j in rng.choice(len(use_case_pool), 2, replace=False)],
+            "risk_level": risk[i],
+        }
+    return data
+
+
+def synthetic_universe(n_assets, seed=0):
+    """
+    Returns a seeded synthetic Universe snapshot of ``n_assets`` assets.
+    """
+    return Universe.from_records(synthetic_crypto_data(n_assets, seed))
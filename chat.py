@@ -0,0 +1,136 @@
+from crypto_data import get_universe
+from education import (DEFAULT_TOPIC, MIN_SEARCH_SCORE, RISK_TOPIC, format_section, get_content_store,
+                       get_educational_content, get_risk_explanation, search_education)
+from intents import get_router
+import metrics
+
+DEFAULT_RESPONSE = """
+        I can help you with:
+        
+        🎓 **Education**: Ask me to explain cryptocurrencies, risks, or specific coins
+        📊 **Recommendations**: Ask for investment suggestions based on your risk tolerance
+        🔍 **Analysis**: Ask about specific cryptocurrencies or market trends
+        🌱 **Sustainability**: Ask about eco-friendly crypto options
+        
+        Try asking something like:
+        - "What is Bitcoin?"
+        - "Recommend some cryptocurrencies for a beginner"
+        - "Which cryptos are most sustainable?"
+        - "Compare Bitcoin vs Ethereum vs Solana"
+        - "What are the risks of crypto investing?"
+        """
+
+def process_user_input(user_input, advisor):
+    """Process user input and generate appropriate response"""
+    return "".join(stream_user_input(user_input, advisor))
+
+def stream_user_input(user_input, advisor):
+    """Process user input and yield the response section by section as it is built"""
+    with metrics.timer(metrics.METHOD_SECONDS, method="route"):
+        route = get_router(get_universe()).route(user_input)
+    
+    yield from metrics.time_iterator(stream_routed_input(user_input, advisor, route), metrics.CHAT_SECONDS,
+                                     intent=route.intent)
+
+def stream_routed_input(user_input, advisor, route):
+    """Yield the response sections for an already routed message"""
+    # Side-by-side comparisons
+    if route.intent == "compare":
+        yield from stream_comparison_query(user_input, advisor, route)
+    
+    # Educational queries
+    elif route.intent == "education":
+        yield handle_education_query(user_input, route)
+    
+    # Investment recommendations
+    elif route.intent == "investment":
+        yield from stream_investment_query(user_input, advisor, route)
+    
+    # Specific cryptocurrency queries
+    elif route.intent == "crypto":
+        yield from stream_crypto_specific_query(user_input, advisor, route)
+    
+    # Market analysis
+    elif route.intent == "market":
+        yield from advisor.stream_market_analysis()
+    
+    # Sustainability queries
+    elif route.intent == "sustainability":
+        yield from advisor.stream_sustainability_analysis()
+    
+    # Default response
+    else:
+        yield DEFAULT_RESPONSE
+
+def handle_education_query(user_input, route=None):
+    """Answer educational queries from the education content store"""
+    if route is None:
+        route = get_router(get_universe()).route(user_input)
+    
+    # A coin with an article of its own gets the whole article
+    universe = get_universe()
+    names = universe.column("name")
+    for symbol in route.symbols:
+        topic = names[universe.position(symbol)].lower()
+        if get_content_store().article(topic) is not None:
+            return get_educational_content(topic)
+    
+    # Otherwise the best matching section, unless a risk question is best answered by the risk guide
+    hits = search_education(user_input)
+    if "risk" in route.topics and (not hits or hits[0].section.topic == RISK_TOPIC):
+        return get_risk_explanation()
+    # A question naming an article by its title ("for a beginner") gets the whole article
+    topic = get_content_store().title_topic(user_input)
+    if topic is not None:
+        return get_educational_content(topic)
+    if hits and hits[0].score >= MIN_SEARCH_SCORE:
+        return format_section(hits)
+    return get_educational_content(DEFAULT_TOPIC)
+
+def handle_investment_query(user_input, advisor, route=None):
+    """Handle investment recommendation queries"""
+    return "".join(stream_investment_query(user_input, advisor, route))
+
+def stream_investment_query(user_input, advisor, route=None):
+    """Stream investment recommendation sections"""
+    if route is None:
+        route = get_router(get_universe()).route(user_input)
+    
+    return advisor.stream_investment_recommendations(route.risk_tolerance)
+
+def handle_crypto_specific_query(user_input, advisor, route=None):
+    """Handle queries about specific cryptocurrencies"""
+    return "".join(stream_crypto_specific_query(user_input, advisor, route))
+
+def stream_crypto_specific_query(user_input, advisor, route=None):
+    """Stream analysis sections for every cryptocurrency a query is about"""
+    if route is None:
+        route = get_router(get_universe()).route(user_input)
+    
+    if route.assets:
+        return stream_asset_analyses(route.assets, advisor)
+    
+    return iter(["I couldn't identify which cryptocurrency you're asking about. Please try again with a specific name like 'Bitcoin' or 'Ethereum'."])
+
+def stream_asset_analyses(assets, advisor):
+    """Stream one analysis per mentioned asset, noting spellings that were corrected"""
+    for i, asset in enumerate(assets):
+        if i:
+            yield "\n\n---\n\n"
+        if asset.confidence < 1:
+            yield f"*Showing results for **{asset.name} ({asset.symbol})**, matched from \"{asset.text}\".*\n\n"
+        yield from advisor.stream_crypto_analysis(asset.symbol)
+
+def handle_comparison_query(user_input, advisor, route=None):
+    """Handle queries comparing several cryptocurrencies"""
+    return "".join(stream_comparison_query(user_input, advisor, route))
+
+def stream_comparison_query(user_input, advisor, route=None):
+    """Stream one side-by-side comparison of every cryptocurrency a query mentions"""
+    if route is None:
+        route = get_router(get_universe()).route(user_input)
+    
+    for asset in route.assets:
+        if asset.confidence < 1:
+            yield f"*Showing results for **{asset.name} ({asset.symbol})**, matched from \"{asset.text}\".*\n\n"
+    yield from advisor.stream_comparison(route.symbols, route.risk_tolerance)
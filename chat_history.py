@@ -0,0 +1,95 @@
+import json
+import os
+import struct
+import tempfile
+import uuid
+import weakref
+import zlib
+from collections import deque
+
+# Messages kept in memory per session, and messages shown per "load earlier" page
+DEFAULT_CAPACITY = 40
+PAGE_SIZE = 20
+
+# Length prefix of one spilled record
+_RECORD_HEADER = struct.Struct("<I")
+
+
+def _remove(path):
+    try:
+        os.remove(path)
+    except FileNotFoundError:
+        pass
+
+
+class ChatHistory:
+    """
+    Bounded chat history for one session.
+
+    The newest ``capacity`` messages live in a ring buffer. Older messages are
+    spilled, in order, to an append-only log of length-prefixed zlib-compressed
+    JSON records; an in-memory list of record offsets lets any range of them be
+    read back without scanning the file. Memory per session therefore stays
+    bounded however long the conversation gets, and rendering a window of the
+    latest messages only touches that window.
+    """
+
+    def __init__(self, capacity=DEFAULT_CAPACITY, spill_dir=None):
+        self.capacity = capacity
+        self._recent = deque()
+        self._offsets = []
+        self._spill_dir = spill_dir or os.path.join(tempfile.gettempdir(), "crypto_advisor_chat")
+        self._spill_path = None
+
+    def __len__(self):
+        return len(self._offsets) + len(self._recent)
+
+    @property
+    def spilled(self):
+        """Number of messages on disk."""
+        return len(self._offsets)
+
+    def append(self, role, content):
+        if len(self._recent) >= self.capacity:
+            self._spill(self._recent.popleft())
+        self._recent.append({"role": role, "content": content})
+
+    def window(self, count):
+        """The latest ``count`` messages, oldest first."""
+        return self.messages(max(len(self) - count, 0), len(self))
+
+    def messages(self, start, stop):
+        """Messages ``start`` to ``stop`` (exclusive) in conversation order."""
+        start, stop = max(start, 0), min(stop, len(self))
+        spilled = len(self._offsets)
+        result = self._read_spilled(start, min(stop, spilled)) if start < spilled else []
+        result.extend(self._recent[i - spilled] for i in range(max(start, spilled), stop))
+        return result
+
+    def clear(self):
+        self._recent.clear()
+        self._offsets.clear()
+        if self._spill_path is not None:
+            _remove(self._spill_path)
+
+    def _spill(self, message):
+        if self._spill_path is None:
+            os.makedirs(self._spill_dir, exist_ok=True)
+            self._spill_path = os.path.join(self._spill_dir, f"{uuid.uuid4().hex}.log")
+            # The log belongs to this history alone; remove it with the session
+            weakref.finalize(self, _remove, self._spill_path)
+        record = zlib.compress(json.dumps(message, ensure_ascii=False).encode("utf-8"))
+        with open(self._spill_path, "ab") as log:
+            self._offsets.append(log.tell())
+            log.write(_RECORD_HEADER.pack(len(record)) + record)
+
+    def _read_spilled(self, start, stop):
+        if start >= stop:
+            return []
+        messages = []
+        with open(self._spill_path, "rb") as log:
+            log.seek(self._offsets[start])
+            for _ in range(stop - start):
+                (length,) = _RECORD_HEADER.unpack(log.read(_RECORD_HEADER.size))
+                messages.append(json.loads(zlib.decompress(log.read(length))))
+        return messages
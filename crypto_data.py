@@ -1,11 +1,15 @@
-import pandas as pd
-from datetime import datetime, timedelta
-import random
+import threading
 
-def get_crypto_data():
+from topk import top_k_indices
+from universe import Universe
+
+_universe = None
+_universe_lock = threading.Lock()
+_market_trends = None
+
+def _predefined_crypto_data():
     """
-    Returns predefined cryptocurrency data with profitability and sustainability metrics.
-    This data represents realistic market conditions but should not be used for actual trading.
+    Predefined cryptocurrency records the universe snapshot is built from.
     """
     crypto_data = {
         "BTC": {
@@ -212,10 +216,47 @@ def get_crypto_data():
     
     return crypto_data
 
+def get_universe():
+    """
+    Returns the current asset universe snapshot, building it once on first use.
+    """
+    global _universe
+    if _universe is None:
+        with _universe_lock:
+            if _universe is None:
+                _universe = Universe.from_records(_predefined_crypto_data())
+    return _universe
+
+def publish_universe(universe):
+    """
+    Atomically replaces the current universe snapshot. Readers holding the
+    previous snapshot keep a consistent view of it.
+    """
+    global _universe
+    with _universe_lock:
+        _universe = universe
+
+def get_crypto_data():
+    """
+    Returns predefined cryptocurrency data with profitability and sustainability metrics.
+    This data represents realistic market conditions but should not be used for actual trading.
+    """
+    return get_universe().records()
+
+def publish_market_trends(trends):
+    """
+    Replaces the market trend list returned by get_market_trends().
+    """
+    global _market_trends
+    _market_trends = [dict(trend) for trend in trends]
+
 def get_market_trends():
     """
     Returns current market trend data for different categories.
     """
+    if _market_trends is not None:
+        return _market_trends
+    
     trends = [
         {"category": "Large Cap (>$10B)", "change": 5.2},
         {"category": "Mid Cap ($1B-$10B)", "change": 8.7},
@@ -231,29 +272,25 @@ def get_crypto_by_symbol(symbol):
     """
     Returns specific cryptocurrency data by symbol.
     """
-    data = get_crypto_data()
-    return data.get(symbol.upper())
+    return get_universe().get(symbol.upper())
 
 def get_top_cryptos_by_market_cap(limit=10):
     """
     Returns top cryptocurrencies sorted by market cap.
     """
-    data = get_crypto_data()
-    sorted_cryptos = sorted(data.items(), key=lambda x: x[1]['market_cap'], reverse=True)
-    return dict(sorted_cryptos[:limit])
+    universe = get_universe()
+    return universe.records(top_k_indices(universe.column("market_cap"), limit))
 
 def get_sustainable_cryptos():
     """
     Returns cryptocurrencies with high sustainability scores.
     """
-    data = get_crypto_data()
-    sustainable = {k: v for k, v in data.items() if v['sustainability_score'] >= 7}
-    return sustainable
+    universe = get_universe()
+    return universe.records(universe.index.query(sustainability_score=(7, None)))
 
 def get_low_risk_cryptos():
     """
     Returns cryptocurrencies considered lower risk.
     """
-    data = get_crypto_data()
-    low_risk = {k: v for k, v in data.items() if v['risk_level'] in ['Medium', 'Medium-Low'] and v['market_cap_rank'] <= 15}
-    return low_risk
+    universe = get_universe()
+    return universe.records(universe.index.query(risk_level=["Medium", "Medium-Low"], market_cap_rank=(None, 15)))
@@ -1,249 +1,227 @@
-def get_educational_content(topic):
-    """
-    Provides educational content about cryptocurrency topics.
-    """
-    
-    if topic == "bitcoin":
-        return """
-# 📚 Bitcoin (BTC) Education
-
-## What is Bitcoin?
-Bitcoin is the first and largest cryptocurrency, created in 2009 by the pseudonymous Satoshi Nakamoto. It's often called "digital gold" due to its store-of-value properties.
-
-## Key Features:
-- **Decentralized**: No central authority controls it
-- **Limited Supply**: Only 21 million bitcoins will ever exist
-- **Proof of Work**: Uses mining to secure the network
-- **Store of Value**: Many consider it a hedge against inflation
-
-## How Bitcoin Works:
-1. **Blockchain**: All transactions are recorded on a public ledger
-2. **Mining**: Computers solve complex puzzles to validate transactions
-3. **Wallets**: Software that stores your private keys
-4. **Addresses**: Like bank account numbers for receiving Bitcoin
-
-## Investment Considerations:
-- **High Volatility**: Prices can swing dramatically
-- **Regulatory Risk**: Government actions can impact price
-- **Energy Consumption**: Mining uses significant electricity
-- **Adoption**: Growing institutional and corporate acceptance
-
-## Bitcoin vs Traditional Money:
-- ✅ **Inflation Resistant**: Fixed supply vs unlimited printing
-- ✅ **Borderless**: Send globally without banks
-- ✅ **Transparent**: All transactions are public
-- ❌ **Volatile**: Price fluctuates more than stable currencies
-- ❌ **Energy Intensive**: Environmental concerns
-
-**Remember**: Bitcoin is highly speculative. Only invest what you can afford to lose.
-        """
-    
-    elif topic == "ethereum":
-        return """
-# 📚 Ethereum (ETH) Education
-
-## What is Ethereum?
-Ethereum is a blockchain platform that enables "smart contracts" - self-executing contracts with terms directly written into code. It's the foundation for most decentralized applications (dApps).
-
-## Key Features:
-- **Smart Contracts**: Automated agreements without intermediaries
-- **dApps**: Decentralized applications run on the network
-- **EVM**: Ethereum Virtual Machine executes smart contracts
-- **Proof of Stake**: Energy-efficient consensus mechanism
-
-## Ethereum Ecosystem:
-1. **DeFi**: Decentralized Finance applications
-2. **NFTs**: Non-Fungible Tokens for digital ownership
-3. **DAOs**: Decentralized Autonomous Organizations
-4. **Layer 2**: Scaling solutions like Polygon and Arbitrum
-
-## The Merge (2022):
-Ethereum transitioned from Proof of Work to Proof of Stake, reducing energy consumption by over 99%.
-
-## Investment Considerations:
-- **Utility Token**: ETH is used to pay for transactions and smart contracts
-- **Deflationary**: Transaction fees are burned, reducing supply
-- **Developer Activity**: Largest ecosystem of blockchain developers
-- **Competition**: Faces competition from newer blockchains
-
-## Use Cases:
-- **DeFi Protocols**: Lending, borrowing, trading without banks
-- **NFT Marketplaces**: Digital art and collectibles
-- **Gaming**: Blockchain-based games and virtual worlds
-- **Identity**: Decentralized identity solutions
-
-**Ethereum is more than a currency - it's a platform for the decentralized web.**
-        """
-    
-    elif topic == "general":
-        return """
-# 📚 Cryptocurrency Basics for Beginners
-
-## What is Cryptocurrency?
-Cryptocurrency is digital or virtual money secured by cryptography. Unlike traditional currency, it's decentralized and typically runs on blockchain technology.
-
-## Key Concepts:
-
-### 🔗 Blockchain
-- Digital ledger that records all transactions
-- Distributed across many computers worldwide
-- Immutable: Once recorded, very difficult to change
-
-### 💰 Market Cap
-- Total value of all coins in circulation
-- Calculated as: Price × Circulating Supply
-- Indicates the overall size and stability of a cryptocurrency
-
-### 📊 Volatility
-- How much the price fluctuates
-- Crypto is generally more volatile than traditional assets
-- Higher volatility = higher risk and potential reward
-
-### 🏦 Wallets
-- Software or hardware that stores your cryptocurrency
-- **Hot Wallets**: Connected to internet (convenient but less secure)
-- **Cold Wallets**: Offline storage (more secure for large amounts)
-
-## Types of Cryptocurrencies:
-
-### 1. Bitcoin (BTC)
-- First cryptocurrency, digital gold
-- Store of value, limited supply
-
-### 2. Altcoins
-- All cryptocurrencies other than Bitcoin
-- Examples: Ethereum, Cardano, Solana
-
-### 3. Stablecoins
-- Pegged to stable assets like US Dollar
-- Less volatile, used for trading and payments
-
-### 4. Utility Tokens
-- Provide access to specific blockchain services
-- Examples: ETH for Ethereum, BNB for Binance
-
-## Investment Principles:
-
-### ✅ Do:
-- Research before investing (DYOR - Do Your Own Research)
-- Start with small amounts
-- Diversify across multiple cryptocurrencies
-- Use reputable exchanges
-- Secure your private keys
-
-### ❌ Don't:
-- Invest more than you can afford to lose
-- Fall for "get rich quick" schemes
-- Share your private keys with anyone
-- Make emotional decisions based on FOMO
-- Put all money in one cryptocurrency
-
-## Common Mistakes to Avoid:
-1. **FOMO Buying**: Buying at peak prices due to fear of missing out
-2. **No Research**: Investing without understanding the technology
-3. **Weak Security**: Not properly securing wallets and keys
-4. **Overinvesting**: Putting too much money at risk
-5. **Day Trading**: Trying to time the market without experience
-
-**Remember**: Cryptocurrency is a high-risk, high-reward investment. Never invest more than you can afford to lose completely.
-        """
-    
-    else:
-        return get_educational_content("general")
+import functools
+import math
+import os
+import re
+import threading
+from collections import Counter, namedtuple
 
-def get_risk_explanation():
-    """
-    Provides detailed explanation of cryptocurrency investment risks.
-    """
-    return """
-# ⚠️ Cryptocurrency Investment Risks
+from topk import top_k_items
 
-Understanding risks is crucial before investing in cryptocurrency. Here are the main risks to consider:
+# One markdown file per topic: content/education/<topic>.md
+CONTENT_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), "content", "education")
 
-## 1. 📈 Market Volatility
-**Description**: Crypto prices can swing dramatically in short periods.
-- Bitcoin has experienced 80%+ drops from all-time highs
-- Daily price swings of 10-20% are common
-- News and sentiment can cause rapid price movements
+DEFAULT_TOPIC = "general"
+RISK_TOPIC = "risks"
 
-**Example**: In 2022, many cryptocurrencies lost 70-90% of their value.
+# BM25 parameters; heading words count HEADING_WEIGHT times so a section titled
+# "What is Staking?" outranks one that only mentions staking
+BM25_K1 = 1.2
+BM25_B = 0.75
+HEADING_WEIGHT = 5
 
-## 2. 🏛️ Regulatory Risk
-**Description**: Government actions can significantly impact cryptocurrency prices.
-- Countries may ban or restrict cryptocurrency use
-- New regulations can affect trading and adoption
-- Tax law changes can impact profitability
+# Best-hit BM25 score below which a search is too weak to answer with; such
+# questions get the general beginner's guide instead
+MIN_SEARCH_SCORE = 2.0
 
-**Example**: China's crypto ban in 2021 caused major market drops.
+# Chat filler that says nothing about which section is wanted
+STOPWORDS = frozenset("""
+a about an and any are as at be by can coin coins crypto cryptocurrency define describe do
+does explain for from give help how i in into is it learn me mean means my of on or please
+should show some tell the their them this to understand was what when where which who why
+with work works you your
+""".split())
 
-## 3. 🔧 Technology Risk
-**Description**: Blockchain technology is still evolving and can face technical issues.
-- Smart contract bugs can lead to losses
-- Network congestion can cause high fees
-- Scaling challenges may limit adoption
+Article = namedtuple("Article", ["topic", "title", "text", "sections"])
+Section = namedtuple("Section", ["topic", "article_title", "heading", "text"])
+SearchHit = namedtuple("SearchHit", ["section", "score"])
 
-**Example**: The DAO hack in 2016 led to Ethereum's controversial hard fork.
+_WORD = re.compile(r"[a-z0-9]+")
+_HEADING = re.compile(r"^(#{1,3})\s+(.*?)\s*$")
 
-## 4. 🔐 Security Risk
-**Description**: Digital assets can be lost through hacking or user error.
-- Exchange hacks can result in total loss
-- Lost private keys mean permanently lost funds
-- Phishing attacks and scams are common
 
-**Example**: Mt. Gox exchange collapse in 2014 caused $460M in losses.
+def _stem(word):
+    """Strips one common suffix so "staking", "stake" and "stakes" share a term."""
+    for suffix in ("ing", "es", "ed", "s", "e"):
+        if word.endswith(suffix) and len(word) - len(suffix) >= 3:
+            return word[:-len(suffix)]
+    return word
 
-## 5. 💧 Liquidity Risk
-**Description**: Some cryptocurrencies may be difficult to sell quickly.
-- Smaller cryptocurrencies may have low trading volume
-- Market stress can reduce liquidity
-- Large sales can significantly impact price
 
-## 6. 🌍 Environmental Risk
-**Description**: Energy consumption concerns may affect adoption.
-- Proof of Work cryptocurrencies use significant energy
-- Environmental regulations may impact mining
-- ESG concerns from institutions and governments
+def tokenize(text):
+    """Lowercase search terms of ``text``, stopwords removed."""
+    return [_stem(word) for word in _WORD.findall(text.lower()) if word not in STOPWORDS]
 
-## Risk Management Strategies:
 
-### 💼 Portfolio Diversification
-- Don't put all funds in one cryptocurrency
-- Mix large-cap and smaller cryptocurrencies
-- Consider traditional assets alongside crypto
+def parse_article(topic, text):
+    """
+    Splits a markdown article into sections at its ``##`` and ``###`` headings.
+    Text between the ``#`` title and the first heading becomes a section headed
+    by the title.
+    """
+    title = topic
+    sections = []
+    heading, lines = None, []
+
+    def close():
+        # A heading whose text is all in its subsections is not a section of its own
+        if any(line.strip() for line in lines[1 if heading else 0:]):
+            sections.append(Section(topic, title, heading or title, "\n".join(lines).strip()))
+
+    for line in text.splitlines():
+        match = _HEADING.match(line)
+        if match and len(match.group(1)) == 1 and heading is None and not "".join(lines).strip():
+            title = match.group(2)
+            continue
+        if match and len(match.group(1)) > 1:
+            close()
+            heading, lines = match.group(2).rstrip(":"), []
+        lines.append(line)
+    close()
+    return Article(topic, title, text, tuple(sections))
+
+
+class SearchIndex:
+    """
+    Inverted index over article sections with BM25 ranking. Each posting stores
+    the term's precomputed BM25 weight in its section, so a query only sums the
+    weights along the posting lists of its terms.
+    """
 
-### 🎯 Position Sizing
-- **Conservative**: 1-5% of total investment portfolio
-- **Moderate**: 5-10% of total investment portfolio
-- **Aggressive**: 10-20% of total investment portfolio
+    def __init__(self, sections):
+        self.sections = tuple(sections)
+        term_counts = []
+        for section in self.sections:
+            counts = Counter(tokenize(section.text))
+            for term in tokenize(section.heading):
+                counts[term] += HEADING_WEIGHT - 1  # the heading line is already in the text once
+            term_counts.append(counts)
+
+        lengths = [sum(counts.values()) for counts in term_counts]
+        average_length = sum(lengths) / len(lengths) if lengths else 1.0
+        document_frequency = Counter(term for counts in term_counts for term in counts)
+        n = len(self.sections)
+
+        # Terms found only in the title of one article ("beginner") name that article
+        title_topics = {}
+        for section in self.sections:
+            for term in tokenize(section.article_title):
+                if term not in document_frequency:
+                    title_topics.setdefault(term, set()).add(section.topic)
+        self._title_topics = {term: topics.pop() for term, topics in title_topics.items() if len(topics) == 1}
+
+        self._postings = {}
+        for section_id, counts in enumerate(term_counts):
+            norm = BM25_K1 * (1 - BM25_B + BM25_B * lengths[section_id] / average_length)
+            for term, tf in counts.items():
+                df = document_frequency[term]
+                idf = math.log(1 + (n - df + 0.5) / (df + 0.5))
+                self._postings.setdefault(term, []).append((section_id, idf * tf * (BM25_K1 + 1) / (tf + norm)))
+
+    def __len__(self):
+        return len(self.sections)
+
+    def title_topic(self, query):
+        """Topic of the article a query names by a word found only in its title, or None."""
+        for term in tokenize(query):
+            if term in self._title_topics:
+                return self._title_topics[term]
+        return None
+
+    def search(self, query, limit=3):
+        """The ``limit`` best ``SearchHit`` for ``query``, best first; empty if no term matches."""
+        scores = {}
+        for term in set(tokenize(query)):
+            for section_id, weight in self._postings.get(term, ()):
+                scores[section_id] = scores.get(section_id, 0.0) + weight
+        # Equal scores rank in content order
+        best = top_k_items(scores.items(), limit, key=lambda item: (item[1], -item[0]))
+        return [SearchHit(self.sections[section_id], score) for section_id, score in best]
+
+
+class ContentStore:
+    """
+    Education articles stored as markdown files in ``directory``. An article is
+    read and split into sections the first time it is asked for; the search
+    index over every section is built on the first search.
+    """
 
-### 📅 Time Management
-- **Dollar-Cost Averaging**: Invest fixed amounts regularly
-- **HODL Strategy**: Hold long-term through volatility
-- **Take Profits**: Gradually sell portions during gains
+    def __init__(self, directory=CONTENT_DIR):
+        self.directory = directory
+        self._topics = None
+        self._articles = {}
+        self._index = None
+        self._lock = threading.Lock()
+
+    def topics(self):
+        """Sorted topic names, one per article file."""
+        if self._topics is None:
+            self._topics = tuple(sorted(name[:-3] for name in os.listdir(self.directory) if name.endswith(".md")))
+        return self._topics
+
+    def article(self, topic):
+        """The parsed ``Article`` for ``topic``, or None if there is no such article."""
+        article = self._articles.get(topic)
+        if article is None:
+            if topic not in self.topics():
+                return None
+            with open(os.path.join(self.directory, f"{topic}.md"), encoding="utf-8") as file:
+                article = parse_article(topic, file.read())
+            self._articles[topic] = article
+        return article
+
+    @property
+    def index(self):
+        with self._lock:
+            if self._index is None:
+                self._index = SearchIndex(section for topic in self.topics() for section in self.article(topic).sections)
+            return self._index
+
+    def search(self, query, limit=3):
+        return self.index.search(query, limit)
+
+    def title_topic(self, query):
+        return self.index.title_topic(query)
+
+
+@functools.lru_cache(maxsize=1)
+def get_content_store():
+    """
+    Returns the shared content store of the bundled education articles.
+    """
+    return ContentStore()
+
+
+def get_educational_content(topic):
+    """
+    Provides educational content about cryptocurrency topics.
+    """
+    store = get_content_store()
+    article = store.article(topic) or store.article(DEFAULT_TOPIC)
+    return article.text
 
-### 🔒 Security Best Practices
-- Use reputable exchanges with insurance
-- Enable two-factor authentication
-- Store large amounts in hardware wallets
-- Never share private keys
 
-## Risk Assessment Questions:
-Before investing, ask yourself:
+def get_risk_explanation():
+    """
+    Provides detailed explanation of cryptocurrency investment risks.
+    """
+    return get_educational_content(RISK_TOPIC)
 
-1. **Can I afford to lose this money completely?**
-2. **Do I understand the technology and use case?**
-3. **Am I prepared for 50%+ price drops?**
-4. **Do I have an emergency fund first?**
-5. **Am I investing or gambling?**
 
-## Warning Signs to Avoid:
-- 🚨 Promises of guaranteed returns
-- 🚨 Pressure to invest immediately
-- 🚨 Requests for private keys or passwords
-- 🚨 Unknown or unaudited projects
-- 🚨 Celebrity endorsements without substance
+def search_education(query, limit=3):
+    """
+    Ranked education sections matching ``query``, best first.
+    """
+    return get_content_store().search(query, limit)
 
-**Remember**: Higher potential returns come with higher risks. Never invest more than you can afford to lose, and always do your own research before making investment decisions.
 
-**This is not financial advice. Consult with a qualified financial advisor before making investment decisions.**
+def format_section(hits):
+    """
+    Renders the best hit as its article title and section, followed by the
+    other hits as related reading.
     """
+    section = hits[0].section
+    response = f"# {section.article_title}\n\n{section.text}"
+    related = [f"{hit.section.heading} ({hit.section.article_title})" for hit in hits[1:]]
+    if related:
+        response += "\n\n**Related topics**: " + " · ".join(related)
+    return response
@@ -0,0 +1,138 @@
+import functools
+from collections import namedtuple
+
+
+# Intent keywords in priority order; the first intent with a hit wins. Keywords
+# match at the start of a word, so "invest" also covers "investing".
+INTENT_KEYWORDS = {
+    "compare": ["compar", "vs", "versus", "differen"],  # only with two or more assets
+    "education": ["what is", "explain", "help", "learn", "beginner"],
+    "investment": ["recommend", "invest", "buy", "portfolio", "suggestion"],
+    "crypto": [],  # asset names and symbols, see resolver.SymbolResolver
+    "market": ["market", "trend", "analysis", "performance"],
+    "sustainability": ["green", "sustainable", "energy", "environment", "eco"],
+}
+
+RISK_TOLERANCE_KEYWORDS = {
+    "low": ["conservative", "safe", "low risk", "careful"],
+    "high": ["aggressive", "high risk", "risky"],
+}
+
+TOPIC_KEYWORDS = {
+    "risk": ["risk"],
+}
+
+# ``assets`` holds the AssetMatch of every mentioned asset, ``symbols`` their symbols
+Route = namedtuple("Route", ["intent", "symbols", "risk_tolerance", "topics", "assets"])
+
+
+class KeywordAutomaton:
+    """
+    Aho-Corasick automaton over lowercase keywords. A single scan of the text
+    reports every keyword occurrence that starts at a word boundary, and for
+    whole-word keywords also ends at one.
+    """
+
+    def __init__(self, patterns):
+        self._goto = [{}]
+        self._fail = [0]
+        self._outputs = [[]]
+
+        for keyword, label, whole_word in patterns:
+            state = 0
+            for char in keyword:
+                next_state = self._goto[state].get(char)
+                if next_state is None:
+                    next_state = len(self._goto)
+                    self._goto[state][char] = next_state
+                    self._goto.append({})
+                    self._fail.append(0)
+                    self._outputs.append([])
+                state = next_state
+            self._outputs[state].append((len(keyword), label, whole_word))
+
+        # Breadth-first pass to link each state to its longest proper suffix state
+        queue = list(self._goto[0].values())
+        for state in queue:
+            for char, next_state in self._goto[state].items():
+                queue.append(next_state)
+                fallback = self._fail[state]
+                while fallback and char not in self._goto[fallback]:
+                    fallback = self._fail[fallback]
+                self._fail[next_state] = self._goto[fallback].get(char, 0)
+                self._outputs[next_state] = self._outputs[next_state] + self._outputs[self._fail[next_state]]
+
+    def scan(self, text):
+        """Yield ``(start, end, label)`` for every boundary-respecting match in ``text``."""
+        goto, fail, outputs = self._goto, self._fail, self._outputs
+        state = 0
+        for position, char in enumerate(text):
+            while state and char not in goto[state]:
+                state = fail[state]
+            state = goto[state].get(char, 0)
+            for length, label, whole_word in outputs[state]:
+                start, end = position + 1 - length, position + 1
+                if start > 0 and text[start - 1].isalnum():
+                    continue
+                if whole_word and end < len(text) and text[end].isalnum():
+                    continue
+                yield start, end, label
+
+
+class IntentRouter:
+    """
+    Classifies chat messages in one pass over the text with a single automaton
+    compiled from the intent keywords, and finds the assets they mention with
+    the symbol resolver of a universe snapshot.
+    """
+
+    def __init__(self, universe):
+        # Imported on first use so importing the chat core stays light
+        from resolver import get_resolver
+        self._resolver = get_resolver(universe)
+        patterns = []
+        for intent, keywords in INTENT_KEYWORDS.items():
+            patterns += [(keyword, ("intent", intent), False) for keyword in keywords]
+        for risk_tolerance, keywords in RISK_TOLERANCE_KEYWORDS.items():
+            patterns += [(keyword, ("risk_tolerance", risk_tolerance), False) for keyword in keywords]
+        for topic, keywords in TOPIC_KEYWORDS.items():
+            patterns += [(keyword, ("topic", topic), False) for keyword in keywords]
+
+        self._automaton = KeywordAutomaton(patterns)
+
+    def route(self, text):
+        """Classify a message into a ``Route``."""
+        intents, risk_tolerances, topics = set(), set(), set()
+        for _, _, (kind, value) in self._automaton.scan(text.lower()):
+            if kind == "intent":
+                intents.add(value)
+            elif kind == "risk_tolerance":
+                risk_tolerances.add(value)
+            else:
+                topics.add(value)
+
+        # A corrected spelling alone is too weak to outrank a keyword intent
+        assets = tuple(self._resolver.resolve(text))
+        if any(asset.confidence == 1.0 for asset in assets) or (assets and not intents):
+            intents.add("crypto")
+        if len(assets) < 2:
+            intents.discard("compare")
+        intent = next((name for name in INTENT_KEYWORDS if name in intents), "default")
+
+        if "low" in risk_tolerances:
+            risk_tolerance = "low"
+        elif "high" in risk_tolerances:
+            risk_tolerance = "high"
+        else:
+            risk_tolerance = "medium"
+
+        symbols = tuple(asset.symbol for asset in assets)
+        return Route(intent, symbols, risk_tolerance, frozenset(topics), assets)
+
+
+@functools.lru_cache(maxsize=2)
+def get_router(universe):
+    """
+    Returns the intent router compiled for a universe snapshot.
+    """
+    return IntentRouter(universe)
@@ -0,0 +1,196 @@
+import asyncio
+import json
+import logging
+import threading
+import time
+from collections import namedtuple
+
+import numpy as np
+
+from crypto_data import get_universe, publish_market_trends, publish_universe
+from price_history import apply_price_history
+from volatility import DEFAULT_VOLATILITY_THRESHOLDS, apply_volatility_labels
+
+# Numeric universe fields a market data tick may update
+TICK_FIELDS = ("price_usd", "price_change_24h", "price_change_7d", "price_change_30d", "volume_24h", "market_cap")
+
+logger = logging.getLogger(__name__)
+
+Tick = namedtuple("Tick", ["symbol", "timestamp", "values"])
+
+
+class MarketDataProvider:
+    """
+    Source of market data for the advisor. Subclasses implement ``batches()``,
+    an async iterator of tick lists, and may override ``market_trends()``.
+    """
+
+    def batches(self):
+        """Async iterator yielding lists of ``Tick``."""
+        raise NotImplementedError
+
+    def market_trends(self):
+        """Latest market trend list, or None if the provider has none."""
+        return None
+
+
+class ReplayProvider(MarketDataProvider):
+    """
+    Offline provider replaying a recorded NDJSON feed. Each line is either a tick
+    ``{"ts": ..., "symbol": ..., "price_usd": ..., ...}`` or a trend update
+    ``{"ts": ..., "trends": [{"category": ..., "change": ...}, ...]}``.
+    Lines sharing a timestamp form one batch; ``speed`` scales the recorded gaps
+    between batches and 0 replays as fast as possible.
+    """
+
+    def __init__(self, path, speed=0.0, batch_size=1000):
+        self.path = path
+        self.speed = speed
+        self.batch_size = batch_size
+        self._trends = None
+
+    async def batches(self):
+        batch, batch_ts, previous_ts = [], None, None
+        with open(self.path, encoding="utf-8") as feed:
+            for line in feed:
+                if not line.strip():
+                    continue
+                event = json.loads(line)
+                ts = event["ts"]
+                if batch and (ts != batch_ts or len(batch) >= self.batch_size):
+                    yield batch
+                    batch = []
+                if ts != batch_ts:
+                    if self.speed and previous_ts is not None:
+                        await asyncio.sleep((ts - previous_ts) / self.speed)
+                    previous_ts, batch_ts = ts, ts
+                if "trends" in event:
+                    self._trends = event["trends"]
+                    continue
+                values = {field: event[field] for field in TICK_FIELDS if field in event}
+                batch.append(Tick(event["symbol"].upper(), ts, values))
+        if batch:
+            yield batch
+
+    def market_trends(self):
+        return self._trends
+
+
+def apply_ticks(universe, ticks):
+    """
+    Returns a new universe snapshot with a batch of ticks applied. Later ticks for
+    the same symbol and field win; ticks for unlisted symbols are skipped.
+    """
+    updates = {}
+    for tick in ticks:
+        position = universe.position(tick.symbol)
+        if position is None:
+            continue
+        for field, value in tick.values.items():
+            updates.setdefault(field, {})[position] = value
+    if not updates:
+        return universe
+    return universe.with_values({
+        field: (np.fromiter(values.keys(), dtype=np.intp, count=len(values)),
+                np.fromiter(values.values(), dtype=np.float64, count=len(values)))
+        for field, values in updates.items()
+    })
+
+
+def ticks_to_bars(ticks):
+    """
+    Aggregates the priced ticks of one batch into ``{symbol: (open, high, low, close, volume)}``.
+    Ticks carry no traded volume, so bar volume is zero.
+    """
+    bars = {}
+    for tick in ticks:
+        price = tick.values.get("price_usd")
+        if price is None:
+            continue
+        bar = bars.get(tick.symbol)
+        if bar is None:
+            bars[tick.symbol] = (price, price, price, price, 0.0)
+        else:
+            bars[tick.symbol] = (bar[0], max(bar[1], price), min(bar[2], price), price, 0.0)
+    return bars
+
+
+class MarketDataFeed:
+    """
+    Runs a provider on a background asyncio loop. Each tick batch is applied
+    copy-on-write to the current universe and published as a new snapshot in
+    one swap, so chat requests never wait on ingestion and never observe a
+    partially applied batch. With a price history store, batches are also
+    recorded as bars and the change fields are derived from that history; with
+    rolling statistics, the volatility labels are derived from realized
+    volatility using ``volatility_thresholds``.
+    """
+
+    def __init__(self, provider, history=None, volatility=None,
+                 volatility_thresholds=DEFAULT_VOLATILITY_THRESHOLDS):
+        self.provider = provider
+        self.history = history
+        self.volatility = volatility
+        self.volatility_thresholds = volatility_thresholds
+        self.stats = {"batches": 0, "ticks": 0, "snapshots": 0, "errors": 0, "last_published": None}
+        self._thread = None
+        self._loop = None
+        self._task = None
+
+    def start(self):
+        if self._thread is None:
+            self._thread = threading.Thread(target=self._run_loop, name="market-data-feed", daemon=True)
+            self._thread.start()
+        return self
+
+    def stop(self, timeout=5.0):
+        if self._loop is not None and self._task is not None:
+            self._loop.call_soon_threadsafe(self._task.cancel)
+        if self._thread is not None:
+            self._thread.join(timeout)
+
+    def join(self, timeout=None):
+        """Wait for the provider to run out of data (replays finish, live feeds do not)."""
+        if self._thread is not None:
+            self._thread.join(timeout)
+
+    def _run_loop(self):
+        self._loop = asyncio.new_event_loop()
+        try:
+            self._task = self._loop.create_task(self.ingest())
+            self._loop.run_until_complete(self._task)
+        except asyncio.CancelledError:
+            pass
+        finally:
+            self._loop.close()
+
+    async def ingest(self):
+        """Consume every batch from the provider and publish snapshots."""
+        async for batch in self.provider.batches():
+            self.stats["batches"] += 1
+            self.stats["ticks"] += len(batch)
+            try:
+                self._ingest_batch(batch)
+            except Exception:  # one bad batch must not end the feed
+                self.stats["errors"] += 1
+                logger.exception("Skipped a market data batch of %d ticks", len(batch))
+
+    def _ingest_batch(self, batch):
+        """Apply one batch and publish the resulting snapshot."""
+        universe = get_universe()
+        updated = apply_ticks(universe, batch)
+        batch_ts = max((tick.timestamp for tick in batch), default=None)
+        if self.history is not None and batch:
+            self.history.append(batch_ts, ticks_to_bars(batch))
+            updated = apply_price_history(updated, self.history, as_of=batch_ts)
+        if self.volatility is not None and batch:
+            prices = {tick.symbol: tick.values["price_usd"] for tick in batch if "price_usd" in tick.values}
+            self.volatility.update(self.volatility.prices_for(prices), timestamp=batch_ts)
+            updated = apply_volatility_labels(updated, self.volatility, self.volatility_thresholds)
+        if updated is not universe:
+            publish_universe(updated)
+            self.stats["snapshots"] += 1
+            self.stats["last_published"] = time.time()
+        trends = self.provider.market_trends()
+        if trends is not None:
+            publish_market_trends(trends)
@@ -0,0 +1,227 @@
+import contextlib
+import functools
+import os
+import threading
+import time
+import types
+from bisect import bisect_left
+from collections import namedtuple
+
+# Upper bounds in seconds of the latency histogram buckets; the last bucket is +Inf
+DEFAULT_BUCKETS = (0.0001, 0.00025, 0.0005, 0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+
+CHAT_SECONDS = "crypto_advisor_chat_seconds"
+METHOD_SECONDS = "crypto_advisor_method_seconds"
+
+HELP = {
+    CHAT_SECONDS: "Time spent producing chat answers, by intent.",
+    METHOD_SECONDS: "Time spent in advisor methods, cache hits included.",
+}
+
+# One exported metric: ``samples`` is a list of ``(labels, value)`` with labels a
+# tuple of ``(name, value)`` pairs. Collectors return lists of these.
+Metric = namedtuple("Metric", ["name", "type", "help", "samples"])
+
+_NULL_TIMER = contextlib.nullcontext()
+
+
+class Histogram:
+    """Cumulative latency histogram with fixed bucket bounds, Prometheus style."""
+
+    def __init__(self, buckets=DEFAULT_BUCKETS):
+        self.buckets = tuple(buckets)
+        self.counts = [0] * (len(self.buckets) + 1)
+        self.sum = 0.0
+        self.count = 0
+
+    def observe(self, value):
+        self.counts[bisect_left(self.buckets, value)] += 1
+        self.sum += value
+        self.count += 1
+
+    def quantile(self, q):
+        """Estimate of the ``q`` quantile, interpolated linearly inside its bucket."""
+        if not self.count:
+            return 0.0
+        rank = q * self.count
+        seen = 0
+        for i, count in enumerate(self.counts):
+            if count and seen + count >= rank:
+                lower = self.buckets[i - 1] if i else 0.0
+                upper = self.buckets[i] if i < len(self.buckets) else self.buckets[-1]
+                return lower + (upper - lower) * (rank - seen) / count
+            seen += count
+        return self.buckets[-1]
+
+
+class MetricsRegistry:
+    """
+    Latency histograms keyed by metric name and labels, plus collectors that
+    report gauges and counters (cache hit rates, snapshot age) when scraped.
+
+    While disabled, ``timed`` functions call straight through and ``timer`` is a
+    shared no-op context manager, so instrumentation costs one attribute check.
+    """
+
+    def __init__(self, enabled=False):
+        self.enabled = enabled
+        self._histograms = {}
+        self._collectors = []
+        self._lock = threading.Lock()
+
+    def observe(self, name, seconds, labels=()):
+        with self._lock:
+            series = self._histograms.setdefault(name, {})
+            histogram = series.get(labels)
+            if histogram is None:
+                histogram = series[labels] = Histogram()
+            histogram.observe(seconds)
+
+    def timer(self, name, **labels):
+        """Context manager recording the time spent inside it."""
+        if not self.enabled:
+            return _NULL_TIMER
+        return self._timer(name, tuple(sorted(labels.items())))
+
+    @contextlib.contextmanager
+    def _timer(self, name, labels):
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.observe(name, time.perf_counter() - start, labels)
+
+    def timed(self, name=METHOD_SECONDS, **labels):
+        """
+        Decorator recording each call's duration, labelled ``method=<function name>``
+        unless labels are given. A returned generator is timed while it is
+        consumed, counting only the time spent producing its items.
+        """
+        def decorator(function):
+            label_items = tuple(sorted((labels or {"method": function.__name__}).items()))
+
+            @functools.wraps(function)
+            def wrapper(*args, **kwargs):
+                if not self.enabled:
+                    return function(*args, **kwargs)
+                start = time.perf_counter()
+                result = function(*args, **kwargs)
+                elapsed = time.perf_counter() - start
+                if isinstance(result, types.GeneratorType):
+                    return self._timed_iterator(result, name, label_items, elapsed)
+                self.observe(name, elapsed, label_items)
+                return result
+            return wrapper
+        return decorator
+
+    def time_iterator(self, iterator, name, **labels):
+        """Wraps an iterator so the time spent producing its items is recorded once it ends."""
+        if not self.enabled:
+            return iterator
+        return self._timed_iterator(iter(iterator), name, tuple(sorted(labels.items())))
+
+    def _timed_iterator(self, iterator, name, labels, elapsed=0.0):
+        try:
+            while True:
+                start = time.perf_counter()
+                try:
+                    item = next(iterator)
+                except StopIteration:
+                    elapsed += time.perf_counter() - start
+                    return
+                elapsed += time.perf_counter() - start
+                yield item
+        finally:
+            self.observe(name, elapsed, labels)
+
+    def register_collector(self, collector):
+        """Adds a callable returning a list of ``Metric``; it is called on every scrape."""
+        with self._lock:
+            if collector not in self._collectors:
+                self._collectors.append(collector)
+
+    def collect(self):
+        """Every metric: the histograms, then whatever the collectors report."""
+        with self._lock:
+            histograms = {name: dict(series) for name, series in self._histograms.items()}
+            collectors = list(self._collectors)
+        metrics = [Metric(name, "histogram", HELP.get(name, name), sorted(series.items()))
+                   for name, series in sorted(histograms.items())]
+        for collector in collectors:
+            metrics.extend(collector())
+        return metrics
+
+    def summary(self):
+        """Rows of count, mean and p50/p95 milliseconds per histogram series, for display."""
+        rows = []
+        for metric in self.collect():
+            if metric.type != "histogram":
+                continue
+            for labels, histogram in metric.samples:
+                rows.append({
+                    "metric": metric.name,
+                    "labels": ", ".join(f"{key}={value}" for key, value in labels),
+                    "count": histogram.count,
+                    "mean_ms": histogram.sum / histogram.count * 1000 if histogram.count else 0.0,
+                    "p50_ms": histogram.quantile(0.5) * 1000,
+                    "p95_ms": histogram.quantile(0.95) * 1000,
+                })
+        return rows
+
+    def reset(self):
+        with self._lock:
+            self._histograms.clear()
+
+
+def _format_labels(labels, extra=()):
+    pairs = list(labels) + list(extra)
+    if not pairs:
+        return ""
+    escaped = (str(value).replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n") for _, value in pairs)
+    return "{" + ",".join(f'{key}="{value}"' for (key, _), value in zip(pairs, escaped)) + "}"
+
+
+def render_prometheus(registry=None):
+    """The registry's metrics in the Prometheus text exposition format."""
+    registry = registry or REGISTRY
+    lines = []
+    for metric in registry.collect():
+        lines.append(f"# HELP {metric.name} {metric.help}")
+        lines.append(f"# TYPE {metric.name} {metric.type}")
+        for labels, value in metric.samples:
+            if metric.type != "histogram":
+                lines.append(f"{metric.name}{_format_labels(labels)} {value:g}")
+                continue
+            cumulative = 0
+            for bound, count in zip(value.buckets + ("+Inf",), value.counts):
+                cumulative += count
+                lines.append(f"{metric.name}_bucket{_format_labels(labels, [('le', bound)])} {cumulative}")
+            lines.append(f"{metric.name}_sum{_format_labels(labels)} {value.sum:.9g}")
+            lines.append(f"{metric.name}_count{_format_labels(labels)} {value.count}")
+    return "\n".join(lines) + "\n"
+
+
+def cache_metrics(caches):
+    """``Metric`` list of hit/miss/eviction counters and hit ratio for ``{name: RenderCache}``."""
+    stats = {name: cache.stats() for name, cache in caches.items()}
+    return [
+        Metric("crypto_advisor_cache_hits_total", "counter", "Cache lookups that hit.",
+               [((("cache", name),), s["hits"]) for name, s in stats.items()]),
+        Metric("crypto_advisor_cache_misses_total", "counter", "Cache lookups that missed.",
+               [((("cache", name),), s["misses"]) for name, s in stats.items()]),
+        Metric("crypto_advisor_cache_evictions_total", "counter", "Entries evicted to stay within limits.",
+               [((("cache", name),), s["evictions"]) for name, s in stats.items()]),
+        Metric("crypto_advisor_cache_hit_ratio", "gauge", "Hits over lookups since start.",
+               [((("cache", name),), s["hit_rate"]) for name, s in stats.items()]),
+        Metric("crypto_advisor_cache_entries", "gauge", "Entries currently cached.",
+               [((("cache", name),), s["entries"]) for name, s in stats.items()]),
+    ]
+
+
+# Process-wide registry, enabled by CRYPTO_ADVISOR_METRICS=1
+REGISTRY = MetricsRegistry(enabled=os.environ.get("CRYPTO_ADVISOR_METRICS", "") not in ("", "0"))
+
+timed = REGISTRY.timed
+timer = REGISTRY.timer
+time_iterator = REGISTRY.time_iterator
+register_collector = REGISTRY.register_collector
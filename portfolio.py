@@ -0,0 +1,226 @@
+import threading
+
+import numpy as np
+
+# Annualized volatility assumed for each volatility label when no price history is available
+LABEL_VOLATILITY = {"Low": 0.20, "Medium": 0.45, "High": 0.80, "Very High": 1.20}
+
+# Correlation of every asset pair in the single-factor covariance model
+DEFAULT_CORRELATION = 0.6
+
+# Periods per year of the 30-day change used as the expected-return signal
+MONTHS_PER_YEAR = 12
+
+# Log risk-aversion range searched when there is no previous solution to start from
+COLD_BRACKET = (-8.0, 12.0)
+
+# Relative shortfall below the target volatility accepted as a match
+VOLATILITY_TOLERANCE = 0.01
+
+
+def expected_returns(universe, positions):
+    """
+    Annualized expected returns from the 30-day price change, used as a momentum
+    signal for the optimizer.
+    """
+    return universe.column("price_change_30d")[positions] / 100.0 * MONTHS_PER_YEAR
+
+
+def structural_covariance(universe, positions, correlation=DEFAULT_CORRELATION):
+    """
+    Single-factor covariance: per-asset volatility from its volatility label and a
+    constant pairwise correlation.
+    """
+    labels = universe.column("volatility")
+    volatility = np.array([LABEL_VOLATILITY.get(labels[p], LABEL_VOLATILITY["Very High"]) for p in positions])
+    corr = np.full((len(positions), len(positions)), correlation)
+    np.fill_diagonal(corr, 1.0)
+    return corr * np.outer(volatility, volatility)
+
+
+def covariance_from_history(store, symbols, lookback_frames, periods_per_year, end=None, step=1):
+    """
+    Annualized covariance of log returns over the ``lookback_frames`` frames of a
+    PriceHistoryStore before frame ``end`` (default: all stored frames), sampled
+    every ``step`` frames. ``periods_per_year`` counts sampled periods. Returns None
+    if any asset lacks that much history.
+    """
+    end = store.frame_count if end is None else min(end, store.frame_count)
+    if end <= lookback_frames:
+        return None
+    closes = store.closes(np.arange(end - 1, end - lookback_frames - 2, -step)[::-1], symbols)
+    if len(closes) < 3 or not np.isfinite(closes).all():
+        return None
+    returns = np.diff(np.log(closes), axis=0)
+    return np.atleast_2d(np.cov(returns, rowvar=False)) * periods_per_year
+
+
+def project_capped_simplex(v, cap):
+    """
+    Euclidean projection onto {w : 0 <= w <= cap, sum(w) = 1}, i.e. clip(v - tau, 0, cap)
+    for the shift tau where the weights sum to one. The sum is piecewise linear in tau
+    with breakpoints at v and v - cap, so it is evaluated at every breakpoint from
+    prefix sums and tau is interpolated exactly inside the crossing segment.
+    """
+    n = len(v)
+    ordered = np.sort(v)
+    prefix = np.concatenate([[0.0], np.cumsum(ordered)])
+    breakpoints = np.sort(np.concatenate([ordered - cap, ordered]))
+    below = np.searchsorted(ordered, breakpoints, "right")
+    capped_from = np.searchsorted(ordered, breakpoints + cap, "left")
+    totals = (n - capped_from) * cap + prefix[capped_from] - prefix[below] - breakpoints * (capped_from - below)
+
+    # totals fall from n * cap to 0; find the last breakpoint still summing to >= 1
+    j = int(np.clip(np.searchsorted(-totals, -1.0, "right") - 1, 0, len(breakpoints) - 2))
+    drop = totals[j] - totals[j + 1]
+    tau = breakpoints[j] + ((totals[j] - 1.0) / drop * (breakpoints[j + 1] - breakpoints[j]) if drop > 0 else 0.0)
+    return np.clip(v - tau, 0.0, cap)
+
+
+def _solve(mu, cov, risk_aversion, cap, w0, step, max_iter=500, tol=1e-7):
+    """
+    Maximize mu'w - risk_aversion/2 w'Σw over the capped simplex (accelerated projected
+    gradient, restarting the momentum whenever it stops pointing downhill).
+    """
+    w = w0
+    y, t = w0, 1.0
+    for _ in range(max_iter):
+        gradient = mu - risk_aversion * (cov @ y)
+        w_next = project_capped_simplex(y + step / risk_aversion * gradient, cap)
+        move = w_next - w
+        if np.abs(move).max() < tol:
+            return w_next
+        if (y - w_next) @ move > 0:
+            y, t = w_next, 1.0
+        else:
+            t_next = (1 + np.sqrt(1 + 4 * t * t)) / 2
+            y = w_next + (t - 1) / t_next * move
+            t = t_next
+        w = w_next
+    return w
+
+
+def _max_return_weights(mu, cap):
+    """Highest-return point of the capped simplex: fill the best assets up to the cap in order."""
+    weights = np.zeros(len(mu))
+    remaining = 1.0
+    for i in np.argsort(-mu, kind="stable"):
+        weights[i] = min(cap, remaining)
+        remaining -= weights[i]
+        if remaining <= 0:
+            break
+    return weights
+
+
+class PortfolioOptimizer:
+    """
+    Long-only mean-variance optimizer under risk-profile constraints: a maximum
+    weight per asset, a minimum sustainability score and a target annualized
+    volatility. Risk aversion is searched until the portfolio volatility is just
+    under the target; when even the least volatile portfolio misses it, that
+    portfolio is returned. Callers re-solving a sequence of related problems can
+    pass a ``key``: the last solution under it (weights by symbol and risk
+    aversion) is then the starting point next time. A warm-started answer can
+    differ slightly from a cold one, so callers that need repeatable output
+    should not pass one.
+    """
+
+    def __init__(self, max_probes=30):
+        self.max_probes = max_probes
+        self._previous = {}
+        self._lock = threading.Lock()
+
+    def optimize(self, mu, cov, max_weight=1.0, target_volatility=None, eligible=None, symbols=None, key=None):
+        """
+        Returns optimal weights aligned to ``mu``. ``eligible`` masks assets that
+        may hold weight; ``symbols`` and ``key`` identify the problem for warm starts.
+        """
+        n = len(mu)
+        weights = np.zeros(n)
+        eligible = np.ones(n, dtype=bool) if eligible is None else np.asarray(eligible, dtype=bool)
+        active = np.flatnonzero(eligible)
+        if not len(active):
+            return weights
+
+        mu, cov = np.asarray(mu, dtype=np.float64)[active], np.asarray(cov, dtype=np.float64)[np.ix_(active, active)]
+        cap = max(max_weight, 1.0 / len(active))
+        step = 1.0 / max(np.linalg.eigvalsh(cov)[-1], 1e-12)
+        w0, log_lambda, warm = self._warm_start(key, symbols, active, cap)
+
+        def solve(log_lambda, start):
+            return _solve(mu, cov, np.exp(log_lambda), cap, start, step)
+
+        if target_volatility is None:
+            w = solve(log_lambda, w0)
+        else:
+            w = _max_return_weights(mu, cap)
+            corner_volatility = np.sqrt(w @ cov @ w)
+            if corner_volatility <= target_volatility:
+                # Even the highest-return corner is within the target
+                log_lambda = COLD_BRACKET[0]
+            else:
+                w, log_lambda = self._match_volatility(solve, cov, target_volatility, w0, log_lambda, warm,
+                                                       corner_volatility)
+
+        weights[active] = w
+        if key is not None and symbols is not None:
+            with self._lock:
+                self._previous[key] = ({symbols[i]: weights[i] for i in active}, log_lambda)
+        return weights
+
+    def _match_volatility(self, solve, cov, target_volatility, start, log_lambda, warm, corner_volatility):
+        """
+        Volatility falls as risk aversion rises, so search log risk aversion within
+        COLD_BRACKET until the volatility is just under the target. Probes
+        interpolate between the bracket ends (kept away from them so the bracket
+        always shrinks); a warm start probes the previous risk aversion first.
+        """
+        low, high = COLD_BRACKET
+        w = solve(high, start)
+        high_volatility = np.sqrt(w @ cov @ w)
+        if high_volatility > target_volatility:
+            # Even the least volatile portfolio misses the target
+            return w, high
+        best = (w, high)
+        low_volatility = corner_volatility
+
+        probe = min(max(log_lambda, low), high) if warm else None
+        w = start
+        for _ in range(self.max_probes):
+            if probe is None:
+                fraction = (low_volatility - target_volatility) / (low_volatility - high_volatility)
+                probe = low + min(max(fraction, 0.1), 0.9) * (high - low)
+            w = solve(probe, w)
+            volatility = np.sqrt(w @ cov @ w)
+            if volatility > target_volatility:
+                low, low_volatility = probe, volatility
+            else:
+                high, high_volatility = probe, volatility
+                best = (w, probe)
+                if volatility >= target_volatility * (1 - VOLATILITY_TOLERANCE):
+                    break
+            if high - low < 1e-2:
+                break
+            probe = None
+        return best
+
+    def _warm_start(self, key, symbols, active, cap):
+        previous = self._previous.get(key) if key is not None else None
+        if previous is None or symbols is None:
+            return project_capped_simplex(np.full(len(active), 1.0 / len(active)), cap), 0.0, False
+        previous_weights, log_lambda = previous
+        start = np.array([previous_weights.get(symbols[i], 0.0) for i in active])
+        return project_capped_simplex(start, cap), log_lambda, True
+
+
+def round_percentages(weights):
+    """Integer percentages summing to 100 (largest remainder), aligned to ``weights``."""
+    weights = np.asarray(weights, dtype=np.float64)
+    if weights.sum() <= 0:
+        return np.zeros(len(weights), dtype=int)
+    raw = weights / weights.sum() * 100
+    percentages = np.floor(raw).astype(int)
+    remainder = 100 - percentages.sum()
+    order = np.argsort(-(raw - percentages), kind="stable")
+    percentages[order[:remainder]] += 1
+    return percentages
@@ -0,0 +1,209 @@
+import json
+import os
+
+import numpy as np
+
+# One fixed-width OHLCV record (40 bytes)
+BAR_DTYPE = np.dtype([("open", "<f8"), ("high", "<f8"), ("low", "<f8"), ("close", "<f8"), ("volume", "<f8")])
+
+# Universe change fields and the look-back window (seconds) each is derived from
+CHANGE_WINDOWS = {
+    "price_change_24h": 24 * 3600,
+    "price_change_7d": 7 * 24 * 3600,
+    "price_change_30d": 30 * 24 * 3600,
+}
+
+_META = "meta.json"
+_BARS = "bars.bin"
+
+
+class PriceHistoryStore:
+    """
+    Append-only, memory-mapped store of per-asset OHLCV bars at a fixed interval.
+
+    Bars are fixed-width records laid out frame by frame: each interval appends
+    one frame with a slot for every symbol, so the bar of a symbol at a given
+    time lives at ``frame(time) * capacity + slot(symbol)``. The slot table in
+    ``meta.json`` is the per-symbol offset index. Lookups read only the frames
+    they touch, never the whole history.
+    """
+
+    def __init__(self, path):
+        self.path = path
+        with open(os.path.join(path, _META), encoding="utf-8") as meta_file:
+            meta = json.load(meta_file)
+        self.start_ts = meta["start_ts"]
+        self.interval = meta["interval"]
+        self.capacity = meta["capacity"]
+        self.slots = {symbol: slot for slot, symbol in enumerate(meta["symbols"])}
+        self._mapped = (-1, None)
+
+    @classmethod
+    def create(cls, path, symbols, start_ts, interval=60, capacity=None):
+        """Create an empty store with room for ``capacity`` symbols."""
+        symbols = list(symbols)
+        capacity = capacity or max(len(symbols), 1)
+        if len(symbols) > capacity:
+            raise ValueError(f"{len(symbols)} symbols do not fit a capacity of {capacity}")
+        os.makedirs(path, exist_ok=True)
+        open(os.path.join(path, _BARS), "wb").close()
+        store = cls.__new__(cls)
+        store.path = path
+        store.start_ts = int(start_ts)
+        store.interval = int(interval)
+        store.capacity = capacity
+        store.slots = {symbol: slot for slot, symbol in enumerate(symbols)}
+        store._mapped = (-1, None)
+        store._write_meta()
+        return store
+
+    def _write_meta(self):
+        meta = {
+            "start_ts": self.start_ts,
+            "interval": self.interval,
+            "capacity": self.capacity,
+            "symbols": sorted(self.slots, key=self.slots.get),
+        }
+        tmp_path = os.path.join(self.path, _META + ".tmp")
+        with open(tmp_path, "w", encoding="utf-8") as meta_file:
+            json.dump(meta, meta_file)
+        os.replace(tmp_path, os.path.join(self.path, _META))
+
+    @property
+    def frame_count(self):
+        return os.path.getsize(os.path.join(self.path, _BARS)) // (BAR_DTYPE.itemsize * self.capacity)
+
+    @property
+    def end_ts(self):
+        """Timestamp of the last appended frame, or None if the store is empty."""
+        frames = self.frame_count
+        return self.start_ts + (frames - 1) * self.interval if frames else None
+
+    def frame_of(self, ts):
+        return (int(ts) - self.start_ts) // self.interval
+
+    def add_symbols(self, symbols):
+        """Assign free slots to new symbols; their earlier bars read as missing (NaN)."""
+        added = False
+        for symbol in symbols:
+            if symbol not in self.slots:
+                if len(self.slots) >= self.capacity:
+                    raise ValueError(f"Store is full ({self.capacity} symbols)")
+                self.slots[symbol] = len(self.slots)
+                added = True
+        if added:
+            self._write_meta()
+
+    def bars(self):
+        """
+        Memory-mapped ``(frames, capacity)`` view of every bar, remapped as the file
+        grows. The frame count and its mapping are published together as one tuple,
+        so readers on other threads never see a mapping with another frame count.
+        """
+        frames = self.frame_count
+        mapped_frames, bars = self._mapped
+        if frames != mapped_frames:
+            if frames:
+                bars = np.memmap(os.path.join(self.path, _BARS), dtype=BAR_DTYPE, mode="r",
+                                 shape=(frames, self.capacity))
+            else:
+                bars = np.empty((0, self.capacity), dtype=BAR_DTYPE)
+            self._mapped = (frames, bars)
+        return bars
+
+    def append(self, ts, bars):
+        """
+        Append the frame for ``ts`` from ``{symbol: (open, high, low, close, volume)}``.
+        Symbols without a bar, and any frames skipped since the last append, carry
+        the previous close forward with zero volume. Bars falling in the last stored
+        frame are merged into it: its open is kept, high, low and close are updated
+        and the volume is added.
+        """
+        frame = self.frame_of(ts)
+        if frame < 0:
+            raise ValueError(f"Bars at {ts} are older than the start of the store at {self.start_ts}")
+        frames = self.frame_count
+        if frame < frames - 1:
+            raise ValueError(f"Bars at {ts} are older than the last stored frame")
+        self.add_symbols(bars)
+        if frame == frames - 1:
+            self._merge_last(frame, bars)
+            return
+
+        carried = np.empty(self.capacity, dtype=BAR_DTYPE)
+        last_close = self.bars()[frames - 1]["close"] if frames else np.nan
+        for field in ("open", "high", "low", "close"):
+            carried[field] = last_close
+        carried["volume"] = 0.0
+
+        current = carried.copy()
+        for symbol, bar in bars.items():
+            current[self.slots[symbol]] = tuple(bar)
+
+        with open(os.path.join(self.path, _BARS), "ab") as bars_file:
+            for _ in range(frame - frames):
+                bars_file.write(carried.tobytes())
+            bars_file.write(current.tobytes())
+
+    def _merge_last(self, frame, bars):
+        """Merge ``bars`` into the stored ``frame``, rewriting it in place."""
+        current = np.array(self.bars()[frame])
+        for symbol, (open_, high, low, close, volume) in bars.items():
+            bar = current[self.slots[symbol]]
+            # A slot that never had a price (new symbol) takes the merged bar's open
+            if np.isnan(bar["open"]):
+                bar["open"] = open_
+            bar["high"] = np.fmax(bar["high"], high)
+            bar["low"] = np.fmin(bar["low"], low)
+            bar["close"] = close
+            bar["volume"] += volume
+            current[self.slots[symbol]] = bar
+
+        with open(os.path.join(self.path, _BARS), "r+b") as bars_file:
+            bars_file.seek(frame * self.capacity * BAR_DTYPE.itemsize)
+            bars_file.write(current.tobytes())
+
+    def closes(self, frames, symbols):
+        """Closes at several frames for several symbols as a ``(frames, symbols)`` array."""
+        slots = np.array([self.slots.get(symbol, -1) for symbol in symbols], dtype=np.intp)
+        frames = np.asarray(frames, dtype=np.intp)
+        closes = np.full((len(frames), len(slots)), np.nan)
+        valid_frames = (frames >= 0) & (frames < self.frame_count)
+        known = slots >= 0
+        if valid_frames.any() and known.any():
+            rows = self.bars()[frames[valid_frames]]["close"]
+            closes[np.ix_(valid_frames, known)] = rows[:, slots[known]]
+        return closes
+
+    def price_changes(self, symbols, as_of=None, windows=CHANGE_WINDOWS):
+        """
+        Latest close and percentage change over each look-back window for every
+        symbol, from one gather of the frames involved. Returns ``(latest, changes)``
+        where ``changes`` maps each window name to an array; missing history is NaN.
+        """
+        frames = self.frame_count
+        if as_of is None:
+            now = frames - 1
+        else:
+            now = min(self.frame_of(as_of), frames - 1)
+        lookups = [now] + [now - seconds // self.interval for seconds in windows.values()]
+        closes = self.closes(lookups, symbols)
+        latest = closes[0]
+        with np.errstate(divide="ignore", invalid="ignore"):
+            changes = {name: (latest / closes[i + 1] - 1.0) * 100.0 for i, name in enumerate(windows)}
+        return latest, changes
+
+
+def apply_price_history(universe, store, as_of=None):
+    """
+    Returns a new universe snapshot whose price and 24h/7d/30d change fields are
+    derived from the price history store. Assets without enough history keep
+    their current values.
+    """
+    latest, changes = store.price_changes(universe.symbols, as_of)
+    updates = {}
+    for field, values in [("price_usd", latest)] + list(changes.items()):
+        positions = np.flatnonzero(np.isfinite(values))
+        if len(positions):
+            updates[field] = (positions, values[positions])
+    return universe.with_values(updates) if updates else universe
@@ -0,0 +1,183 @@
+import functools
+import inspect
+import sys
+import threading
+from collections import OrderedDict
+from concurrent.futures import Future
+
+_MISSING = object()
+
+
+class RenderCache:
+    """
+    Bounded LRU cache for rendered markdown responses. Entries are evicted
+    least-recently-used first once either the entry count or the total size
+    in bytes goes over its limit.
+
+    ``get_or_claim`` and ``put`` make a miss single-flight: while one caller
+    computes a key, later callers missing the same key wait for its value
+    instead of computing it again.
+    """
+
+    def __init__(self, max_entries=512, max_bytes=8 * 1024 * 1024):
+        self.max_entries = max_entries
+        self.max_bytes = max_bytes
+        self._entries = OrderedDict()
+        self._bytes = 0
+        self._inflight = {}
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    def get(self, key, default=None):
+        with self._lock:
+            entry = self._entries.get(key, _MISSING)
+            if entry is _MISSING:
+                self.misses += 1
+                return default
+            self._entries.move_to_end(key)
+            self.hits += 1
+            return entry[0]
+
+    def get_or_claim(self, key):
+        """
+        The cached value for ``key``, or the value another caller is computing
+        for it once that is done. Returns ``_MISSING`` when nobody is: the caller
+        then owns the computation and must ``put`` the value, or ``release`` the
+        key if it fails.
+        """
+        while True:
+            with self._lock:
+                entry = self._entries.get(key, _MISSING)
+                if entry is not _MISSING:
+                    self._entries.move_to_end(key)
+                    self.hits += 1
+                    return entry[0]
+                future = self._inflight.get(key)
+                if future is None:
+                    self._inflight[key] = Future()
+                    self.misses += 1
+                    return _MISSING
+            value = future.result()
+            if value is not _MISSING:
+                with self._lock:
+                    self.hits += 1
+                return value
+            # The computation failed; the next caller to get here claims the key
+
+    def release(self, key, value=_MISSING):
+        """Wake the callers waiting on ``key`` with ``value``, or to retry if there is none."""
+        with self._lock:
+            future = self._inflight.pop(key, None)
+        if future is not None:
+            future.set_result(value)
+
+    def put(self, key, value):
+        size = sys.getsizeof(value)
+        if size > self.max_bytes:
+            self.release(key, value)
+            return
+        with self._lock:
+            previous = self._entries.pop(key, None)
+            if previous is not None:
+                self._bytes -= previous[1]
+            self._entries[key] = (value, size)
+            self._bytes += size
+            while len(self._entries) > self.max_entries or self._bytes > self.max_bytes:
+                _, (_, evicted_size) = self._entries.popitem(last=False)
+                self._bytes -= evicted_size
+                self.evictions += 1
+        self.release(key, value)
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+            self._bytes = 0
+
+    def stats(self):
+        """Hit/miss/eviction counters and current occupancy."""
+        with self._lock:
+            lookups = self.hits + self.misses
+            return {
+                "hits": self.hits,
+                "misses": self.misses,
+                "evictions": self.evictions,
+                "hit_rate": self.hits / lookups if lookups else 0.0,
+                "entries": len(self._entries),
+                "bytes": self._bytes,
+            }
+
+
+def _argument_key(method):
+    """
+    Function turning the arguments of a call to ``method`` into the tuple of
+    every parameter's value, defaults included, so ``f("low")`` and
+    ``f(risk_tolerance="low")`` get the same key.
+    """
+    signature = inspect.signature(method)
+    positional = len(signature.parameters) - 1
+
+    def key(self, args, kwargs):
+        if not kwargs and len(args) == positional:
+            return args
+        bound = signature.bind(self, *args, **kwargs)
+        bound.apply_defaults()
+        return bound.args[1:]
+    return key
+
+
+def cached_render(method):
+    """
+    Caches a CryptoAdvisor response method in the advisor's render cache, keyed
+    on (method, arguments, snapshot version). Concurrent misses on the same key
+    share one render.
+    """
+    argument_key = _argument_key(method)
+
+    @functools.wraps(method)
+    def wrapper(self, *args, **kwargs):
+        state = self._refresh_snapshot()
+        key = (method.__name__, argument_key(self, args, kwargs), state.universe.version)
+        response = self.render_cache.get_or_claim(key)
+        if response is _MISSING:
+            try:
+                response = method(self, *args, **kwargs)
+            except BaseException:
+                self.render_cache.release(key)
+                raise
+            self.render_cache.put(key, response)
+        return response
+    return wrapper
+
+
+def cached_stream(name):
+    """
+    Caches a CryptoAdvisor generator of response sections under the same key as
+    the response method ``name``. A cached response is yielded whole; otherwise
+    sections are yielded as they are produced and the joined response is
+    cached once the generator is exhausted. Concurrent callers missing the same
+    key wait for the first one's response and yield it whole.
+    """
+    def decorator(method):
+        argument_key = _argument_key(method)
+
+        @functools.wraps(method)
+        def wrapper(self, *args, **kwargs):
+            state = self._refresh_snapshot()
+            key = (name, argument_key(self, args, kwargs), state.universe.version)
+            response = self.render_cache.get_or_claim(key)
+            if response is not _MISSING:
+                yield response
+                return
+            sections = []
+            try:
+                for section in method(self, *args, **kwargs):
+                    sections.append(section)
+                    yield section
+            except BaseException:
+                self.render_cache.release(key)
+                raise
+            self.render_cache.put(key, "".join(sections))
+        return wrapper
+    return decorator
@@ -0,0 +1,176 @@
+import re
+import threading
+from collections import namedtuple
+
+# Words shorter than this are never spelling-corrected; too many short words are
+# one edit away from something
+MIN_FUZZY_LENGTH = 5
+
+# Corrections less similar than this are dropped rather than guessed at
+MIN_FUZZY_CONFIDENCE = 0.8
+
+# Everyday English words. A message word in this list is never spelling-corrected,
+# and a symbol or one-word name spelled like one ("ONE", "HOT", "NEAR") only counts
+# as a mention when the message capitalizes it or writes it with a "$" in front
+COMMON_WORDS = frozenset("""
+about after again all also always and any are ask bad band bat because been before best better big bit
+bond both but buy can cake case change coin coins come could crypto cryptos dash day days does doing dot
+down each earn even ever every far fast few find first flow for free from fund gain gas get give going
+gold good great grow had has have help here high hold home hot how into invest its just keep key kind
+know last late less like link long look looks lose loss low made make many mask market may mean more
+most much must near need new next nice not now off old once one only open other our out over own part
+pay plan play point price pro rate ray real right rise risk rose safe same sand say see sell should
+show since small some soon star still storm sun super sure take tell than that the their them then
+there these they thing think this time today too top trade true try under up use very want was way
+week well were what when where which while who why will win with work worth would year years yes yet
+you your
+""".split())
+
+# One asset mentioned in a message: ``text`` is the mention's words, lowercased, and
+# ``confidence`` is 1.0 for an exact name or symbol, less for a corrected spelling
+AssetMatch = namedtuple("AssetMatch", ["symbol", "name", "confidence", "text"])
+
+_WORD = re.compile(r"[a-z0-9]+")
+
+# A word of a message as written, with the "$" that may mark it as a ticker
+_CASED_WORD = re.compile(r"(\$?)([A-Za-z0-9]+)")
+
+
+def normalize(text):
+    """Lowercase words of ``text`` joined by single spaces."""
+    return " ".join(_WORD.findall(text.lower()))
+
+
+def _deletes(word):
+    """``word`` and every string one character shorter."""
+    return {word} | {word[:i] + word[i + 1:] for i in range(len(word))}
+
+
+def edit_distance(a, b, limit=2):
+    """
+    Optimal string alignment distance (insertions, deletions, substitutions and
+    adjacent transpositions), or ``limit + 1`` once it is known to exceed ``limit``.
+    """
+    if abs(len(a) - len(b)) > limit:
+        return limit + 1
+    previous2, previous = None, list(range(len(b) + 1))
+    for i in range(1, len(a) + 1):
+        current = [i] + [0] * len(b)
+        for j in range(1, len(b) + 1):
+            cost = a[i - 1] != b[j - 1]
+            current[j] = min(previous[j] + 1, current[j - 1] + 1, previous[j - 1] + cost)
+            if i > 1 and j > 1 and a[i - 1] == b[j - 2] and a[i - 2] == b[j - 1]:
+                current[j] = min(current[j], previous2[j - 2] + 1)
+        if min(current) > limit:
+            return limit + 1
+        previous2, previous = previous, current
+    return previous[-1]
+
+
+class SymbolResolver:
+    """
+    Finds the assets a message mentions, built from a universe's symbols and names.
+
+    Exact mentions are hash lookups of the message's word n-grams against every
+    normalized name and symbol, longest first. Words that match nothing are then
+    spelling-corrected against the vocabulary of name words with a symmetric
+    deletion index (every word and its one-character deletions map back to the
+    word), which finds all words within one edit in a handful of lookups however
+    many assets are listed, and the corrected n-grams are looked up again.
+
+    Symbols and one-word names that are also everyday words need a cue in the
+    message, so "which one" does not mention Harmony but "ONE" and "$one" do.
+    """
+
+    def __init__(self, symbols, names):
+        self.symbols = tuple(symbols)
+        self.names = tuple(names)
+        self._exact = {}
+        for position, name in enumerate(self.names):
+            self._exact.setdefault(normalize(name), position)
+        for position, symbol in enumerate(self.symbols):
+            self._exact.setdefault(normalize(symbol), position)
+        self._max_words = max((key.count(" ") + 1 for key in self._exact), default=1)
+        self._needs_cue = {key for key in self._exact if key in COMMON_WORDS}
+
+        self._vocabulary = set()
+        self._deletion_index = {}
+        for name in self.names:
+            for word in _WORD.findall(name.lower()):
+                if (len(word) >= MIN_FUZZY_LENGTH and word.isalpha() and word not in COMMON_WORDS
+                        and word not in self._vocabulary):
+                    self._vocabulary.add(word)
+                    for variant in _deletes(word):
+                        self._deletion_index.setdefault(variant, []).append(word)
+
+    def resolve(self, text):
+        """Every asset mentioned in ``text`` as an ``AssetMatch``, in order of first mention."""
+        words, cued = [], []
+        for dollar, word in _CASED_WORD.findall(text):
+            words.append(word.lower())
+            cued.append(bool(dollar) or not word.islower())
+        corrections = [self._correct(word) for word in words]
+        matches = {}
+        i = 0
+        while i < len(words):
+            for size in range(min(self._max_words, len(words) - i), 0, -1):
+                key = " ".join(words[i:i + size])
+                position = self._exact.get(key)
+                confidence = 1.0
+                if key in self._needs_cue and not cued[i]:
+                    position = None
+                if position is None:
+                    corrected = corrections[i:i + size]
+                    if all(correction is None for correction in corrected):
+                        continue
+                    key = " ".join(correction[0] if correction else word
+                                   for word, correction in zip(words[i:i + size], corrected))
+                    position = None if key in self._needs_cue else self._exact.get(key)
+                    confidence = min(correction[1] for correction in corrected if correction)
+                if position is not None:
+                    if position not in matches:
+                        matches[position] = AssetMatch(self.symbols[position], self.names[position], confidence,
+                                                       " ".join(words[i:i + size]))
+                    i += size
+                    break
+            else:
+                i += 1
+        return list(matches.values())
+
+    def _correct(self, word):
+        """``(vocabulary word, similarity)`` closest to a misspelled ``word``, or None."""
+        if len(word) < MIN_FUZZY_LENGTH or not word.isalpha() or word in COMMON_WORDS or word in self._vocabulary:
+            return None
+        best = None
+        for variant in _deletes(word):
+            for candidate in self._deletion_index.get(variant, ()):
+                if edit_distance(word, candidate, limit=1) <= 1:
+                    similarity = 1.0 - 1.0 / max(len(word), len(candidate))
+                    if similarity < MIN_FUZZY_CONFIDENCE:
+                        continue
+                    # Ties go to the alphabetically first word, whatever order the set yields
+                    if best is None or similarity > best[1] or (similarity == best[1] and candidate < best[0]):
+                        best = (candidate, similarity)
+        return best
+
+
+_resolvers = {}
+_resolvers_lock = threading.Lock()
+
+
+def get_resolver(universe):
+    """
+    Returns the resolver for a universe snapshot. Price updates share the name
+    column of the snapshot they came from, so the resolver is only rebuilt when
+    the listed assets change.
+    """
+    names = universe.column("name")
+    entry = _resolvers.get(id(names))
+    if entry is None or entry[0] is not names:
+        with _resolvers_lock:
+            entry = _resolvers.get(id(names))
+            if entry is None or entry[0] is not names:
+                _resolvers.clear()
+                entry = (names, SymbolResolver(universe.symbols, names))
+                _resolvers[id(names)] = entry
+    return entry[1]
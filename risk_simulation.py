@@ -0,0 +1,156 @@
+import os
+import threading
+from collections import namedtuple
+
+import numpy as np
+
+from render_cache import RenderCache
+
+# Horizons (days) the downside is reported for
+DEFAULT_HORIZONS = (1, 7, 30)
+DEFAULT_PATHS = 100_000
+DEFAULT_CONFIDENCE = 0.95
+
+# Degrees of freedom of the Student-t shocks, for fatter tails than a normal
+# distribution; None simulates Gaussian shocks
+DEFAULT_DOF = 4
+
+DAYS_PER_YEAR = 365
+
+# Paths per shard (the unit of work sent to a worker process) and per
+# vectorized block inside a shard (bounds the memory of one block)
+SHARD_PATHS = 25_000
+BLOCK_PATHS = 5_000
+
+HorizonRisk = namedtuple("HorizonRisk", ["horizon", "probability_of_loss", "var", "cvar", "mean"])
+
+_MISSING = object()
+
+
+def _cholesky(cov):
+    """Cholesky factor of a covariance matrix, via eigenvalues if it is only semi-definite."""
+    try:
+        return np.linalg.cholesky(cov)
+    except np.linalg.LinAlgError:
+        values, vectors = np.linalg.eigh(cov)
+        return vectors * np.sqrt(np.clip(values, 0.0, None))
+
+
+def _simulate_shard(weights, drift, chol, horizons, n_paths, seed, dof):
+    """
+    Simulates ``n_paths`` daily paths of correlated asset log returns and returns
+    the compounded portfolio return at each horizon, shape ``(n_paths, len(horizons))``.
+    The portfolio is rebalanced to ``weights`` daily.
+    """
+    rng = np.random.default_rng(seed)
+    days = max(horizons)
+    horizon_index = np.asarray(horizons) - 1
+    returns = np.empty((n_paths, len(horizons)))
+    for start in range(0, n_paths, BLOCK_PATHS):
+        size = min(BLOCK_PATHS, n_paths - start)
+        shocks = rng.standard_normal((size, days, len(weights))) @ chol.T
+        if dof:
+            # A shared chi-square mixing draw per day turns the correlated normals
+            # into a multivariate Student-t with the same covariance
+            shocks *= np.sqrt((dof - 2) / rng.chisquare(dof, (size, days, 1)))
+        daily = np.expm1(drift + shocks) @ weights
+        growth = np.cumsum(np.log1p(daily), axis=1)
+        returns[start:start + size] = np.expm1(growth[:, horizon_index])
+    return returns
+
+
+def summarize_returns(returns, horizons, confidence=DEFAULT_CONFIDENCE):
+    """
+    Returns a ``HorizonRisk`` per horizon from simulated returns. VaR and CVaR are
+    losses (positive numbers) at ``confidence``; CVaR is the mean loss beyond VaR.
+    """
+    cutoffs = np.quantile(returns, 1.0 - confidence, axis=0)
+    risks = []
+    for j, horizon in enumerate(horizons):
+        column = returns[:, j]
+        risks.append(HorizonRisk(
+            horizon=horizon,
+            probability_of_loss=float((column < 0).mean()),
+            var=float(-cutoffs[j]),
+            cvar=float(-column[column <= cutoffs[j]].mean()),
+            mean=float(column.mean()),
+        ))
+    return risks
+
+
+class RiskSimulator:
+    """
+    Monte Carlo downside simulation for a weighted portfolio.
+
+    Paths are split into fixed-size shards, each seeded from one
+    ``SeedSequence.spawn`` child, so results depend only on ``seed`` and never on
+    how many workers ran them. Shards run on a process pool (``workers`` > 1) and
+    are generated in vectorized blocks. Summaries are cached per caller-supplied
+    key, typically (portfolio, snapshot version).
+    """
+
+    def __init__(self, workers=None, n_paths=DEFAULT_PATHS, horizons=DEFAULT_HORIZONS,
+                 confidence=DEFAULT_CONFIDENCE, dof=DEFAULT_DOF, seed=0):
+        self.workers = (os.cpu_count() or 1) if workers is None else workers
+        self.n_paths = n_paths
+        self.horizons = tuple(horizons)
+        self.confidence = confidence
+        self.dof = dof
+        self.seed = seed
+        self.cache = RenderCache(max_entries=256)
+        self._executor = None
+        self._lock = threading.Lock()
+
+    def simulate(self, weights, cov, mu=None, key=None):
+        """
+        Returns a ``HorizonRisk`` per horizon for portfolio ``weights`` under the
+        annualized covariance ``cov`` and expected returns ``mu`` (zero drift if
+        None). With a ``key`` the summary is cached.
+        """
+        if key is not None:
+            key = (key, self.n_paths, self.horizons, self.confidence, self.dof, self.seed)
+            risks = self.cache.get(key, _MISSING)
+            if risks is not _MISSING:
+                return risks
+        risks = summarize_returns(self.sample(weights, cov, mu), self.horizons, self.confidence)
+        if key is not None:
+            self.cache.put(key, risks)
+        return risks
+
+    def sample(self, weights, cov, mu=None):
+        """Simulated portfolio returns at each horizon, shape ``(n_paths, len(horizons))``."""
+        weights = np.asarray(weights, dtype=np.float64)
+        held = np.flatnonzero(weights)
+        weights = weights[held]
+        cov = np.asarray(cov, dtype=np.float64)[np.ix_(held, held)] / DAYS_PER_YEAR
+        mu = np.zeros(len(held)) if mu is None else np.asarray(mu, dtype=np.float64)[held] / DAYS_PER_YEAR
+        drift = mu - 0.5 * np.diag(cov)
+        chol = _cholesky(cov)
+
+        shard_sizes = [min(SHARD_PATHS, self.n_paths - start) for start in range(0, self.n_paths, SHARD_PATHS)]
+        seeds = np.random.SeedSequence(self.seed).spawn(len(shard_sizes))
+        shards = [(weights, drift, chol, self.horizons, size, seed, self.dof) for size, seed in zip(shard_sizes, seeds)]
+        if self.workers > 1 and len(shards) > 1:
+            executor = self._get_executor()
+            results = list(executor.map(_simulate_shard, *zip(*shards)))
+        else:
+            results = [_simulate_shard(*shard) for shard in shards]
+        return np.concatenate(results)
+
+    def _get_executor(self):
+        # Imported on first use: the process pool machinery is only needed for
+        # multi-worker runs and would otherwise slow down every cold start
+        import multiprocessing
+        from concurrent.futures import ProcessPoolExecutor
+
+        with self._lock:
+            if self._executor is None:
+                # Spawned workers are safe to start from a multi-threaded server
+                self._executor = ProcessPoolExecutor(self.workers, mp_context=multiprocessing.get_context("spawn"))
+            return self._executor
+
+    def close(self):
+        with self._lock:
+            if self._executor is not None:
+                self._executor.shutdown()
+                self._executor = None
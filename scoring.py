@@ -0,0 +1,110 @@
+from collections import namedtuple
+
+import numpy as np
+
+# Row order of the batch score matrix
+RISK_TOLERANCES = ("low", "medium", "high")
+
+# Cut-offs of the investment score rules; the defaults are the advisor's own
+ScoringThresholds = namedtuple("ScoringThresholds", [
+    "top_rank",                  # market cap rank worth 3 points
+    "established_rank",          # market cap rank worth 2 points
+    "strong_change",             # 30-day change (%) worth 2 points
+    "positive_change",           # 30-day change (%) worth 1 point
+    "excellent_sustainability",  # sustainability score worth 2 points
+    "good_sustainability",       # sustainability score worth 1 point
+    "mature_technology",         # technology maturity worth 1 point
+    "max_score",
+])
+DEFAULT_SCORING_THRESHOLDS = ScoringThresholds(5, 15, 20, 0, 8, 6, 8, 10)
+
+
+def risk_row(risk_tolerance):
+    """
+    Returns the score matrix row for a risk tolerance. Unknown tolerances get no
+    volatility adjustment, which is exactly the "medium" row.
+    """
+    if risk_tolerance in RISK_TOLERANCES:
+        return RISK_TOLERANCES.index(risk_tolerance)
+    return RISK_TOLERANCES.index("medium")
+
+
+def investment_score(crypto, risk_tolerance, thresholds=DEFAULT_SCORING_THRESHOLDS):
+    """
+    Investment score of one asset record for a risk tolerance: the per-asset
+    form of ``batch_investment_scores``.
+    """
+    score = 0
+
+    # Market cap rank (higher rank = lower score)
+    if crypto['market_cap_rank'] <= thresholds.top_rank:
+        score += 3
+    elif crypto['market_cap_rank'] <= thresholds.established_rank:
+        score += 2
+    else:
+        score += 1
+
+    # Performance (30-day change)
+    if crypto['price_change_30d'] > thresholds.strong_change:
+        score += 2
+    elif crypto['price_change_30d'] > thresholds.positive_change:
+        score += 1
+
+    # Sustainability
+    if crypto['sustainability_score'] >= thresholds.excellent_sustainability:
+        score += 2
+    elif crypto['sustainability_score'] >= thresholds.good_sustainability:
+        score += 1
+
+    # Technology maturity
+    if crypto['technology_maturity'] >= thresholds.mature_technology:
+        score += 1
+
+    # Adoption and regulatory clarity
+    score += min(crypto['adoption_score'] // 3, 2)
+    score += min(crypto['regulatory_clarity'] // 3, 2)
+
+    # Risk adjustment based on tolerance
+    if risk_tolerance == "low" and crypto['volatility'] in ["Low", "Medium"]:
+        score += 1
+    elif risk_tolerance == "high" and crypto['volatility'] == "Very High":
+        score += 1
+
+    return min(score, thresholds.max_score)
+
+
+def batch_investment_scores(universe, thresholds=DEFAULT_SCORING_THRESHOLDS):
+    """
+    Scores every asset in the universe for all risk tolerances in one vectorized pass.
+    Agrees with ``investment_score`` on every asset and risk tolerance.
+    Returns an integer array of shape (len(RISK_TOLERANCES), len(universe)) aligned to
+    the universe rows.
+    """
+    rank = universe.column("market_cap_rank")
+    change_30d = universe.column("price_change_30d")
+    sustainability = universe.column("sustainability_score")
+
+    # Market cap rank (higher rank = lower score)
+    base = np.select([rank <= thresholds.top_rank, rank <= thresholds.established_rank], [3, 2], 1)
+
+    # Performance (30-day change)
+    base += np.select([change_30d > thresholds.strong_change, change_30d > thresholds.positive_change], [2, 1], 0)
+
+    # Sustainability
+    base += np.select([sustainability >= thresholds.excellent_sustainability,
+                       sustainability >= thresholds.good_sustainability], [2, 1], 0)
+
+    # Technology maturity
+    base += universe.column("technology_maturity") >= thresholds.mature_technology
+
+    # Adoption and regulatory clarity
+    base += np.minimum(universe.column("adoption_score") // 3, 2)
+    base += np.minimum(universe.column("regulatory_clarity") // 3, 2)
+
+    # Risk adjustment based on tolerance
+    volatility = universe.column("volatility")
+    adjustment = np.zeros((len(RISK_TOLERANCES), len(universe)), dtype=base.dtype)
+    adjustment[RISK_TOLERANCES.index("low")] = volatility.isin(["Low", "Medium"])
+    adjustment[RISK_TOLERANCES.index("high")] = volatility.isin(["Very High"])
+
+    return np.minimum(base + adjustment, thresholds.max_score)
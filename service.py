@@ -0,0 +1,322 @@
+import argparse
+import asyncio
+import json
+import sys
+from concurrent.futures import ThreadPoolExecutor
+
+from advisor_logic import CryptoAdvisor, comparison_key
+from chat import process_user_input
+import metrics
+
+RISK_TOLERANCES = ("low", "medium", "high")
+
+# Largest request body the HTTP server accepts
+MAX_BODY_BYTES = 64 * 1024 * 1024
+
+_REASONS = {200: "OK", 400: "Bad Request", 404: "Not Found", 405: "Method Not Allowed", 413: "Payload Too Large"}
+
+
+class RequestError(ValueError):
+    """A batch request that cannot be answered as given."""
+
+
+def request_key(request):
+    """
+    Returns the normalized ``(risk_tolerance, symbols, compare, query)`` key of a
+    request ``{"risk_tolerance", "symbols", "compare", "query"}``; requests with
+    equal keys get the same answer.
+    """
+    if not isinstance(request, dict):
+        raise RequestError("request must be a JSON object")
+    risk_tolerance = request.get("risk_tolerance")
+    if risk_tolerance is not None:
+        risk_tolerance = str(risk_tolerance).lower()
+        if risk_tolerance not in RISK_TOLERANCES:
+            raise RequestError(f"risk_tolerance must be one of {', '.join(RISK_TOLERANCES)}")
+    symbols = _symbol_list(request, "symbols")
+    compare = _symbol_list(request, "compare", split=lambda text: text.replace(",", " ").split())
+    query = request.get("query")
+    query = " ".join(str(query).split()) if query else None
+    if risk_tolerance is None and not symbols and not compare and not query:
+        raise RequestError("request needs at least one of risk_tolerance, symbols, compare or query")
+    return risk_tolerance, symbols, compare, query
+
+
+def _symbol_list(request, field, split=None):
+    """
+    Normalized symbols of a request field holding a string or a list of strings.
+    A string is one symbol, or several when a ``split`` function is given.
+    """
+    value = request.get(field)
+    if not value:
+        return ()
+    if isinstance(value, str):
+        value = split(value) if split else [value]
+    elif not isinstance(value, list) or not all(isinstance(symbol, str) for symbol in value):
+        raise RequestError(f"{field} must be a string or a list of strings")
+    return comparison_key(value)
+
+
+class AdvisoryService:
+    """
+    Answers batches of advisory requests with the shared CryptoAdvisor.
+
+    Each request expands into advisor calls (recommendations for its risk
+    tolerance, one analysis per symbol, one side-by-side comparison of its
+    ``compare`` symbols, the chat answer to its query). Calls run on a thread
+    pool and are deduplicated by key: concurrent requests needing the same call
+    await one computation, and finished calls are served from the advisor's
+    render cache.
+    """
+
+    def __init__(self, advisor=None, max_workers=4):
+        self.advisor = advisor or CryptoAdvisor()
+        self._executor = ThreadPoolExecutor(max_workers, thread_name_prefix="advisory")
+        self._inflight = {}
+        self.stats = {"requests": 0, "errors": 0, "computations": 0, "shared": 0}
+
+    async def answer(self, request):
+        """Answer one request as a dict of its results (or its error)."""
+        self.stats["requests"] += 1
+        request_id = request.get("id") if isinstance(request, dict) else None
+        try:
+            if isinstance(request, RequestError):
+                raise request
+            risk_tolerance, symbols, compare, query = request_key(request)
+        except RequestError as error:
+            self.stats["errors"] += 1
+            return {"id": request_id, "error": str(error)}
+
+        calls = {}
+        if risk_tolerance is not None:
+            calls["recommendations"] = self._call(("recommendations", risk_tolerance),
+                                                  self.advisor.get_investment_recommendations, risk_tolerance)
+        for symbol in symbols:
+            calls[symbol] = self._call(("analysis", symbol), self.advisor.analyze_specific_crypto, symbol)
+        if compare:
+            compare_risk = risk_tolerance or "medium"
+            calls["comparison"] = self._call(("comparison", compare, compare_risk), self.advisor.compare_cryptos,
+                                             compare, compare_risk)
+        if query is not None:
+            calls["answer"] = self._call(("query", query.lower()), process_user_input, query, self.advisor)
+
+        try:
+            results = dict(zip(calls, await asyncio.gather(*calls.values())))
+        except Exception as error:  # an advisor failure answers this request only
+            self.stats["errors"] += 1
+            return {"id": request_id, "error": f"{type(error).__name__}: {error}"}
+        response = {"id": request_id}
+        if "recommendations" in results:
+            response["recommendations"] = results.pop("recommendations")
+        if symbols:
+            response["analyses"] = {symbol: results.pop(symbol) for symbol in symbols}
+        if "comparison" in results:
+            response["comparison"] = results.pop("comparison")
+        if "answer" in results:
+            response["answer"] = results.pop("answer")
+        return response
+
+    async def answer_batch(self, requests):
+        """
+        Async iterator of answers in request order. Every request is scheduled up
+        front, so answers stream out as soon as the ones before them are done.
+        """
+        tasks = [asyncio.ensure_future(self.answer(request)) for request in requests]
+        try:
+            for task in tasks:
+                yield await task
+        finally:
+            for task in tasks:
+                task.cancel()
+
+    def _call(self, key, function, *args):
+        future = self._inflight.get(key)
+        if future is not None:
+            self.stats["shared"] += 1
+            return future
+        self.stats["computations"] += 1
+        loop = asyncio.get_running_loop()
+        future = loop.run_in_executor(self._executor, function, *args)
+        self._inflight[key] = future
+        future.add_done_callback(lambda _: self._inflight.pop(key, None))
+        return future
+
+    def collect_metrics(self):
+        """Service counters for the metrics registry."""
+        return [
+            metrics.Metric("crypto_advisor_service_requests_total", "counter", "Requests answered, errors included.",
+                           [((), self.stats["requests"])]),
+            metrics.Metric("crypto_advisor_service_errors_total", "counter", "Requests rejected as invalid.",
+                           [((), self.stats["errors"])]),
+            metrics.Metric("crypto_advisor_service_calls_total", "counter",
+                           "Advisor calls, by whether they ran or joined one already in flight.",
+                           [((("outcome", "computed"),), self.stats["computations"]),
+                            ((("outcome", "shared"),), self.stats["shared"])]),
+            metrics.Metric("crypto_advisor_service_inflight_calls", "gauge", "Advisor calls running now.",
+                           [((), len(self._inflight))]),
+        ]
+
+    def close(self):
+        self._executor.shutdown(wait=False)
+
+
+def parse_requests(text):
+    """
+    Parses a batch body: a JSON array of requests or NDJSON, one request per line.
+    Lines that are not valid JSON become RequestError placeholders, answered with
+    an error, so answers stay aligned with the input lines.
+    """
+    stripped = text.lstrip()
+    if stripped.startswith("["):
+        requests = json.loads(stripped)
+        if not isinstance(requests, list):
+            raise RequestError("batch must be a JSON array or NDJSON")
+        return requests
+    requests = []
+    for number, line in enumerate(text.splitlines(), 1):
+        if line.strip():
+            try:
+                requests.append(json.loads(line))
+            except json.JSONDecodeError:
+                requests.append(RequestError(f"line {number} is not valid JSON"))
+    return requests
+
+
+def _ndjson(record):
+    return (json.dumps(record, ensure_ascii=False) + "\n").encode("utf-8")
+
+
+class AdvisoryServer:
+    """
+    Minimal asyncio HTTP/1.1 server for the advisory service.
+
+    - ``POST /advise``: body is a JSON array or NDJSON of requests; the answers
+      stream back as chunked NDJSON in request order.
+    - ``GET /health``: service counters as JSON.
+    - ``GET /metrics``: latency histograms, cache hit rates, snapshot age and
+      service counters in the Prometheus text format.
+    """
+
+    def __init__(self, service, host="127.0.0.1", port=8080):
+        self.service = service
+        self.host = host
+        self.port = port
+        metrics.register_collector(service.advisor.collect_metrics)
+        metrics.register_collector(service.collect_metrics)
+
+    async def serve_forever(self):
+        server = await asyncio.start_server(self._handle, self.host, self.port)
+        async with server:
+            await server.serve_forever()
+
+    async def _handle(self, reader, writer):
+        try:
+            request_line = (await reader.readline()).decode("latin-1").split()
+            headers = {}
+            while True:
+                line = (await reader.readline()).decode("latin-1").strip()
+                if not line:
+                    break
+                name, _, value = line.partition(":")
+                headers[name.strip().lower()] = value.strip()
+            if len(request_line) < 2:
+                return await self._respond(writer, 400, {"error": "malformed request line"})
+
+            method, path = request_line[0], request_line[1].split("?", 1)[0]
+            if path == "/health":
+                return await self._respond(writer, 200, self.service.stats)
+            if path == "/metrics":
+                return await self._respond_body(writer, 200, metrics.render_prometheus().encode("utf-8"),
+                                                "text/plain; version=0.0.4; charset=utf-8")
+            if path != "/advise":
+                return await self._respond(writer, 404, {"error": f"no route for {path}"})
+            if method != "POST":
+                return await self._respond(writer, 405, {"error": "use POST"})
+
+            try:
+                length = int(headers.get("content-length", "0") or 0)
+            except ValueError:
+                length = -1
+            if length < 0:
+                return await self._respond(writer, 400, {"error": "invalid Content-Length"})
+            if length > MAX_BODY_BYTES:
+                return await self._respond(writer, 413, {"error": f"body over {MAX_BODY_BYTES} bytes"})
+            try:
+                requests = parse_requests((await reader.readexactly(length)).decode("utf-8"))
+            except (UnicodeDecodeError, json.JSONDecodeError, RequestError) as error:
+                return await self._respond(writer, 400, {"error": str(error)})
+            await self._stream(writer, requests)
+        except (ConnectionError, asyncio.IncompleteReadError):
+            pass
+        finally:
+            writer.close()
+
+    async def _respond(self, writer, status, payload):
+        await self._respond_body(writer, status, json.dumps(payload).encode("utf-8"), "application/json")
+
+    async def _respond_body(self, writer, status, body, content_type):
+        writer.write(f"HTTP/1.1 {status} {_REASONS[status]}\r\nContent-Type: {content_type}\r\n"
+                     f"Content-Length: {len(body)}\r\nConnection: close\r\n\r\n".encode("latin-1") + body)
+        await writer.drain()
+
+    async def _stream(self, writer, requests):
+        writer.write(b"HTTP/1.1 200 OK\r\nContent-Type: application/x-ndjson\r\n"
+                     b"Transfer-Encoding: chunked\r\nConnection: close\r\n\r\n")
+        async for answer in self.service.answer_batch(requests):
+            chunk = _ndjson(answer)
+            writer.write(f"{len(chunk):x}\r\n".encode("latin-1") + chunk + b"\r\n")
+            await writer.drain()
+        writer.write(b"0\r\n\r\n")
+        await writer.drain()
+
+
+async def _run_batch(service, source, output):
+    requests = parse_requests(source.read())
+    async for answer in service.answer_batch(requests):
+        output.write(json.dumps(answer, ensure_ascii=False) + "\n")
+    output.flush()
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Headless batch advisory service")
+    commands = parser.add_subparsers(dest="command", required=True)
+
+    serve = commands.add_parser("serve", help="run the HTTP service")
+    serve.add_argument("--host", default="127.0.0.1")
+    serve.add_argument("--port", type=int, default=8080)
+    serve.add_argument("--workers", type=int, default=4, help="advisor worker threads")
+    serve.add_argument("--metrics", action="store_true",
+                       help="record latency histograms for /metrics (also CRYPTO_ADVISOR_METRICS=1)")
+
+    batch = commands.add_parser("batch", help="answer an NDJSON or JSON array file of requests")
+    batch.add_argument("input", nargs="?", default="-", help="request file (default: stdin)")
+    batch.add_argument("-o", "--output", default="-", help="NDJSON answer file (default: stdout)")
+    batch.add_argument("--workers", type=int, default=4, help="advisor worker threads")
+    args = parser.parse_args()
+
+    if args.command == "serve" and args.metrics:
+        metrics.REGISTRY.enabled = True
+    service = AdvisoryService(max_workers=args.workers)
+    try:
+        if args.command == "serve":
+            print(f"Serving on http://{args.host}:{args.port}", file=sys.stderr)
+            asyncio.run(AdvisoryServer(service, args.host, args.port).serve_forever())
+        else:
+            source = sys.stdin if args.input == "-" else open(args.input, encoding="utf-8")
+            output = sys.stdout if args.output == "-" else open(args.output, "w", encoding="utf-8")
+            try:
+                asyncio.run(_run_batch(service, source, output))
+            finally:
+                for stream in (source, output):
+                    if stream not in (sys.stdin, sys.stdout):
+                        stream.close()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        service.close()
+    if args.command == "batch":
+        print(json.dumps(service.stats), file=sys.stderr)
+
+
+if __name__ == "__main__":
+    main()
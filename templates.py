@@ -0,0 +1,205 @@
+import functools
+import operator
+import string
+
+_formatter = string.Formatter()
+
+
+class Template:
+    """
+    A format-string template compiled once into literal and field parts.
+    Rendering appends the pieces to a caller-owned list buffer, so a whole
+    response is joined exactly once at the end.
+    """
+
+    def __init__(self, source):
+        self.source = source
+        self._parts = []
+        for literal, field, spec, conversion in _formatter.parse(source):
+            if conversion:
+                raise ValueError(f"Conversions are not supported in templates: {source!r}")
+            getter = operator.itemgetter(field) if field is not None else None
+            self._parts.append((literal, getter, spec))
+
+    def render_into(self, out, context=None):
+        """Append the rendered template to the ``out`` list."""
+        for literal, getter, spec in self._parts:
+            if literal:
+                out.append(literal)
+            if getter is not None:
+                out.append(format(getter(context), spec))
+
+    def render(self, context=None):
+        out = []
+        self.render_into(out, context)
+        return "".join(out)
+
+
+# Investment recommendations
+RECOMMENDATIONS_HEADER = Template("## Investment Recommendations for {risk_title} Risk Tolerance\n\n")
+RECOMMENDATION = Template(
+    "### {position}. {name} ({symbol})\n"
+    "**Investment Score: {score}/10**\n\n"
+    "📊 **Market Cap Rank**: #{market_cap_rank}\n"
+    "💰 **Current Price**: ${price_usd:,.2f}\n"
+    "📈 **30-day Performance**: {price_change_30d:+.1f}%\n"
+    "⚡ **Energy Efficiency**: {energy_consumption}\n"
+    "🛡️ **Risk Level**: {risk_level}\n\n"
+    "**Why {name}?**\n"
+    "{reasoning}\n\n"
+)
+RECOMMENDATIONS_DISCLAIMER = Template(
+    "\n\n⚠️ **Important**: These recommendations are for educational purposes only. "
+    "Always do your own research and never invest more than you can afford to lose."
+)
+
+# Portfolio allocation
+PORTFOLIO_HEADER = Template("## 💼 Suggested Portfolio Allocation\n\n")
+PORTFOLIO_STYLES = {
+    "low": Template(
+        "**Conservative Portfolio (Low Risk):**\n"
+        "- Focus on large-cap, established cryptocurrencies\n"
+        "- Emphasize stability and regulatory clarity\n\n"
+    ),
+    "medium": Template(
+        "**Balanced Portfolio (Medium Risk):**\n"
+        "- Mix of large-cap stability and mid-cap growth potential\n"
+        "- Balance between safety and opportunity\n\n"
+    ),
+    "high": Template(
+        "**Aggressive Portfolio (High Risk):**\n"
+        "- Higher allocation to growth-oriented cryptocurrencies\n"
+        "- Accept higher volatility for potential higher returns\n\n"
+    ),
+}
+ALLOCATION = Template("- **{name} ({symbol})**: {allocation}%\n")
+PORTFOLIO_VOLATILITY = Template("\n*Estimated annualized volatility: {volatility:.0%}*\n")
+PORTFOLIO_OVER_TARGET = Template(
+    "*The {target:.0%} volatility target is out of reach for these picks under the {max_weight:.0%} "
+    "per-asset cap; this is the least volatile allocation they allow.*\n"
+)
+PORTFOLIO_BELOW_SUSTAINABILITY = Template(
+    "*None of these picks meets this profile's minimum sustainability score of {min_sustainability}/10, "
+    "so the allocation spreads across all of them instead.*\n"
+)
+PORTFOLIO_GUIDELINES = Template(
+    "\n**Portfolio Guidelines:**\n"
+    "- Never invest more than you can afford to lose\n"
+    "- Rebalance quarterly or when allocations drift >5%\n"
+    "- Keep some cash reserves for opportunities\n"
+    "- Consider dollar-cost averaging for entry\n"
+)
+DOWNSIDE_HEADER = Template(
+    "\n## 📉 Downside Risk\n\n"
+    "Simulated over {paths:,} correlated return paths for this allocation:\n\n"
+    "| Horizon | Chance of Loss | Value at Risk ({confidence:.0%}) | Expected Shortfall |\n"
+    "|---|---|---|---|\n"
+)
+DOWNSIDE_ROW = Template("| {days} | {probability_of_loss:.0%} | {var:.1%} | {cvar:.1%} |\n")
+DOWNSIDE_FOOTER = Template(
+    "\n*Value at Risk is the loss not exceeded in {confidence:.0%} of simulated outcomes; "
+    "expected shortfall is the average loss in the remaining worst cases.*"
+)
+
+# Specific cryptocurrency analysis
+ANALYSIS_HEADER = Template("# {name} ({symbol}) Analysis\n\n")
+ANALYSIS_METRICS = Template(
+    "## 📊 Current Metrics\n"
+    "- **Price**: ${price_usd:,.2f}\n"
+    "- **Market Cap Rank**: #{market_cap_rank}\n"
+    "- **Market Cap**: ${market_cap:,.0f}\n"
+    "- **24h Volume**: ${volume_24h:,.0f}\n\n"
+)
+ANALYSIS_PERFORMANCE = Template(
+    "## 📈 Performance\n"
+    "- **24h Change**: {price_change_24h:+.1f}%\n"
+    "- **7d Change**: {price_change_7d:+.1f}%\n"
+    "- **30d Change**: {price_change_30d:+.1f}%\n\n"
+)
+ANALYSIS_SUSTAINABILITY = Template(
+    "## 🌱 Sustainability & Technology\n"
+    "- **Energy Consumption**: {energy_consumption}\n"
+    "- **Consensus Mechanism**: {consensus_mechanism}\n"
+    "- **Sustainability Score**: {sustainability_score}/10\n"
+    "- **Technology Maturity**: {technology_maturity}/10\n\n"
+)
+ANALYSIS_RISK = Template(
+    "## ⚠️ Risk Assessment\n"
+    "- **Overall Risk Level**: {risk_level}\n"
+    "- **Volatility**: {volatility}\n"
+    "- **Regulatory Clarity**: {regulatory_clarity}/10\n"
+    "- **Adoption Score**: {adoption_score}/10\n\n"
+)
+ANALYSIS_USE_CASES_HEADER = Template("## 🎯 Primary Use Cases\n")
+BULLET = Template("- {text}\n")
+ANALYSIS_VERDICT = Template("\n## 🎯 Investment Verdict (Score: {score}/10)\n{verdict}")
+
+# Side-by-side comparison; the table has one column per compared asset, and each
+# row is one format string built by ``comparison_row`` from a cell and a value format
+COMPARISON_HEADER = Template("# ⚖️ Side-by-Side Comparison ({risk_title} Risk Profile)\n\n| Metric |")
+COMPARISON_COLUMN = " {} ({}) |"
+COMPARISON_CELL = " {value} |"
+COMPARISON_RANKED_CELL = " {value} (#{{}}, P{{:.0f}}) |"
+COMPARISON_LEGEND = Template(
+    "\n\n*(#n) ranks the compared assets, best first; Pnn is the percentile among "
+    "all {universe_size:,} listed assets, higher is better.*\n"
+)
+COMPARISON_HIGHLIGHTS_HEADER = Template("\n## 🏆 Highlights\n")
+COMPARISON_HIGHLIGHT = Template("- **{label}**: {name} ({symbol})\n")
+COMPARISON_NOT_LISTED = Template("\n*Not found: {symbols}*\n")
+
+
+@functools.lru_cache(maxsize=256)
+def comparison_row(cell, value_format, columns):
+    """
+    Format string of a comparison table row: the label, then ``columns`` copies of
+    ``cell`` with ``value_format`` in place of its ``{value}``. A whole row is then
+    formatted by one ``str.format`` call instead of one render per cell.
+    """
+    return "\n| **{}** |" + cell.format(value=value_format) * columns
+
+
+# Market analysis
+MARKET_HEADER = Template("# 📊 Cryptocurrency Market Analysis\n\n## 🚀 Top Performers (30-day)\n")
+TOP_PERFORMER = Template("- **{name}**: {price_change_30d:+.1f}%\n")
+MARKET_CAPS = Template(
+    "\n## 💰 Market Cap Analysis\n"
+    "- **Large Cap (>$50B)**: {large_cap} cryptocurrencies\n"
+    "- **Mid Cap ($10B-$50B)**: {mid_cap} cryptocurrencies\n"
+    "- **Small Cap (<$10B)**: {small_cap} cryptocurrencies\n\n"
+)
+SUSTAINABILITY_TRENDS = Template(
+    "## 🌱 Sustainability Trends\n"
+    "**{count} cryptocurrencies** have high sustainability scores (7+/10)\n\n"
+    "**Most Sustainable Options:**\n"
+)
+SUSTAINABLE_OPTION = Template("- {name}: {sustainability_score}/10 ({consensus_mechanism})\n")
+MARKET_INSIGHTS = Template(
+    "\n## 📈 Market Insights\n"
+    "- Proof of Stake networks are gaining adoption due to energy efficiency\n"
+    "- DeFi and smart contract platforms showing strong growth\n"
+    "- Regulatory clarity is improving for established cryptocurrencies\n"
+    "- Institutional adoption continues to drive large-cap crypto stability\n"
+)
+
+# Sustainability analysis
+SUSTAINABILITY_HEADER = Template(
+    "# 🌱 Sustainable Cryptocurrency Analysis\n\n"
+    "Environmental impact is increasingly important in crypto investments. "
+    "Here are the most sustainable options:\n\n"
+)
+SUSTAINABLE_ASSET = Template(
+    "## {name} ({symbol})\n"
+    "**Sustainability Score: {sustainability_score}/10**\n\n"
+    "- **Consensus**: {consensus_mechanism}\n"
+    "- **Energy Use**: {energy_consumption}\n"
+    "- **Market Cap Rank**: #{market_cap_rank}\n"
+    "- **Why It's Sustainable**: {reason}\n\n"
+)
+SUSTAINABILITY_FOOTER = Template(
+    "## 🌍 Why Sustainability Matters\n"
+    "- **Environmental Impact**: Sustainable cryptos use 99% less energy\n"
+    "- **Future Regulations**: Governments favor eco-friendly technologies\n"
+    "- **Corporate Adoption**: Companies prefer sustainable blockchain solutions\n"
+    "- **Long-term Viability**: Lower operating costs and regulatory risks\n"
+)
@@ -0,0 +1,33 @@
+import pytest
+
+from advisor_logic import CryptoAdvisor
+from crypto_data import get_crypto_data, get_universe, publish_universe
+from universe import Universe
+
+BELOW_FLOOR_NOTE = "minimum sustainability score"
+
+
+@pytest.fixture
+def advisor():
+    previous = get_universe()
+    yield CryptoAdvisor(simulation_workers=1)
+    publish_universe(previous)
+
+
+def publish_sustainability(score):
+    publish_universe(Universe.from_records({
+        symbol: dict(crypto, sustainability_score=score) for symbol, crypto in get_crypto_data().items()
+    }))
+
+
+@pytest.mark.parametrize("risk_tolerance, floor", [("low", 5), ("medium", 3), ("high", 3)])
+def test_allocation_notes_when_no_pick_meets_the_sustainability_floor(advisor, risk_tolerance, floor):
+    publish_sustainability(floor - 1)
+    response = advisor.get_investment_recommendations(risk_tolerance)
+    assert f"{BELOW_FLOOR_NOTE} of {floor}/10" in response
+
+
+@pytest.mark.parametrize("risk_tolerance", ["low", "medium", "high"])
+def test_allocation_has_no_note_when_picks_meet_the_floor(advisor, risk_tolerance):
+    publish_sustainability(8)
+    assert BELOW_FLOOR_NOTE not in advisor.get_investment_recommendations(risk_tolerance)
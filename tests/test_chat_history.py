@@ -0,0 +1,81 @@
+import json
+import os
+import zlib
+
+import pytest
+
+from chat_history import ChatHistory
+
+
+def conversation(n):
+    return [{"role": "user" if i % 2 == 0 else "assistant", "content": f"message {i} ünïcode " + "x" * i}
+            for i in range(n)]
+
+
+def fill(history, messages):
+    for message in messages:
+        history.append(message["role"], message["content"])
+
+
+@pytest.fixture
+def history(tmp_path):
+    return ChatHistory(capacity=5, spill_dir=str(tmp_path))
+
+
+def test_nothing_spills_within_capacity(history, tmp_path):
+    messages = conversation(5)
+    fill(history, messages)
+    assert history.spilled == 0
+    assert os.listdir(tmp_path) == []
+    assert history.messages(0, 5) == messages
+
+
+def test_overflow_spills_oldest_first(history):
+    messages = conversation(23)
+    fill(history, messages)
+    assert len(history) == 23
+    assert history.spilled == 18
+    assert list(history._recent) == messages[18:]
+    assert history.messages(0, 23) == messages
+
+
+def test_spilled_records_are_zlib_compressed_json(history):
+    messages = conversation(8)
+    fill(history, messages)
+    with open(history._spill_path, "rb") as log:
+        data = log.read()
+    records, offsets, offset = [], [], 0
+    while offset < len(data):
+        length = int.from_bytes(data[offset:offset + 4], "little")
+        offsets.append(offset)
+        records.append(json.loads(zlib.decompress(data[offset + 4:offset + 4 + length])))
+        offset += 4 + length
+    assert records == messages[:3]
+    assert history._offsets == offsets
+
+
+@pytest.mark.parametrize("start, stop", [(0, 1), (2, 7), (17, 18), (17, 19), (10, 23), (20, 23), (-5, 100),
+                                         (9, 9), (12, 4)])
+def test_any_range_reads_back_in_order(history, start, stop):
+    messages = conversation(23)
+    fill(history, messages)
+    assert history.messages(start, stop) == messages[max(start, 0):stop]
+
+
+def test_window_spans_disk_and_memory(history):
+    messages = conversation(23)
+    fill(history, messages)
+    assert history.window(7) == messages[-7:]
+    assert history.window(100) == messages
+
+
+def test_clear_removes_the_log_and_history_can_be_reused(history, tmp_path):
+    fill(history, conversation(12))
+    history.clear()
+    assert len(history) == 0
+    assert os.listdir(tmp_path) == []
+
+    messages = conversation(9)
+    fill(history, messages)
+    assert history.spilled == 4
+    assert history.messages(0, 9) == messages
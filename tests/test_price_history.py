@@ -0,0 +1,59 @@
+import threading
+
+import numpy as np
+import pytest
+
+from price_history import PriceHistoryStore
+
+
+@pytest.fixture
+def store(tmp_path):
+    return PriceHistoryStore.create(str(tmp_path), ["BTC", "ETH"], start_ts=1_000_000, interval=60)
+
+
+def test_bars_before_the_start_are_rejected(store):
+    with pytest.raises(ValueError):
+        store.append(store.start_ts - 1, {"BTC": (1, 1, 1, 1, 1)})
+    assert store.frame_count == 0
+
+    store.append(store.start_ts, {"BTC": (1, 2, 0.5, 1.5, 10)})
+    with pytest.raises(ValueError):
+        store.append(store.start_ts - 60, {"BTC": (1, 1, 1, 1, 1)})
+    assert store.frame_count == 1
+
+
+def test_append_merges_and_carries_closes_forward(store):
+    store.append(store.start_ts, {"BTC": (10, 12, 9, 11, 1), "ETH": (5, 5, 5, 5, 1)})
+    store.append(store.start_ts + 30, {"BTC": (11, 14, 10, 13, 2)})
+    store.append(store.start_ts + 180, {"ETH": (6, 7, 6, 7, 3)})
+
+    bars = store.bars()
+    assert bars.shape == (4, 2)
+    assert tuple(bars[0][store.slots["BTC"]]) == (10, 14, 9, 13, 3)
+    assert bars["close"][:, store.slots["BTC"]].tolist() == [13, 13, 13, 13]
+    assert bars["volume"][:, store.slots["ETH"]].tolist() == [1, 0, 0, 3]
+
+
+def test_readers_see_consistent_mappings_while_the_store_grows(store):
+    errors = []
+    done = threading.Event()
+
+    def read():
+        while not done.is_set():
+            bars = store.bars()
+            frames = len(bars)
+            if frames and not np.isfinite(bars[frames - 1]["close"][store.slots["BTC"]]):
+                errors.append(frames)
+
+    readers = [threading.Thread(target=read) for _ in range(4)]
+    for reader in readers:
+        reader.start()
+    try:
+        for i in range(300):
+            store.append(store.start_ts + 60 * i, {"BTC": (i, i, i, i, 1)})
+    finally:
+        done.set()
+        for reader in readers:
+            reader.join()
+    assert not errors
+    assert store.frame_count == 300
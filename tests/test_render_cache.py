@@ -0,0 +1,117 @@
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from types import SimpleNamespace
+
+import pytest
+
+from render_cache import RenderCache, cached_render, cached_stream
+
+
+class FakeAdvisor:
+    """Just enough of CryptoAdvisor for the cache decorators."""
+
+    def __init__(self):
+        self.render_cache = RenderCache()
+        self.state = SimpleNamespace(universe=SimpleNamespace(version=1))
+        self.calls = 0
+        self.started = threading.Event()
+        self.release = threading.Event()
+        self.release.set()
+        # Fail the next render only
+        self.fail = False
+
+    def _refresh_snapshot(self):
+        return self.state
+
+    def _work(self, risk_tolerance):
+        self.calls += 1
+        self.started.set()
+        self.release.wait(5)
+        if self.fail:
+            self.fail = False
+            raise RuntimeError("render failed")
+        return f"recommendations for {risk_tolerance}"
+
+    @cached_render
+    def recommend(self, risk_tolerance="medium"):
+        return self._work(risk_tolerance)
+
+    @cached_stream("recommend")
+    def stream_recommend(self, risk_tolerance="medium"):
+        yield "recommendations "
+        yield self._work(risk_tolerance)[len("recommendations "):]
+
+
+def run_concurrently(advisor, calls):
+    """Start the first call, hold it mid-render, then start the rest and let them all finish."""
+    advisor.release.clear()
+    with ThreadPoolExecutor(len(calls)) as executor:
+        first = executor.submit(calls[0])
+        assert advisor.started.wait(5)
+        rest = [executor.submit(call) for call in calls[1:]]
+        advisor.release.set()
+        return [first.result(5)] + [future.result(5) for future in rest]
+
+
+@pytest.mark.parametrize("call", [
+    lambda advisor: advisor.recommend(),
+    lambda advisor: advisor.recommend("medium"),
+    lambda advisor: advisor.recommend(risk_tolerance="medium"),
+    lambda advisor: "".join(advisor.stream_recommend()),
+    lambda advisor: "".join(advisor.stream_recommend(risk_tolerance="medium")),
+])
+def test_equivalent_calls_share_one_entry(call):
+    advisor = FakeAdvisor()
+    assert advisor.recommend("medium") == "recommendations for medium"
+    assert call(advisor) == "recommendations for medium"
+    assert advisor.calls == 1
+
+
+def test_concurrent_misses_share_one_render():
+    advisor = FakeAdvisor()
+    calls = [advisor.recommend, lambda: advisor.recommend(risk_tolerance="medium"),
+             lambda: "".join(advisor.stream_recommend())] * 3
+    assert run_concurrently(advisor, calls) == ["recommendations for medium"] * len(calls)
+    assert advisor.calls == 1
+    assert advisor.render_cache.stats()["misses"] == 1
+
+
+def test_concurrent_stream_misses_share_one_render():
+    advisor = FakeAdvisor()
+    calls = [lambda: list(advisor.stream_recommend("high"))] * 4
+    first, *rest = run_concurrently(advisor, calls)
+    assert first == ["recommendations ", "for high"]
+    assert rest == [["recommendations for high"]] * 3
+    assert advisor.calls == 1
+
+
+def test_waiters_retry_after_a_failed_render():
+    advisor = FakeAdvisor()
+    advisor.fail = True
+
+    def fail_once():
+        try:
+            return advisor.recommend("low")
+        except RuntimeError as error:
+            return str(error)
+
+    results = run_concurrently(advisor, [fail_once] + [lambda: advisor.recommend("low")] * 3)
+    assert results == ["render failed"] + ["recommendations for low"] * 3
+    assert advisor.calls == 2
+
+
+def test_abandoned_stream_releases_its_key():
+    advisor = FakeAdvisor()
+    stream = advisor.stream_recommend("low")
+    assert next(stream) == "recommendations "
+    stream.close()
+    assert advisor.recommend("low") == "recommendations for low"
+    assert advisor.calls == 1
+
+
+def test_new_snapshot_version_misses():
+    advisor = FakeAdvisor()
+    advisor.recommend()
+    advisor.state = SimpleNamespace(universe=SimpleNamespace(version=2))
+    advisor.recommend()
+    assert advisor.calls == 2
@@ -0,0 +1,74 @@
+import pytest
+
+from crypto_data import get_crypto_data
+from intents import IntentRouter
+from resolver import SymbolResolver
+from universe import Universe
+
+# Listed tickers whose symbol or name is also an everyday word
+WORD_TICKERS = {"NEAR": "NEAR Protocol", "ONE": "Harmony", "HOT": "Holo"}
+
+
+@pytest.fixture(scope="module")
+def universe():
+    records = dict(get_crypto_data())
+    base = records["BTC"]
+    for symbol, name in WORD_TICKERS.items():
+        records[symbol] = dict(base, symbol=symbol, name=name)
+    return Universe.from_records(records)
+
+
+@pytest.fixture(scope="module")
+def resolver(universe):
+    return SymbolResolver(universe.symbols, universe.column("name"))
+
+
+def symbols(resolver, text):
+    return [match.symbol for match in resolver.resolve(text)]
+
+
+@pytest.mark.parametrize("text", [
+    "How was the market last year?",
+    "which one is the most sustainable",
+    "is it hot right now",
+    "how near is the next halving",
+    "send me the link",
+])
+def test_everyday_words_do_not_mention_assets(resolver, text):
+    assert symbols(resolver, text) == []
+
+
+@pytest.mark.parametrize("text, expected", [
+    ("is ONE a good buy", ["ONE"]),
+    ("thoughts on $hot", ["HOT"]),
+    ("NEAR vs $link", ["NEAR", "LINK"]),
+    ("tell me about near protocol", ["NEAR"]),
+    ("how is harmony doing", ["ONE"]),
+    ("what about eth and sol", ["ETH", "SOL"]),
+])
+def test_cued_and_unambiguous_mentions_resolve(resolver, text, expected):
+    assert symbols(resolver, text) == expected
+
+
+def test_short_words_are_not_spelling_corrected(resolver):
+    assert symbols(resolver, "what about holo") == ["HOT"]
+    assert symbols(resolver, "what about hole") == []
+    assert symbols(resolver, "what about yeer") == []
+
+
+def test_misspelled_names_resolve_with_reduced_confidence(resolver):
+    [match] = resolver.resolve("is etherium a good buy")
+    assert match.symbol == "ETH"
+    assert 0.8 <= match.confidence < 1.0
+
+
+@pytest.mark.parametrize("text, intent", [
+    ("How was the market last year?", "market"),
+    ("which one is the most sustainable", "sustainability"),
+    ("is it hot right now", "default"),
+    ("how is the market for etherium", "market"),
+    ("how is etherium doing", "crypto"),
+    ("how is the market for ethereum", "crypto"),
+])
+def test_router_intents(universe, text, intent):
+    assert IntentRouter(universe).route(text).intent == intent
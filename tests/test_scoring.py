@@ -0,0 +1,54 @@
+import itertools
+
+import numpy as np
+import pytest
+
+from benchmarks.synthetic import synthetic_universe
+from crypto_data import get_crypto_by_symbol
+from scoring import DEFAULT_SCORING_THRESHOLDS, RISK_TOLERANCES, batch_investment_scores, investment_score
+from universe import Universe
+
+# Values on and either side of every cut-off of the default scoring thresholds
+BOUNDARIES = {
+    "market_cap_rank": [1, 5, 6, 15, 16],
+    "price_change_30d": [-0.1, 0.0, 0.1, 20.0, 20.1],
+    "sustainability_score": [5, 6, 7, 8, 10],
+    "technology_maturity": [7, 8],
+    "adoption_score": [2, 3, 6, 9],
+    "regulatory_clarity": [2, 3, 5, 6],
+    "volatility": ["Low", "Medium", "High", "Very High"],
+}
+
+
+def boundary_universe():
+    """Every combination of the boundary values, one asset each."""
+    base = get_crypto_by_symbol("BTC")
+    records = {}
+    for i, values in enumerate(itertools.product(*BOUNDARIES.values())):
+        symbol = f"T{i}"
+        records[symbol] = dict(base, symbol=symbol, name=f"Test {i}", **dict(zip(BOUNDARIES, values)))
+    return Universe.from_records(records)
+
+
+def assert_parity(universe, thresholds=DEFAULT_SCORING_THRESHOLDS):
+    scores = batch_investment_scores(universe, thresholds)
+    assert scores.shape == (len(RISK_TOLERANCES), len(universe))
+    for row, risk_tolerance in enumerate(RISK_TOLERANCES):
+        expected = np.array([investment_score(universe.record(position), risk_tolerance, thresholds)
+                             for position in range(len(universe))])
+        mismatched = np.flatnonzero(scores[row] != expected)
+        assert not len(mismatched), [(universe.record(p), risk_tolerance) for p in mismatched[:3]]
+
+
+def test_batch_scores_match_per_asset_scores_on_threshold_boundaries():
+    assert_parity(boundary_universe())
+
+
+@pytest.mark.parametrize("seed", [0, 1])
+def test_batch_scores_match_per_asset_scores_on_synthetic_universe(seed):
+    assert_parity(synthetic_universe(2000, seed))
+
+
+def test_batch_scores_match_per_asset_scores_with_custom_thresholds():
+    thresholds = DEFAULT_SCORING_THRESHOLDS._replace(top_rank=6, strong_change=0.1, good_sustainability=7, max_score=9)
+    assert_parity(boundary_universe(), thresholds)
@@ -0,0 +1,36 @@
+import json
+import subprocess
+import sys
+
+import pytest
+
+from benchmarks.startup_profile import (CORE_MODULES, DEFAULT_BUDGET_MS, DEFERRED_MODULES, FORBIDDEN_MODULES, check,
+                                        profile)
+
+
+def modules_after_import(modules):
+    """Top-level modules loaded by a fresh interpreter importing ``modules``."""
+    code = "; ".join(f"import {module}" for module in modules)
+    code += "; import json, sys; print(json.dumps(sorted({name.split('.')[0] for name in sys.modules})))"
+    result = subprocess.run([sys.executable, "-c", code], capture_output=True, text=True, check=True)
+    return set(json.loads(result.stdout))
+
+
+def test_core_import_leaves_heavy_and_deferred_modules_unloaded():
+    loaded = modules_after_import(CORE_MODULES)
+    assert set(CORE_MODULES) <= loaded
+    assert loaded.isdisjoint(FORBIDDEN_MODULES + DEFERRED_MODULES + ("scipy", "matplotlib"))
+
+
+def test_deferred_modules_load_on_first_use():
+    code = ("import advisor_logic, crypto_data, intents, sys; "
+            "advisor_logic.CryptoAdvisor(simulation_workers=1); intents.get_router(crypto_data.get_universe()); "
+            f"print(all(name in sys.modules for name in {DEFERRED_MODULES!r}))")
+    result = subprocess.run([sys.executable, "-c", code], capture_output=True, text=True, check=True)
+    assert result.stdout.strip() == "True"
+
+
+@pytest.mark.timing
+def test_core_cold_import_stays_within_budget():
+    total_ms, median = profile(CORE_MODULES, runs=3)
+    assert check(CORE_MODULES, total_ms, median, DEFAULT_BUDGET_MS) == []
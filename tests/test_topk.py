@@ -0,0 +1,30 @@
+import numpy as np
+import pytest
+
+from topk import top_k_indices, top_k_items
+
+
+def stable_ranking(values):
+    return sorted(range(len(values)), key=lambda i: values[i], reverse=True)
+
+
+@pytest.mark.parametrize("seed", range(5))
+@pytest.mark.parametrize("k", [None, 0, 1, 3, 10, 49, 50, 51])
+def test_top_k_indices_matches_stable_sort_on_ties(seed, k):
+    # Few distinct values, so most ranks are decided by ties
+    values = np.random.default_rng(seed).integers(0, 4, 50)
+    expected = stable_ranking(values.tolist())[:k]
+    assert top_k_indices(values, k).tolist() == expected
+
+
+@pytest.mark.parametrize("values", [[], [7], [1, 1, 1, 1], [3.5, -1.0, 3.5, 0.0, 3.5]])
+def test_top_k_indices_edge_cases(values):
+    for k in [None, 0, 1, 2, 5]:
+        assert top_k_indices(values, k).tolist() == stable_ranking(values)[:k]
+
+
+def test_top_k_items_matches_stable_sort_on_ties():
+    items = [(i, value) for i, value in enumerate(np.random.default_rng(0).integers(0, 3, 40).tolist())]
+    for k in [None, 1, 5, 40, 60]:
+        expected = sorted(items, key=lambda item: item[1], reverse=True)[:k]
+        assert top_k_items(items, k, key=lambda item: item[1]) == expected
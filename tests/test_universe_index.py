@@ -0,0 +1,72 @@
+import itertools
+
+import numpy as np
+import pytest
+
+from benchmarks.synthetic import synthetic_universe
+from universe import UniverseIndex
+
+
+@pytest.fixture(scope="module")
+def universe():
+    return synthetic_universe(500, seed=3)
+
+
+def brute_force(universe, predicates):
+    matched = []
+    for position in range(len(universe)):
+        crypto = universe.record(position)
+        for field, predicate in predicates.items():
+            if field in UniverseIndex.RANGE_FIELDS:
+                low, high = predicate
+                if (low is not None and crypto[field] < low) or (high is not None and crypto[field] > high):
+                    break
+            elif crypto[field] not in ([predicate] if isinstance(predicate, str) else predicate):
+                break
+        else:
+            matched.append(position)
+    return matched
+
+
+RANGES = {
+    "sustainability_score": [(7, None), (None, 4), (5, 5), (11, None)],
+    "market_cap_rank": [(None, 20), (100, 300), (None, None)],
+    "regulatory_clarity": [(3, 6), (None, 0)],
+}
+CATEGORIES = {
+    "risk_level": ["Medium", ["Medium", "Medium-High"], ["Unknown"], []],
+    "volatility": [["High", "Very High"], "Medium", "Low"],
+    "consensus_mechanism": ["Proof of Stake", ["Proof of Work", "Not a mechanism"]],
+}
+
+
+@pytest.mark.parametrize("field, predicate",
+                         [(field, value) for field, values in {**RANGES, **CATEGORIES}.items() for value in values])
+def test_single_predicate_matches_brute_force(universe, field, predicate):
+    assert universe.index.query(**{field: predicate}).tolist() == brute_force(universe, {field: predicate})
+
+
+@pytest.mark.parametrize("fields", list(itertools.combinations(list(RANGES) + list(CATEGORIES), 3)))
+def test_combined_predicates_match_brute_force(universe, fields):
+    options = {**RANGES, **CATEGORIES}
+    for values in itertools.islice(itertools.product(*(options[field] for field in fields)), 8):
+        predicates = dict(zip(fields, values))
+        assert universe.index.query(**predicates).tolist() == brute_force(universe, predicates), predicates
+
+
+def test_no_predicates_match_everything(universe):
+    assert universe.index.query().tolist() == list(range(len(universe)))
+
+
+def test_unindexed_field_is_rejected(universe):
+    with pytest.raises(KeyError):
+        universe.index.query(price_usd=(0, None))
+
+
+def test_percentiles_match_brute_force(universe):
+    positions = np.arange(0, len(universe), 7)
+    for field in ["sustainability_score", "price_change_30d"]:
+        column = universe.column(field)
+        expected = [100.0 * ((column < column[p]).sum() + 0.5 * (column == column[p]).sum()) / len(column)
+                    for p in positions]
+        assert np.allclose(universe.index.percentiles(field, positions), expected)
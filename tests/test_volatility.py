@@ -0,0 +1,54 @@
+import numpy as np
+import pytest
+
+from volatility import SECONDS_PER_YEAR, RollingStats
+
+SIGMA = 0.8
+
+
+def random_walk(intervals, seed=0):
+    """Prices of one asset following a driftless walk with annual volatility SIGMA."""
+    rng = np.random.default_rng(seed)
+    steps = rng.standard_normal(len(intervals)) * SIGMA * np.sqrt(np.asarray(intervals) / SECONDS_PER_YEAR)
+    return 100.0 * np.exp(np.concatenate([[0.0], np.cumsum(steps)]))
+
+
+def feed(stats, prices, timestamps=None):
+    for i, price in enumerate(prices):
+        stats.update([price], None if timestamps is None else timestamps[i])
+    return float(stats.realized_volatility[0])
+
+
+@pytest.mark.parametrize("interval", [1, 5, 60, 900])
+def test_realized_volatility_follows_the_update_interval(interval):
+    intervals = np.full(3000, interval)
+    timestamps = 1_760_000_000 + np.concatenate([[0], np.cumsum(intervals)])
+    volatility = feed(RollingStats(["BTC"], window=2000), random_walk(intervals), timestamps)
+    assert volatility == pytest.approx(SIGMA, rel=0.08)
+
+
+def test_realized_volatility_with_irregular_updates():
+    intervals = np.random.default_rng(1).integers(1, 120, 3000)
+    timestamps = np.concatenate([[0], np.cumsum(intervals)])
+    volatility = feed(RollingStats(["BTC"], window=2000), random_walk(intervals, seed=2), timestamps)
+    assert volatility == pytest.approx(SIGMA, rel=0.08)
+
+
+def test_untimed_updates_count_as_nominal_periods():
+    intervals = np.full(3000, 60)
+    prices = random_walk(intervals)
+    untimed = feed(RollingStats(["BTC"], window=2000), prices)
+    timed = feed(RollingStats(["BTC"], window=2000), prices, np.arange(len(prices)) * 60)
+    assert untimed == pytest.approx(timed)
+    assert untimed == pytest.approx(SIGMA, rel=0.08)
+
+
+def test_assets_without_a_tick_keep_their_window():
+    stats = RollingStats(["BTC", "ETH"], window=10)
+    stats.update([100.0, 10.0], timestamp=0)
+    stats.update([101.0, np.nan], timestamp=60)
+    stats.update([100.0, 11.0], timestamp=120)
+    assert stats.window_count.tolist() == [2, 1]
+    # ETH's one return spans both minutes
+    assert stats._seconds.tolist() == [120.0, 120.0]
+    assert np.isnan(stats.realized_volatility[1])
@@ -0,0 +1,34 @@
+import heapq
+
+import numpy as np
+
+
+def top_k_indices(values, k=None):
+    """
+    Returns the indices of the ``k`` largest values, largest first, in O(n) via
+    a partition. Ties keep ascending index order, matching a stable
+    ``sorted(..., reverse=True)``. ``k=None`` ranks every value.
+    """
+    values = np.asarray(values)
+    n = len(values)
+    if k is None or k >= n:
+        return np.argsort(-values, kind="stable")
+    if k <= 0:
+        return np.empty(0, dtype=np.intp)
+
+    # k-th largest value; everything above it is in, ties are taken by position
+    kth = np.partition(values, n - k)[n - k]
+    above = np.flatnonzero(values > kth)
+    ties = np.flatnonzero(values == kth)[:k - len(above)]
+    candidates = np.concatenate([above, ties])
+    return candidates[np.lexsort((candidates, -values[candidates]))]
+
+
+def top_k_items(items, k=None, key=None):
+    """
+    Returns the ``k`` largest items by ``key``, largest first, using a bounded heap.
+    Equivalent to ``sorted(items, key=key, reverse=True)[:k]``, ties included.
+    """
+    if k is None:
+        return sorted(items, key=key, reverse=True)
+    return heapq.nlargest(k, items, key=key)
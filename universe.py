@@ -0,0 +1,276 @@
+import functools
+import itertools
+import time
+
+import numpy as np
+
+# Field layout of a cryptocurrency record, in the order the records are rendered.
+FIELDS = (
+    "name", "symbol", "market_cap_rank", "market_cap", "price_usd",
+    "price_change_24h", "price_change_7d", "price_change_30d", "volume_24h",
+    "energy_consumption", "consensus_mechanism", "sustainability_score",
+    "volatility", "adoption_score", "technology_maturity", "regulatory_clarity",
+    "use_cases", "risk_level",
+)
+
+NUMERIC_FIELDS = {
+    "market_cap_rank": np.int64,
+    "market_cap": np.int64,
+    "price_usd": np.float64,
+    "price_change_24h": np.float64,
+    "price_change_7d": np.float64,
+    "price_change_30d": np.float64,
+    "volume_24h": np.int64,
+    "sustainability_score": np.int64,
+    "adoption_score": np.int64,
+    "technology_maturity": np.int64,
+    "regulatory_clarity": np.int64,
+}
+
+CATEGORICAL_FIELDS = ("energy_consumption", "consensus_mechanism", "volatility", "risk_level")
+
+# Unique per asset, so they are kept as plain object columns
+OBJECT_FIELDS = ("name", "use_cases")
+
+_versions = itertools.count(1)
+
+
+def percentile_ranks(sorted_values, values):
+    """
+    Percentile (0-100) of each of ``values`` within ascending ``sorted_values``:
+    the share of entries below it, with equal entries counting half.
+    """
+    below = np.searchsorted(sorted_values, values, "left")
+    through = np.searchsorted(sorted_values, values, "right")
+    return (below + through) * (50.0 / len(sorted_values))
+
+
+def _readonly(array):
+    array.setflags(write=False)
+    return array
+
+
+class Categorical:
+    """A string column stored as integer codes into a table of categories."""
+
+    def __init__(self, codes, categories):
+        self.codes = _readonly(np.asarray(codes, dtype=np.int32))
+        self.categories = tuple(categories)
+        self._lookup = {category: code for code, category in enumerate(self.categories)}
+
+    @classmethod
+    def from_values(cls, values):
+        lookup = {}
+        codes = [lookup.setdefault(value, len(lookup)) for value in values]
+        return cls(codes, lookup)
+
+    def __len__(self):
+        return len(self.codes)
+
+    def __getitem__(self, position):
+        return self.categories[self.codes[position]]
+
+    def code_of(self, value):
+        """Code of a category, or -1 if the value never occurs."""
+        return self._lookup.get(value, -1)
+
+    def isin(self, values):
+        """Boolean mask of the rows whose value is one of ``values``."""
+        wanted = [self._lookup[value] for value in values if value in self._lookup]
+        return np.isin(self.codes, wanted)
+
+
+class Universe:
+    """
+    Immutable, versioned snapshot of the asset universe stored column-wise.
+    Numeric fields are NumPy arrays, repeating strings are categorical codes and
+    every record-shaped accessor is a view built on demand from the columns.
+    """
+
+    def __init__(self, symbols, columns, version=None):
+        self.symbols = tuple(symbols)
+        self.version = next(_versions) if version is None else version
+        self.created_at = time.time()
+        self._columns = columns
+        self._positions = {symbol: i for i, symbol in enumerate(self.symbols)}
+
+    @classmethod
+    def from_records(cls, records):
+        """Build a universe from a ``{symbol: record}`` mapping."""
+        symbols = list(records)
+        rows = [records[symbol] for symbol in symbols]
+        columns = {}
+        for field, dtype in NUMERIC_FIELDS.items():
+            columns[field] = _readonly(np.array([row[field] for row in rows], dtype=dtype))
+        for field in CATEGORICAL_FIELDS:
+            columns[field] = Categorical.from_values(row[field] for row in rows)
+        for field in OBJECT_FIELDS:
+            column = np.empty(len(rows), dtype=object)
+            column[:] = [tuple(row[field]) if field == "use_cases" else row[field] for row in rows]
+            columns[field] = _readonly(column)
+        return cls(symbols, columns)
+
+    def __len__(self):
+        return len(self.symbols)
+
+    def __contains__(self, symbol):
+        return symbol in self._positions
+
+    def column(self, field):
+        """Raw column: a NumPy array, or a ``Categorical`` for categorical fields."""
+        return self._columns[field]
+
+    def position(self, symbol):
+        """Row position of a symbol, or None if it is not listed."""
+        return self._positions.get(symbol)
+
+    def positions(self, symbols):
+        """Row positions of the listed symbols among ``symbols``, in the order given."""
+        found = [self._positions[s] for s in symbols if s in self._positions]
+        return np.array(found, dtype=np.intp)
+
+    def record(self, position):
+        """Materialize one row as a record dict."""
+        record = {}
+        for field in FIELDS:
+            if field == "symbol":
+                record[field] = self.symbols[position]
+            elif field == "use_cases":
+                record[field] = list(self._columns[field][position])
+            elif field in NUMERIC_FIELDS:
+                record[field] = self._columns[field][position].item()
+            else:
+                record[field] = self._columns[field][position]
+        return record
+
+    def get(self, symbol):
+        """Record for a symbol, or None if it is not listed."""
+        position = self._positions.get(symbol)
+        if position is None:
+            return None
+        return self.record(position)
+
+    def records(self, positions=None):
+        """``{symbol: record}`` view over the given positions (all rows by default)."""
+        if positions is None:
+            positions = range(len(self.symbols))
+        return {self.symbols[i]: self.record(i) for i in positions}
+
+    def with_values(self, updates):
+        """
+        Copy-on-write update: returns a new snapshot where, for each numeric or
+        categorical ``field`` in ``updates``, the rows at ``positions`` take
+        ``values``. ``updates`` maps ``field -> (positions, values)``; untouched
+        columns are shared with this snapshot.
+        """
+        columns = dict(self._columns)
+        for field, (positions, values) in updates.items():
+            if field in CATEGORICAL_FIELDS:
+                decoded = [self._columns[field][i] for i in range(len(self.symbols))]
+                for position, value in zip(positions, values):
+                    decoded[position] = value
+                columns[field] = Categorical.from_values(decoded)
+                continue
+            if field not in NUMERIC_FIELDS:
+                raise KeyError(f"'{field}' is not an updatable field")
+            column = self._columns[field].copy()
+            values = np.asarray(values, dtype=np.float64)
+            if np.issubdtype(column.dtype, np.integer):
+                values = np.rint(values)
+            column[positions] = values
+            columns[field] = _readonly(column)
+        return Universe(self.symbols, columns)
+
+    @functools.cached_property
+    def index(self):
+        """Secondary indexes over this snapshot, built on first use."""
+        return UniverseIndex(self)
+
+
+class UniverseIndex:
+    """
+    Secondary indexes over one universe snapshot: sorted columns for range
+    predicates and percentiles, and per-category posting lists for membership
+    predicates.
+    """
+
+    RANGE_FIELDS = ("sustainability_score", "market_cap_rank", "regulatory_clarity")
+    CATEGORY_FIELDS = ("risk_level", "volatility", "consensus_mechanism")
+
+    def __init__(self, universe):
+        self._universe = universe
+        self._sorted = {}
+        for field in self.RANGE_FIELDS:
+            values = universe.column(field)
+            order = np.argsort(values, kind="stable")
+            self._sorted[field] = (order, values[order])
+        # Other numeric columns are sorted on first use by ``percentiles``
+        self._sorted_values = {field: values for field, (_, values) in self._sorted.items()}
+
+        self._postings = {}
+        for field in self.CATEGORY_FIELDS:
+            column = universe.column(field)
+            order = np.argsort(column.codes, kind="stable")
+            bounds = np.searchsorted(column.codes[order], np.arange(len(column.categories) + 1))
+            self._postings[field] = {
+                category: order[bounds[code]:bounds[code + 1]]
+                for code, category in enumerate(column.categories)
+            }
+
+    def percentiles(self, field, positions):
+        """Percentile within the whole column of the numeric ``field`` values at ``positions``."""
+        sorted_values = self._sorted_values.get(field)
+        if sorted_values is None:
+            sorted_values = self._sorted_values[field] = np.sort(self._universe.column(field))
+        return percentile_ranks(sorted_values, self._universe.column(field)[positions])
+
+    def query(self, **predicates):
+        """
+        Returns the ascending universe positions matching every predicate.
+        Range fields take an inclusive ``(low, high)`` tuple where either bound may
+        be None; category fields take a value or a collection of values. Only the
+        most selective predicate is materialized from its index, the rest are
+        checked on the surviving positions.
+        """
+        if not predicates:
+            return np.arange(len(self._universe), dtype=np.intp)
+
+        candidates = []
+        for field, predicate in predicates.items():
+            if field in self._sorted:
+                order, values = self._sorted[field]
+                low, high = predicate
+                start = 0 if low is None else np.searchsorted(values, low, "left")
+                stop = len(values) if high is None else np.searchsorted(values, high, "right")
+                candidates.append((stop - start, field, order[start:stop]))
+            elif field in self._postings:
+                wanted = [predicate] if isinstance(predicate, str) else list(predicate)
+                postings = [self._postings[field].get(value) for value in wanted]
+                postings = [p for p in postings if p is not None]
+                candidates.append((sum(len(p) for p in postings), field, postings))
+            else:
+                raise KeyError(f"No index on field '{field}'")
+
+        size, field, matched = min(candidates, key=lambda candidate: candidate[0])
+        if field in self._postings:
+            matched = np.concatenate(matched) if matched else np.empty(0, dtype=np.intp)
+        positions = np.sort(matched)
+
+        for other, predicate in predicates.items():
+            if other == field or not len(positions):
+                continue
+            if other in self._sorted:
+                low, high = predicate
+                values = self._universe.column(other)[positions]
+                keep = np.ones(len(positions), dtype=bool)
+                if low is not None:
+                    keep &= values >= low
+                if high is not None:
+                    keep &= values <= high
+            else:
+                wanted = [predicate] if isinstance(predicate, str) else list(predicate)
+                column = self._universe.column(other)
+                keep = np.isin(column.codes[positions], [column.code_of(value) for value in wanted])
+            positions = positions[keep]
+
+        return positions
@@ -0,0 +1,179 @@
+import numpy as np
+
+# Volatility labels with the annualized realized volatility each one stops at;
+# anything above the last bound is "Very High"
+DEFAULT_VOLATILITY_THRESHOLDS = (("Low", 0.30), ("Medium", 0.60), ("High", 1.00))
+TOP_VOLATILITY_LABEL = "Very High"
+
+SECONDS_PER_YEAR = 365 * 24 * 3600
+MINUTES_PER_YEAR = 365 * 24 * 60
+
+
+class RollingStats:
+    """
+    Streaming return statistics for a fixed list of assets, updated in O(1) per
+    tick and vectorized across assets.
+
+    - Windowed realized volatility keeps the last ``window`` log returns of each
+      asset in a ring buffer with a running sum and sum of squares, next to the
+      seconds each return spans. It is annualized by the mean span of the
+      window, so feeds that update once per batch rather than once per minute,
+      or at an irregular pace, are scaled correctly. Updates without a timestamp
+      count as one period of ``periods_per_year``.
+    - Mean, variance, skewness and kurtosis of all returns seen so far use
+      Welford-style one-pass moment updates.
+    - Drawdown tracks the running peak price.
+    """
+
+    def __init__(self, symbols, window=1440, periods_per_year=MINUTES_PER_YEAR):
+        self.symbols = tuple(symbols)
+        self.window = window
+        self.periods_per_year = periods_per_year
+        n = len(self.symbols)
+        self._positions = {symbol: i for i, symbol in enumerate(self.symbols)}
+
+        self.last_price = np.full(n, np.nan)
+        self.last_timestamp = np.full(n, np.nan)
+        self.peak = np.full(n, np.nan)
+        self.drawdown = np.zeros(n)
+        self.max_drawdown = np.zeros(n)
+
+        # Ring buffer of windowed returns
+        self._ring = np.zeros((window, n))
+        self._durations = np.zeros((window, n))
+        self._cursor = np.zeros(n, dtype=np.intp)
+        self._filled = np.zeros(n, dtype=np.intp)
+        self._sum = np.zeros(n)
+        self._sumsq = np.zeros(n)
+        self._seconds = np.zeros(n)
+
+        # Whole-history return moments
+        self.count = np.zeros(n, dtype=np.int64)
+        self.mean = np.zeros(n)
+        self._m2 = np.zeros(n)
+        self._m3 = np.zeros(n)
+        self._m4 = np.zeros(n)
+
+    def update(self, prices, timestamp=None):
+        """
+        Feed one tick of prices aligned to ``symbols``, observed at ``timestamp``
+        (seconds); NaN marks assets without a tick, which are left untouched.
+        """
+        prices = np.asarray(prices, dtype=np.float64)
+        ticked = np.isfinite(prices) & (prices > 0)
+
+        # Drawdown from the running peak
+        self.peak[ticked] = np.fmax(self.peak[ticked], prices[ticked])
+        self.drawdown[ticked] = prices[ticked] / self.peak[ticked] - 1.0
+        self.max_drawdown = np.minimum(self.max_drawdown, self.drawdown)
+
+        assets = np.flatnonzero(ticked & np.isfinite(self.last_price))
+        returns = np.log(prices[assets] / self.last_price[assets])
+        period = SECONDS_PER_YEAR / self.periods_per_year
+        durations = np.full(len(assets), period)
+        if timestamp is not None:
+            previous = self.last_timestamp[assets]
+            durations = np.where(np.isfinite(previous), timestamp - previous, period)
+            self.last_timestamp[ticked] = timestamp
+        self.last_price[ticked] = prices[ticked]
+        if len(assets):
+            self._push_window(assets, returns, durations)
+            self._push_moments(assets, returns)
+
+    def _push_window(self, assets, returns, durations):
+        cursor = self._cursor[assets]
+        evicted = self._ring[cursor, assets]
+        self._ring[cursor, assets] = returns
+        self._sum[assets] += returns - evicted
+        self._sumsq[assets] += returns * returns - evicted * evicted
+        self._seconds[assets] += durations - self._durations[cursor, assets]
+        self._durations[cursor, assets] = durations
+        self._cursor[assets] = (cursor + 1) % self.window
+        self._filled[assets] = np.minimum(self._filled[assets] + 1, self.window)
+
+    def _push_moments(self, assets, returns):
+        n1 = self.count[assets].astype(np.float64)
+        n = n1 + 1
+        delta = returns - self.mean[assets]
+        delta_n = delta / n
+        delta_n2 = delta_n * delta_n
+        term1 = delta * delta_n * n1
+        m2, m3 = self._m2[assets], self._m3[assets]
+
+        self.mean[assets] += delta_n
+        self._m4[assets] += term1 * delta_n2 * (n * n - 3 * n + 3) + 6 * delta_n2 * m2 - 4 * delta_n * m3
+        self._m3[assets] = m3 + term1 * delta_n * (n - 2) - 3 * delta_n * m2
+        self._m2[assets] = m2 + term1
+        self.count[assets] += 1
+
+    @property
+    def window_count(self):
+        """Number of returns currently in each asset's window."""
+        return self._filled
+
+    @property
+    def realized_volatility(self):
+        """
+        Annualized volatility of the windowed returns, scaled by the mean seconds
+        per return in the window (NaN below two returns or without elapsed time).
+        """
+        filled = self._filled.astype(np.float64)
+        with np.errstate(divide="ignore", invalid="ignore"):
+            variance = (self._sumsq - self._sum * self._sum / filled) / (filled - 1)
+            periods_per_year = SECONDS_PER_YEAR * filled / self._seconds
+        variance = np.where((self._filled >= 2) & (self._seconds > 0), np.maximum(variance, 0.0), np.nan)
+        return np.sqrt(variance * periods_per_year)
+
+    @property
+    def variance(self):
+        with np.errstate(divide="ignore", invalid="ignore"):
+            return np.where(self.count >= 2, self._m2 / (self.count - 1), np.nan)
+
+    @property
+    def skewness(self):
+        with np.errstate(divide="ignore", invalid="ignore"):
+            return np.sqrt(self.count) * self._m3 / self._m2 ** 1.5
+
+    @property
+    def kurtosis(self):
+        """Excess kurtosis."""
+        with np.errstate(divide="ignore", invalid="ignore"):
+            return self.count * self._m4 / (self._m2 * self._m2) - 3.0
+
+    def prices_for(self, values):
+        """Align a ``{symbol: price}`` mapping to ``symbols`` (NaN where missing)."""
+        prices = np.full(len(self.symbols), np.nan)
+        for symbol, price in values.items():
+            position = self._positions.get(symbol)
+            if position is not None:
+                prices[position] = price
+        return prices
+
+
+def label_volatility(volatility, thresholds=DEFAULT_VOLATILITY_THRESHOLDS):
+    """
+    Maps annualized volatilities to categorical labels using ``thresholds``, a
+    sequence of ``(label, upper_bound)`` pairs in ascending order. NaN maps to None.
+    """
+    labels = [label for label, _ in thresholds] + [TOP_VOLATILITY_LABEL]
+    bins = np.digitize(volatility, [bound for _, bound in thresholds], right=True)
+    return [labels[b] if np.isfinite(v) else None for b, v in zip(bins, volatility)]
+
+
+def apply_volatility_labels(universe, stats, thresholds=DEFAULT_VOLATILITY_THRESHOLDS, min_periods=60):
+    """
+    Returns a new universe snapshot whose ``volatility`` labels are derived from
+    the rolling statistics. Assets with fewer than ``min_periods`` windowed
+    returns keep their current label.
+    """
+    volatility = np.where(stats.window_count >= min_periods, stats.realized_volatility, np.nan)
+    labels = label_volatility(volatility, thresholds)
+    positions, values = [], []
+    for symbol, label in zip(stats.symbols, labels):
+        position = universe.position(symbol)
+        if label is not None and position is not None:
+            positions.append(position)
+            values.append(label)
+    if not positions:
+        return universe
+    return universe.with_values({"volatility": (np.array(positions, dtype=np.intp), values)})